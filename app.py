@@ -2,9 +2,11 @@ import streamlit as st
 import pandas as pd
 from pathlib import Path
 from datetime import date, datetime
-from pandas.errors import EmptyDataError
 
-from models.projections import project_game
+from dashboard.data import (
+    get_ledger, get_slate_projections, load_csv, load_results, monthly_summary, performance,
+)
+from pipeline.trace import flush as flush_trace
 
 # ================================
 # PUBLIC MODE (History-only)
@@ -26,20 +28,6 @@ def stake_from_to_win(to_win, odds):
     return round(to_win * 100 / odds, 2)
 
 
-def read_csv_safe(path):
-    try:
-        return pd.read_csv(path)
-    except (FileNotFoundError, EmptyDataError):
-        return pd.DataFrame()
-
-
-def ensure_columns(df, defaults):
-    for c, d in defaults.items():
-        if c not in df.columns:
-            df[c] = d
-    return df
-
-
 def rerun():
     if hasattr(st, "rerun"):
         st.rerun()
@@ -55,32 +43,18 @@ NOW = datetime.now().isoformat()
 
 PICKS_PATH = Path("data/daily_picks.csv")
 SLATE_PATH = Path("data/daily_games.csv")
-RESULTS_PATH = Path("data/history/bet_results.csv")
-RESULTS_PATH.parent.mkdir(exist_ok=True)
-
-RESULTS_COLS = {
-    "date": "",
-    "game": "",
-    "market": "",
-    "selection": "",
-    "odds": -110,
-    "bet_size": 0.0,
-    "result": "",
-    "profit": 0.0,
-    "confidence": "",
-    "home_score": "",
-    "away_score": "",
-    "graded_at": "",
-    "closing_line": "",
-    "clv": ""
-}
+LEDGER = get_ledger()
 
 # ================================
 # SESSION STATE (PRIVATE)
 # ================================
 if not PUBLIC_MODE:
-    if "edit_history_index" not in st.session_state:
-        st.session_state.edit_history_index = None
+    if "edit_history_id" not in st.session_state:
+        st.session_state.edit_history_id = None
+
+HISTORY_PAGE_SIZE = 50
+MARKETS = ["Spread", "Total", "Moneyline"]
+RESULTS = ["WIN", "LOSS", "PUSH"]
 
 # ================================
 # PAGE CONFIG
@@ -94,32 +68,21 @@ if PUBLIC_MODE:
     st.markdown("## 📊 NCAADataEdge — Public Results")
     st.caption("Tracked pre-game. Dollar amounts intentionally hidden.")
 
-    results = ensure_columns(read_csv_safe(RESULTS_PATH), RESULTS_COLS)
+    # Cached per ledger version and shared across visitors
+    results = load_results()
 
     if results.empty:
         st.info("No results yet.")
         st.stop()
 
-    results["date"] = pd.to_datetime(results["date"], errors="coerce")
-    results["month"] = results["date"].dt.to_period("M").astype(str)
-
-    monthly = (
-        results.groupby("month")
-        .agg(
-            Bets=("result", "count"),
-            Wins=("result", lambda x: (x == "WIN").sum())
-        )
-        .reset_index()
-    )
-    monthly["Win Rate %"] = (monthly["Wins"] / monthly["Bets"] * 100).round(1)
+    monthly = monthly_summary()
 
     st.subheader("📅 Monthly Summary")
     st.dataframe(monthly, use_container_width=True, hide_index=True)
 
     st.subheader("📋 Full Bet History")
     st.dataframe(
-        results[["date","game","market","selection","result","confidence"]]
-        .sort_values("date", ascending=False),
+        results[["date","game","market","selection","result","confidence"]],
         use_container_width=True,
         hide_index=True
     )
@@ -132,6 +95,63 @@ tab_slate, tab_picks, tab_perf, tab_history = st.tabs(
     ["📊 Full Slate", "📋 Daily Picks", "📈 Performance", "📜 History"]
 )
 
+# ------------------------------------------------------
+# FULL SLATE TAB — BACKGROUND-REFRESHED PROJECTIONS
+# ------------------------------------------------------
+with tab_slate:
+    st.markdown("## 📊 Full Slate")
+    projections = get_slate_projections(str(SLATE_PATH))
+    slate = projections.frame()
+
+    if projections.error is not None:
+        st.warning(f"Slate refresh failed: {projections.error}")
+
+    if slate is None:
+        st.info("Projecting today's slate…")
+    elif slate.empty:
+        st.info("No games on today's slate.")
+    else:
+        st.caption(f"{len(slate)} games · projected {projections.updated_at:%H:%M:%S}")
+        st.dataframe(slate, use_container_width=True, hide_index=True)
+
+# ------------------------------------------------------
+# DAILY PICKS TAB
+# ------------------------------------------------------
+with tab_picks:
+    st.markdown("## 📋 Daily Picks")
+    picks = load_csv(PICKS_PATH)
+
+    if picks.empty:
+        st.info("No picks generated yet.")
+    else:
+        st.dataframe(picks, use_container_width=True, hide_index=True)
+
+# ------------------------------------------------------
+# PERFORMANCE TAB — PRECOMPUTED ROLLUPS
+# ------------------------------------------------------
+with tab_perf:
+    st.markdown("## 📈 Performance")
+    perf = performance()
+    totals = perf["totals"]
+
+    if totals["bets"] == 0:
+        st.info("No graded bets yet.")
+    else:
+        m1, m2, m3, m4, m5 = st.columns(5)
+        m1.metric("Graded Bets", int(totals["bets"]))
+        m2.metric("Units", f"{totals['units']:+.1f}U")
+        m3.metric("ROI", f"{totals['roi'] * 100:.1f}%")
+        m4.metric("Win Rate", f"{totals['win_rate'] * 100:.1f}%")
+        m5.metric("Max Drawdown", f"${totals['max_drawdown']:.2f}")
+
+        day = perf["day"]
+        st.line_chart(day.assign(cumulative=day["profit"].cumsum()).set_index("day")["cumulative"])
+
+        perf_columns = ["bets", "wins", "losses", "pushes", "units", "roi", "win_rate", "avg_clv", "drawdown"]
+        for grain, title in [("month", "📅 By Month"), ("market", "🎯 By Market"), ("confidence", "🔥 By Confidence")]:
+            st.subheader(title)
+            st.dataframe(perf[grain][[grain] + perf_columns], use_container_width=True, hide_index=True)
+
 # ------------------------------------------------------
 # HISTORY TAB — EDIT / DELETE GRADED BETS
 # ------------------------------------------------------
@@ -139,15 +159,33 @@ with tab_history:
     st.markdown("## 📜 Bet History (Private)")
     st.caption("Edit or delete graded bets. Use sparingly.")
 
-    results = ensure_columns(read_csv_safe(RESULTS_PATH), RESULTS_COLS)
-
-    if results.empty:
-        st.info("No history yet.")
+    # ---------- FILTERS (applied in the ledger, not in pandas) ----------
+    f_dates, f_search, f_market, f_result = st.columns([2, 2, 1, 1])
+    date_range = f_dates.date_input("Dates", value=(), key="history_dates")
+    search = f_search.text_input("Search team / selection", key="history_search")
+    markets = f_market.multiselect("Market", MARKETS, key="history_market")
+    outcomes = f_result.multiselect("Result", RESULTS, key="history_result")
+
+    filters = {
+        "start": date_range[0].isoformat() if len(date_range) > 0 else None,
+        "end": date_range[-1].isoformat() if len(date_range) > 0 else None,
+        "market": markets or None,
+        "result": outcomes or None,
+        "search": search or None,
+    }
+    total = LEDGER.count(**filters)
+
+    if total == 0:
+        st.info("No history yet." if not any(filters.values()) else "No bets match these filters.")
     else:
-        results["date"] = pd.to_datetime(results["date"], errors="coerce")
+        # ---------- ONE PAGE AT A TIME ----------
+        pages = (total - 1) // HISTORY_PAGE_SIZE + 1
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1)
+        results = LEDGER.query(**filters, limit=HISTORY_PAGE_SIZE, offset=(page - 1) * HISTORY_PAGE_SIZE)
+        st.caption(f"{total} bets · showing {len(results)}")
 
         st.dataframe(
-            results.sort_values("date", ascending=False),
+            results,
             use_container_width=True,
             hide_index=True
         )
@@ -155,23 +193,28 @@ with tab_history:
         st.divider()
         st.markdown("### ✏️ Edit / 🗑️ Delete Bet")
 
-        labels = [
-            f"{i} | {results.loc[i,'date'].date()} | {results.loc[i,'game']} | {results.loc[i,'selection']} | {results.loc[i,'result']}"
-            for i in results.index
-        ]
-
-        choice = st.selectbox("Select a bet", [""] + labels)
+        # Labels for this page only, keyed by the stable bet id
+        labels = dict(zip(
+            results.index,
+            results.index.astype(str) + " | " + results["date"].astype(str) + " | "
+            + results["game"].astype(str) + " | " + results["selection"].astype(str) + " | "
+            + results["result"].fillna("").astype(str),
+        ))
+
+        bet_id = st.selectbox(
+            "Select a bet", [None] + list(labels),
+            format_func=lambda i: "" if i is None else labels[i],
+        )
 
-        if choice:
-            idx = int(choice.split("|")[0].strip())
-            row = results.loc[idx]
+        if bet_id is not None:
+            row = LEDGER.get(bet_id)
 
             with st.form("edit_history_form"):
                 game = st.text_input("Game", row["game"])
                 selection = st.text_input("Selection", row["selection"])
                 odds = st.number_input("Odds", value=int(row["odds"]))
                 bet_size = st.number_input("To Win ($)", value=float(row["bet_size"]))
-                result = st.selectbox("Result", ["WIN","LOSS","PUSH"], index=["WIN","LOSS","PUSH"].index(row["result"]))
+                result = st.selectbox("Result", ["WIN","LOSS","PUSH"], index=RESULTS.index(row["result"]) if row["result"] in RESULTS else 0)
                 confidence = st.selectbox("Confidence", ["LOW","MEDIUM","HIGH"], index=["LOW","MEDIUM","HIGH"].index(row["confidence"] or "LOW"))
 
                 save = st.form_submit_button("💾 Save Changes")
@@ -181,29 +224,30 @@ with tab_history:
                 stake = stake_from_to_win(bet_size, odds)
                 profit = bet_size if result == "WIN" else -stake if result == "LOSS" else 0
 
-                results.loc[idx] = {
-                    "date": row["date"].date().isoformat(),
-                    "game": game,
-                    "market": row["market"],
-                    "selection": selection,
-                    "odds": odds,
-                    "bet_size": bet_size,
-                    "result": result,
-                    "profit": profit,
-                    "confidence": confidence,
-                    "graded_at": NOW,
-                    "home_score": row["home_score"],
-                    "away_score": row["away_score"],
-                    "closing_line": row["closing_line"],
-                    "clv": row["clv"]
-                }
-
-                results.to_csv(RESULTS_PATH, index=False)
-                st.success("✅ Bet updated")
-                rerun()
+                try:
+                    LEDGER.update(
+                        bet_id,
+                        game=game,
+                        selection=selection,
+                        odds=odds,
+                        bet_size=bet_size,
+                        result=result,
+                        profit=profit,
+                        confidence=confidence,
+                        graded_at=NOW,
+                    )
+                except ValueError as exc:
+                    st.error(f"❌ Not saved: {exc}")
+                else:
+                    st.success("✅ Bet updated")
+                    rerun()
 
             if delete:
-                results = results.drop(idx).reset_index(drop=True)
-                results.to_csv(RESULTS_PATH, index=False)
+                LEDGER.delete(bet_id)
                 st.success("🗑️ Bet deleted")
                 rerun()
+
+# ================================
+# TRACE (no-op unless NCAAB_TRACE is set)
+# ================================
+flush_trace()
@@ -1,109 +1,284 @@
+import numpy as np
 import pandas as pd
-from models.projections import project_game
-from betting.value import spread_value, total_value
+from models.fit import load_params
+from models.projections import project_games
+from models.ratings_history import RatingsHistory
+from models.team_stats import TeamStatsStore, attach_team_stats
+from betting.value import spread_value, total_value, units_from_confidence, CONFIDENCE_TIERS
 from betting.moneyline import is_plus_ev, payout_from_odds, kelly_lite_bet
 
 
-def run_backtest(filepath):
-    df = pd.read_csv(filepath)
+# ---------------- CONFIG ----------------
+START_BANKROLL = 100.0
+UNIT = 10.0
+HISTORY_PATH = "backtest/bankroll_history.npz"
 
-    bankroll = 100.0
-    bankroll_history = [bankroll]
-    unit = 10.0
+MARKETS = ["Spread", "Total", "Moneyline"]
 
-    spread_bets = spread_wins = 0
-    total_bets = total_wins = 0
-    ml_bets = ml_wins = 0
+# Per-market outcome columns, for the home (A) spread, the over and the
+# home moneyline; bets on the away side / under grade as the opposite.
+# When absent the legacy `result` column (1 = win, anything else = loss)
+# is the result of whichever side was bet, in every market.
+# spread_line is the home handicap (-5.5 = home gives 5.5), like daily_games.csv.
+OUTCOME_COLUMNS = {
+    "Spread": "spread_result",
+    "Total": "total_result",
+    "Moneyline": "ml_result",
+}
 
-    profit = 0.0
+WIN, LOSS, PUSH = 1, 0, -1
 
-    for _, row in df.iterrows():
-        teamA = {
-            "off_eff": row["A_off"],
-            "def_eff": row["A_def"],
-            "tempo": row["A_tempo"],
-            "home": row["A_home"],
-            "rest": row["A_rest"],
-            "injury": row["A_injury"]
-        }
+# Betting thresholds and staking rules; a sweep overrides any of these
+DEFAULT_PARAMS = {
+    "spread_threshold": 2,
+    "total_threshold": 5,
+    "spread_edge_scale": 10,
+    "total_edge_scale": 15,
+    "kelly_min": 0.5,
+    "kelly_max": 3.0,
+    "staking": "kelly",             # or "tiers" (daily-card confidence tiers)
+    "confidence_tiers": CONFIDENCE_TIERS,
+}
+
+LEDGER_COLUMNS = ["row", "market", "edge", "odds", "stake", "outcome", "profit", "bankroll"]
+
+
+# ---------------- OUTCOMES ----------------
+def outcome_codes(values):
+    """
+    Maps an outcome column to WIN / LOSS / PUSH codes.
+    Accepts 1 / 0 / -1 or "WIN" / "LOSS" / "PUSH"; anything else
+    (blank, NaN) is ungraded and comes back as NaN.
+    """
+    values = pd.Series(values)
+    if not pd.api.types.is_numeric_dtype(values):
+        values = values.astype(str).str.strip().str.upper().map(
+            {"WIN": WIN, "LOSS": LOSS, "PUSH": PUSH, "1": WIN, "0": LOSS, "-1": PUSH}
+        )
+    codes = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+    return np.where(np.isin(codes, [WIN, LOSS, PUSH]), codes, np.nan)
+
+
+def _market_outcomes(df, market):
+    column = OUTCOME_COLUMNS[market]
+    if column in df.columns:
+        return outcome_codes(df[column])
+    return np.where(df["result"].to_numpy() == 1, WIN, LOSS).astype(float)
+
+
+# ---------------- LEDGER ----------------
+def ledger_arrays(df, model_params=None):
+    """
+    The projected, per-game float columns the ledger needs. Computed once
+    per dataset so a parameter sweep can reuse (and share) them.
+    `model_params` are the projection coefficients (DEFAULT_PARAMS when
+    omitted; not to be confused with the betting `params` below).
+    """
+    df = df.reset_index(drop=True)
+    model_spread, model_total, win_prob = project_games(df, model_params)
+
+    arrays = {
+        "model_spread": model_spread,
+        "model_total": model_total,
+        "win_prob": win_prob,
+        "spread_line": df["spread_line"].to_numpy(dtype=float),
+        "total_line": df["total_line"].to_numpy(dtype=float),
+        "ml_odds": df["ml_odds"].to_numpy(dtype=float),
+        "date": (
+            pd.factorize(df["date"], sort=True)[0].astype(float)
+            if "date" in df.columns else np.zeros(len(df))
+        ),
+    }
+    for market, column in OUTCOME_COLUMNS.items():
+        arrays[column] = _market_outcomes(df, market)
+        # 1 when the outcome is the home / over side's (flipped for the other side)
+        arrays[f"{column}_sided"] = np.full(len(df), float(column in df.columns))
+    return arrays
+
+
+def build_ledger(df, unit=UNIT, start_bankroll=START_BANKROLL, params=None, model_params=None):
+    """
+    One row per bet across every market, in game order (spread, total,
+    moneyline within a game). Stakes come from kelly_lite_bet (or the
+    confidence tiers with staking="tiers"), winnings from payout_from_odds,
+    pushes return the stake, and `bankroll` is the running bankroll after
+    each bet settles. `params` overrides entries of DEFAULT_PARAMS.
+    """
+    return ledger_from_arrays(ledger_arrays(df, model_params), unit, start_bankroll, params)
+
+
+def ledger_from_arrays(arrays, unit=UNIT, start_bankroll=START_BANKROLL, params=None):
+    params = {**DEFAULT_PARAMS, **(params or {})}
+
+    model_spread = arrays["model_spread"]
+    model_total = arrays["model_total"]
+    win_prob = arrays["win_prob"]
+    spread_line = arrays["spread_line"]
+    total_line = arrays["total_line"]
+    ml_odds = arrays["ml_odds"]
+    n = len(model_spread)
+
+    # ---------- CANDIDATE BETS PER MARKET ----------
+    # The home side covers when margin + line > 0; the model takes the away
+    # side / under when it disagrees with the home side / over
+    markets = {
+        "Spread": (
+            spread_value(model_spread, -spread_line, params["spread_threshold"]),
+            np.abs(model_spread + spread_line),
+            params["spread_edge_scale"],
+            np.full(n, -110.0),
+            model_spread + spread_line < 0,
+        ),
+        "Total": (
+            total_value(model_total, total_line, params["total_threshold"]),
+            np.abs(model_total - total_line),
+            params["total_edge_scale"],
+            np.full(n, -110.0),
+            model_total < total_line,
+        ),
+        "Moneyline": (
+            is_plus_ev(win_prob, ml_odds),
+            win_prob - (1 / (1 + np.abs(ml_odds) / 100)),
+            1,
+            ml_odds,
+            np.zeros(n, dtype=bool),
+        ),
+    }
+
+    parts = []
+    for code, (market, (placed, edge, edge_scale, odds, other_side)) in enumerate(markets.items()):
+        column = OUTCOME_COLUMNS[market]
+        outcome = arrays[column]
+        flip = other_side & (arrays[f"{column}_sided"] == 1)
+        outcome = np.where(flip & (outcome == WIN), LOSS, np.where(flip & (outcome == LOSS), WIN, outcome))
+        placed = placed & ~np.isnan(outcome)
+        rows = np.flatnonzero(placed)
+        parts.append(pd.DataFrame({
+            "row": rows,
+            "market": code,
+            "raw_edge": edge[rows],
+            "edge": edge[rows] / edge_scale,
+            "odds": odds[rows],
+            "outcome": outcome[rows],
+        }))
+
+    ledger = pd.concat(parts, ignore_index=True).sort_values(["row", "market"], kind="stable")
+    ledger = ledger.reset_index(drop=True)
+
+    # ---------- STAKES / PAYOUTS / BANKROLL PATH ----------
+    odds = ledger["odds"].to_numpy()
+    if params["staking"] == "tiers":
+        stake, win_amt = _tier_stakes(ledger, arrays["date"], unit, params["confidence_tiers"])
+    else:
+        stake = kelly_lite_bet(unit, ledger["edge"].to_numpy(), params["kelly_min"], params["kelly_max"])
+        win_amt = payout_from_odds(odds, stake)
+    outcome = ledger["outcome"].to_numpy()
 
-        teamB = {
-            "off_eff": row["B_off"],
-            "def_eff": row["B_def"],
-            "tempo": row["B_tempo"],
-            "home": 0,
-            "rest": row["B_rest"],
-            "injury": row["B_injury"]
+    ledger["stake"] = stake
+    ledger["profit"] = np.select([outcome == WIN, outcome == PUSH], [win_amt, 0.0], -stake)
+    ledger = ledger[ledger["stake"] > 0].reset_index(drop=True)
+    ledger["bankroll"] = start_bankroll + np.cumsum(ledger["profit"].to_numpy())
+    ledger["market"] = ledger["market"].astype(np.int8)
+    ledger["outcome"] = ledger["outcome"].astype(np.int8)
+
+    return ledger[LEDGER_COLUMNS]
+
+
+def _tier_stakes(ledger, dates, unit, tiers):
+    """
+    Daily-card sizing: confidence is the edge over the median edge of its
+    date and group (points for spreads/totals, probability for moneylines),
+    units come from the tiers and `unit` is the to-win amount per unit.
+    """
+    group = (ledger["market"] == MARKETS.index("Moneyline")).astype(int)
+    card = pd.DataFrame({"date": dates[ledger["row"]], "group": group, "edge": ledger["raw_edge"]})
+    median_edge = card.groupby(["date", "group"])["edge"].transform("median")
+    median_edge = median_edge.where(median_edge != 0, 0.1)
+    confidence_score = (card["edge"] / median_edge).round(2)
+
+    to_win = units_from_confidence(confidence_score, tiers) * unit
+    # The stake that wins `to_win` is the payout of the opposite price
+    stake = payout_from_odds(-ledger["odds"].to_numpy(), to_win)
+    return stake, to_win
+
+
+def summarize(ledger, unit=UNIT, start_bankroll=START_BANKROLL):
+    summary = {}
+    for code, market in enumerate(MARKETS):
+        outcome = ledger["outcome"].to_numpy()[ledger["market"].to_numpy() == code]
+        summary[market] = {
+            "bets": len(outcome),
+            "wins": int((outcome == WIN).sum()),
+            "pushes": int((outcome == PUSH).sum()),
         }
 
-        model_spread, model_total, win_prob = project_game(teamA, teamB)
-
-        # Spread bets (-110)
-        if spread_value(model_spread, row["spread_line"]):
-            spread_bets += 1
-            edge = abs(model_spread - row["spread_line"]) / 10
-            bet_size = kelly_lite_bet(unit, edge)
-
-            bankroll -= bet_size
-            profit -= bet_size
-            bankroll_history.append(bankroll)
-
-            if row["result"] == 1:
-                spread_wins += 1
-                win_amt = payout_from_odds(-110, bet_size)
-                bankroll += bet_size + win_amt
-                profit += bet_size + win_amt
-                bankroll_history.append(bankroll)
-
-        # Total bets (-110)
-        if total_value(model_total, row["total_line"]):
-            total_bets += 1
-            edge = abs(model_total - row["total_line"]) / 15
-            bet_size = kelly_lite_bet(unit, edge)
-
-            bankroll -= bet_size
-            profit -= bet_size
-            bankroll_history.append(bankroll)
-
-            if row["result"] == 1:
-                total_wins += 1
-                win_amt = payout_from_odds(-110, bet_size)
-                bankroll += bet_size + win_amt
-                profit += bet_size + win_amt
-                bankroll_history.append(bankroll)
-
-        # Moneyline bets
-        if is_plus_ev(win_prob, row["ml_odds"]):
-            ml_bets += 1
-
-            edge = win_prob - (1 / (1 + abs(row["ml_odds"]) / 100))
-            bet_size = kelly_lite_bet(unit, edge)
-
-            bankroll -= bet_size
-            profit -= bet_size
-            bankroll_history.append(bankroll)
-
-            if row["result"] == 1:
-                ml_wins += 1
-                win_amt = payout_from_odds(row["ml_odds"], bet_size)
-                bankroll += bet_size + win_amt
-                profit += bet_size + win_amt
-                bankroll_history.append(bankroll)
-
-    total_bets_all = spread_bets + total_bets + ml_bets
-    roi = (profit / (unit * total_bets_all)) * 100 if total_bets_all > 0 else 0
+    bets = len(ledger)
+    profit = float(ledger["profit"].sum())
+    summary["bets"] = bets
+    summary["profit"] = profit
+    summary["final_bankroll"] = start_bankroll + profit
+    summary["roi"] = (profit / (unit * bets)) * 100 if bets > 0 else 0
+    return summary
+
+
+# ---------------- HISTORY FILE ----------------
+def save_history(ledger, path=HISTORY_PATH, start_bankroll=START_BANKROLL):
+    """
+    Compressed columnar history: the bankroll path (starting bankroll
+    first) plus the ledger columns.
+    """
+    np.savez_compressed(
+        path,
+        bankroll=np.concatenate([[start_bankroll], ledger["bankroll"].to_numpy()]),
+        **{c: ledger[c].to_numpy() for c in LEDGER_COLUMNS if c != "bankroll"},
+    )
+
+
+def load_history(path=HISTORY_PATH):
+    with np.load(path) as history:
+        bankroll = history["bankroll"]
+        ledger = pd.DataFrame({c: history[c] for c in LEDGER_COLUMNS if c != "bankroll"})
+    ledger["bankroll"] = bankroll[1:]
+    return bankroll, ledger
+
+
+# ---------------- MAIN FUNCTION ----------------
+def load_games(filepath):
+    """
+    Reads a backtest file. Files with team names but no ratings get them
+    from the stats store: the ratings as of each game's date when there is
+    a history, else today's.
+    """
+    df = pd.read_csv(filepath)
+    if "A_off" not in df.columns and "A_team" in df.columns:
+        history = RatingsHistory()
+        if "date" in df.columns and history.dates():
+            df = history.attach(df)
+        else:
+            df = attach_team_stats(df, TeamStatsStore.open())
+    return df
+
+
+def run_backtest(filepath, history_path=HISTORY_PATH, model_version=None):
+    """
+    Backtests `filepath` with the latest fitted projection coefficients,
+    or the version pinned by `model_version` / NCAAB_MODEL_VERSION.
+    """
+    df = load_games(filepath)
+
+    ledger = build_ledger(df, model_params=load_params(model_version))
+    summary = summarize(ledger)
 
     print("----- RESULTS -----")
-    print("Spread:", spread_wins, "/", spread_bets)
-    print("Totals:", total_wins, "/", total_bets)
-    print("Moneyline:", ml_wins, "/", ml_bets)
+    for market, label in zip(MARKETS, ["Spread:", "Totals:", "Moneyline:"]):
+        stats = summary[market]
+        pushes = f" ({stats['pushes']} push)" if stats["pushes"] else ""
+        print(f"{label} {stats['wins']} / {stats['bets']}{pushes}")
     print("-------------------")
-    print(f"Profit: ${profit:.2f}")
-    print(f"Final Bankroll: ${bankroll:.2f}")
-    print(f"ROI: {roi:.2f}%")
+    print(f"Profit: ${summary['profit']:.2f}")
+    print(f"Final Bankroll: ${summary['final_bankroll']:.2f}")
+    print(f"ROI: {summary['roi']:.2f}%")
 
-    pd.DataFrame({"bankroll": bankroll_history}).to_csv(
-        "backtest/bankroll_history.csv",
-        index=False
-    )
+    save_history(ledger, history_path)
 
+    return ledger
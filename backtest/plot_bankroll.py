@@ -1,11 +1,12 @@
-import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 
-df = pd.read_csv("backtest/bankroll_history.csv")
+with np.load("backtest/bankroll_history.npz") as history:
+    bankroll = history["bankroll"]
 
 plt.figure()
-plt.plot(df["bankroll"])
+plt.plot(bankroll)
 plt.title("Bankroll Over Time")
 plt.xlabel("Bet Number")
 plt.ylabel("Bankroll ($)")
-plt.show()
\ No newline at end of file
+plt.show()
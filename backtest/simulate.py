@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+
+from backtest.backtest import WIN, PUSH, UNIT as BACKTEST_UNIT, outcome_codes
+from betting.moneyline import payout_from_odds
+from ledger.store import DB_PATH, open_ledger
+from run_daily import BANKROLL, UNIT, MAX_DAILY_RISK_PCT, stake_from_to_win
+
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+# ---------------- BET SAMPLES ----------------
+def bets_from_results(path=DB_PATH):
+    """
+    Graded bets from the bet ledger as (date, odds, outcome, units).
+    `bet_size` is the to-win amount, so units are bet_size / UNIT.
+    """
+    with open_ledger(path) as ledger:
+        df = ledger.query(result=["WIN", "LOSS", "PUSH"], order="date, bet_id")
+
+    bets = pd.DataFrame({
+        "date": df["date"].astype(str),
+        "odds": pd.to_numeric(df["odds"], errors="coerce"),
+        "outcome": outcome_codes(df["result"]),
+        "units": pd.to_numeric(df["bet_size"], errors="coerce") / UNIT,
+    })
+    return bets.dropna(subset=["odds", "outcome", "units"]).reset_index(drop=True)
+
+
+def bets_from_ledger(ledger, games=None, unit=BACKTEST_UNIT):
+    """
+    Graded bets from a backtest ledger. Units are the to-win amount over
+    the backtest unit; dates come from `games` when it has a date column.
+    """
+    to_win = payout_from_odds(ledger["odds"].to_numpy(), ledger["stake"].to_numpy())
+    if games is not None and "date" in games.columns:
+        dates = games["date"].astype(str).to_numpy()[ledger["row"].to_numpy()]
+    else:
+        dates = ledger["row"].astype(str).to_numpy()
+
+    return pd.DataFrame({
+        "date": dates,
+        "odds": ledger["odds"].to_numpy(dtype=float),
+        "outcome": ledger["outcome"].to_numpy(dtype=float),
+        "units": to_win / unit,
+    })
+
+
+# ---------------- SIMULATION ----------------
+def simulate(
+    bets,
+    n_paths=100_000,
+    n_days=120,
+    bets_per_day=None,
+    bankroll=BANKROLL,
+    unit=UNIT,
+    max_daily_risk_pct=MAX_DAILY_RISK_PCT,
+    method="bootstrap",
+    ruin_level=0.0,
+    chunk_size=10_000,
+    n_checkpoints=60,
+    seed=0,
+):
+    """
+    Monte Carlo bankroll paths from graded bets.
+
+    Each simulated day draws `bets_per_day` bets (default: the historical
+    average), sizes them at `unit` to win per unit, and admits them in
+    order while the day's total stake fits under max_daily_risk_pct of
+    the starting bankroll, like the daily card. method="bootstrap"
+    resamples whole bets; method="outcomes" keeps the sampled bet's price
+    and size but redraws WIN / LOSS / PUSH from the historical rates.
+
+    Paths are simulated in chunks of `chunk_size` so memory stays flat at
+    100k+ paths. Returns a dict with risk of ruin, final-bankroll and
+    drawdown percentiles, and per-day percentile bands.
+    """
+    if bets.empty:
+        raise ValueError("No graded bets to simulate from")
+
+    rng = np.random.default_rng(seed)
+
+    odds = bets["odds"].to_numpy(dtype=float)
+    outcome = bets["outcome"].to_numpy(dtype=float)
+    to_win = bets["units"].to_numpy(dtype=float) * unit
+    stake = stake_from_to_win(to_win, odds)
+    bet_profit = np.select([outcome == WIN, outcome == PUSH], [to_win, 0.0], -stake)
+
+    if bets_per_day is None:
+        bets_per_day = max(1, int(round(bets.groupby("date").size().mean())))
+
+    win_rate = (outcome == WIN).mean()
+    push_rate = (outcome == PUSH).mean()
+    max_daily_risk = bankroll * max_daily_risk_pct
+
+    checkpoints = np.unique(np.linspace(0, n_days - 1, min(n_checkpoints, n_days)).astype(int))
+    finals, drawdowns, drawdown_pcts, ruined, bands = [], [], [], [], []
+
+    for start in range(0, n_paths, chunk_size):
+        paths = min(chunk_size, n_paths - start)
+        picks = rng.integers(0, len(bets), size=(paths, n_days, bets_per_day))
+
+        day_stake = stake[picks]
+        if method == "outcomes":
+            u = rng.random(picks.shape, dtype=np.float32)
+            profit = np.where(u < win_rate, to_win[picks], -day_stake)
+            profit[(u >= win_rate) & (u < win_rate + push_rate)] = 0.0
+        else:
+            profit = bet_profit[picks]
+
+        # Daily risk cap: cumulative-sum cutoff in card order
+        profit[np.cumsum(day_stake, axis=2) > max_daily_risk] = 0.0
+        daily_pnl = profit.sum(axis=2)
+
+        path = bankroll + np.cumsum(daily_pnl, axis=1)
+        peak = np.maximum(np.maximum.accumulate(path, axis=1), bankroll)
+        drawdown = peak - path
+
+        finals.append(path[:, -1])
+        drawdowns.append(drawdown.max(axis=1))
+        drawdown_pcts.append((drawdown / peak).max(axis=1))
+        ruined.append((path <= ruin_level).any(axis=1))
+        bands.append(path[:, checkpoints])
+
+    finals = np.concatenate(finals)
+    drawdowns = np.concatenate(drawdowns)
+    drawdown_pcts = np.concatenate(drawdown_pcts)
+    bands = np.concatenate(bands)
+
+    band_table = pd.DataFrame(
+        np.percentile(bands, PERCENTILES, axis=0).T,
+        columns=[f"p{p}" for p in PERCENTILES],
+    )
+    band_table.insert(0, "day", checkpoints + 1)
+
+    return {
+        "paths": n_paths,
+        "days": n_days,
+        "bets_per_day": bets_per_day,
+        "risk_of_ruin": float(np.concatenate(ruined).mean()),
+        "prob_profit": float((finals > bankroll).mean()),
+        "final_bankroll": dict(zip(PERCENTILES, np.percentile(finals, PERCENTILES))),
+        "max_drawdown": dict(zip(PERCENTILES, np.percentile(drawdowns, PERCENTILES))),
+        "max_drawdown_pct": dict(zip(PERCENTILES, np.percentile(drawdown_pcts, PERCENTILES))),
+        "bands": band_table,
+    }
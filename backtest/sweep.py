@@ -0,0 +1,136 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from backtest.backtest import (
+    START_BANKROLL,
+    UNIT,
+    ledger_arrays,
+    ledger_from_arrays,
+)
+from models.fit import load_params
+
+
+# ---------------- SEARCH SPACE ----------------
+DEFAULT_GRID = {
+    "spread_threshold": [1, 2, 3, 4],
+    "total_threshold": [3, 5, 7],
+    "spread_edge_scale": [5, 10, 15],
+    "total_edge_scale": [10, 15, 20],
+    "kelly_max": [2.0, 3.0],
+}
+
+
+def grid(space):
+    """Every combination of the listed values."""
+    keys = list(space)
+    for values in itertools.product(*(space[k] for k in keys)):
+        yield dict(zip(keys, values))
+
+
+def random_search(space, n, seed=0):
+    """
+    `n` random configurations. List values are sampled as choices,
+    (low, high) tuples uniformly.
+    """
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        config = {}
+        for key, values in space.items():
+            if isinstance(values, tuple):
+                config[key] = float(rng.uniform(*values))
+            else:
+                config[key] = values[rng.integers(len(values))]
+        yield config
+
+
+# ---------------- SCORING ----------------
+def score_ledger(ledger, unit=UNIT, start_bankroll=START_BANKROLL):
+    bets = len(ledger)
+    profit = float(ledger["profit"].sum())
+    outcome = ledger["outcome"].to_numpy()
+    decided = (outcome == 1).sum() + (outcome == 0).sum()
+
+    path = np.concatenate([[start_bankroll], ledger["bankroll"].to_numpy()])
+    drawdown = np.maximum.accumulate(path) - path
+
+    return {
+        "bets": bets,
+        "win_rate": (outcome == 1).sum() / decided if decided else np.nan,
+        "profit": profit,
+        "roi": (profit / (unit * bets)) * 100 if bets > 0 else 0.0,
+        "final_bankroll": start_bankroll + profit,
+        "max_drawdown": float(drawdown.max()),
+    }
+
+
+# ---------------- SHARED DATASET ----------------
+def share_arrays(arrays):
+    """
+    Copies the ledger arrays into one shared-memory block.
+    Returns the block (caller closes + unlinks) and the layout workers
+    need to attach to it.
+    """
+    names = list(arrays)
+    n = len(arrays[names[0]])
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(names) * n * 8))
+    block = np.ndarray((len(names), n), dtype=np.float64, buffer=shm.buf)
+    for i, name in enumerate(names):
+        block[i] = arrays[name]
+    return shm, (shm.name, names, n)
+
+
+def attach_arrays(layout):
+    shm_name, names, n = layout
+    shm = shared_memory.SharedMemory(name=shm_name)
+    block = np.ndarray((len(names), n), dtype=np.float64, buffer=shm.buf)
+    return shm, {name: block[i] for i, name in enumerate(names)}
+
+
+_WORKER = {}
+
+
+def _init_worker(layout):
+    _WORKER["shm"], _WORKER["arrays"] = attach_arrays(layout)
+
+
+def _evaluate(config):
+    ledger = ledger_from_arrays(_WORKER["arrays"], params=config)
+    return {**config, **score_ledger(ledger)}
+
+
+# ---------------- MAIN FUNCTION ----------------
+def run_sweep(filepath, configs, workers=None, rank_by="roi", min_bets=1, model_version=None):
+    """
+    Evaluates each config (a partial DEFAULT_PARAMS override) against the
+    historical games in `filepath` across a process pool. The file is read
+    and projected once (with the latest or pinned `model_version` of the
+    fitted coefficients); workers read the arrays from shared memory.
+    Returns the results ranked by `rank_by`, best first.
+    """
+    configs = list(configs)
+    arrays = ledger_arrays(pd.read_csv(filepath), load_params(model_version))
+
+    shm, layout = share_arrays(arrays)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(layout,),
+        ) as pool:
+            chunksize = max(1, len(configs) // (4 * (workers or os.cpu_count() or 1)))
+            rows = list(pool.map(_evaluate, configs, chunksize=chunksize))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    results = pd.DataFrame(rows)
+    if results.empty:
+        return results
+
+    results = results[results["bets"] >= min_bets]
+    return results.sort_values(rank_by, ascending=False).reset_index(drop=True)
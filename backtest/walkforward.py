@@ -0,0 +1,191 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from backtest.backtest import (
+    LEDGER_COLUMNS,
+    START_BANKROLL,
+    ledger_arrays,
+    ledger_from_arrays,
+    load_games,
+)
+from backtest.sweep import DEFAULT_GRID, attach_arrays, grid, score_ledger, share_arrays
+from models.fit import ModelFitter
+from models.projections import project_games
+from pipeline.trace import count, span
+
+
+# ---------------- CONFIG ----------------
+TRAIN_DAYS = 60         # game dates in each training window
+TEST_DAYS = 14          # game dates in each out-of-sample window
+MIN_BETS = 20           # in-sample bets a config needs to be selectable
+
+# Columns project_games reads; shared so workers can re-project after a fit
+PROJECTION_COLUMNS = [
+    "A_off", "A_def", "A_tempo", "A_home", "A_rest", "A_injury",
+    "B_off", "B_def", "B_tempo", "B_rest", "B_injury",
+    "A_off_home", "A_def_home", "B_off_away", "B_def_away",
+]
+SCORE_COLUMNS = ["home_score", "away_score"]
+
+
+# ---------------- WINDOWS ----------------
+def windows(n_dates, train_days=TRAIN_DAYS, test_days=TEST_DAYS, step_days=None, anchored=False):
+    """
+    (train, test) date-index ranges as (start, stop) pairs. Test windows
+    follow their training window and, with the default step (= test_days),
+    tile the history without overlap. `anchored` grows the training window
+    from the first date instead of rolling it.
+    """
+    step = step_days or test_days
+    start = 0
+    while start + train_days < n_dates:
+        train = (0 if anchored else start, start + train_days)
+        test = (start + train_days, min(start + train_days + test_days, n_dates))
+        yield train, test
+        start += step
+
+
+def dataset_arrays(df, fit=False):
+    """
+    ledger_arrays for `df` sorted by date (so every window is a contiguous
+    slice), plus `order` (the file row of each game) and, when fitting, the
+    projection inputs and final scores.
+    """
+    df = df.assign(order=np.arange(len(df))).sort_values("date", kind="stable").reset_index(drop=True)
+    # DEFAULT_PARAMS, not the latest fit: that was fitted on the test windows too
+    arrays = ledger_arrays(df)
+    arrays["order"] = df["order"].to_numpy(dtype=float)
+    if fit:
+        for column in PROJECTION_COLUMNS + SCORE_COLUMNS:
+            if column in df.columns:
+                arrays[column] = df[column].to_numpy(dtype=float)
+    return arrays, np.sort(df["date"].astype(str).unique())
+
+
+# ---------------- ONE WINDOW (worker) ----------------
+_WINDOW = {}
+
+
+def _init_window_worker(layout, configs, rank_by, min_bets):
+    _WINDOW["shm"], _WINDOW["arrays"] = attach_arrays(layout)
+    _WINDOW.update(configs=configs, rank_by=rank_by, min_bets=min_bets)
+
+
+def _fit_window(train, test):
+    """Fits the projection on the training games; re-projects both slices."""
+    fitter = ModelFitter()
+    fitter.add(pd.DataFrame({c: train[c] for c in PROJECTION_COLUMNS + SCORE_COLUMNS if c in train}))
+    params = fitter.solve()
+    for part in (train, test):
+        part["model_spread"], part["model_total"], part["win_prob"] = project_games(part, params)
+    return params
+
+
+def _run_window(task):
+    """
+    Selects the config with the best in-sample `rank_by` (among those with
+    at least `min_bets` bets) on the training rows, then books the test rows
+    with it. Returns the window's stats and its out-of-sample ledger.
+    """
+    window, (train_lo, train_hi), (test_lo, test_hi), fit = task
+    shared = _WINDOW["arrays"]
+    train = {name: values[train_lo:train_hi] for name, values in shared.items()}
+    test = {name: values[test_lo:test_hi] for name, values in shared.items()}
+
+    stats = {"window": window}
+    if fit:
+        params = _fit_window(train, test)
+        stats.update({f"fit_{k}": v for k, v in params.items()})
+
+    # ---------- IN-SAMPLE SELECTION ----------
+    rank_by, best, best_score = _WINDOW["rank_by"], {}, None
+    for config in _WINDOW["configs"]:
+        score = score_ledger(ledger_from_arrays(train, params=config))
+        if score["bets"] >= _WINDOW["min_bets"] and (best_score is None or score[rank_by] > best_score):
+            best, best_score = config, score[rank_by]
+    stats.update(best)
+    stats[f"train_{rank_by}"] = best_score
+
+    # ---------- OUT OF SAMPLE ----------
+    ledger = ledger_from_arrays(test, params=best)
+    ledger["row"] = shared["order"][test_lo + ledger["row"].to_numpy()].astype(int)
+    ledger["window"] = window
+    score = score_ledger(ledger)
+    del score["final_bankroll"]
+    stats.update(score)
+    return stats, ledger
+
+
+# ---------------- MAIN FUNCTION ----------------
+def run_walkforward(
+    filepath,
+    configs=None,
+    train_days=TRAIN_DAYS,
+    test_days=TEST_DAYS,
+    step_days=None,
+    anchored=False,
+    fit=None,
+    workers=None,
+    rank_by="roi",
+    min_bets=MIN_BETS,
+):
+    """
+    Walk-forward backtest of the games in `filepath`: each training window
+    picks the best of `configs` (default: the sweep grid) and, with `fit`
+    (default: when the file has final scores), refits the projection
+    coefficients; the following test window is booked with the result.
+    The file is read and projected once and shared with the process pool.
+
+    Returns (ledger, stats): the stitched out-of-sample ledger (`row` is
+    the file row, `bankroll` runs across all windows) and one row of stats
+    per window.
+    """
+    configs = list(configs if configs is not None else grid(DEFAULT_GRID))
+    df = load_games(filepath)
+    if "date" not in df.columns:
+        raise ValueError("Walk-forward backtests need a date column")
+    if fit is None:
+        fit = all(c in df.columns for c in SCORE_COLUMNS)
+    elif fit and not all(c in df.columns for c in SCORE_COLUMNS):
+        raise ValueError("Fitting the projection needs home_score / away_score")
+
+    with span("walkforward") as s:
+        arrays, dates = dataset_arrays(df, fit)
+        spans = list(windows(len(dates), train_days, test_days, step_days, anchored))
+        bounds = np.searchsorted(arrays["date"], np.arange(len(dates) + 1))
+        tasks = [
+            (i, (bounds[train[0]], bounds[train[1]]), (bounds[test[0]], bounds[test[1]]), fit)
+            for i, (train, test) in enumerate(spans)
+        ]
+        if not tasks:
+            raise ValueError(f"{len(dates)} game dates is not enough for a {train_days}-day training window")
+        s.count("windows", len(tasks))
+        count("walkforward_windows", len(tasks))
+
+        shm, layout = share_arrays(arrays)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(workers or os.cpu_count(), len(tasks)),
+                initializer=_init_window_worker,
+                initargs=(layout, configs, rank_by, min_bets),
+            ) as pool:
+                results = list(pool.map(_run_window, tasks))
+        finally:
+            shm.close()
+            shm.unlink()
+
+    # ---------- STITCH ----------
+    ledger = pd.concat([part for _, part in results], ignore_index=True)
+    ledger["bankroll"] = START_BANKROLL + np.cumsum(ledger["profit"].to_numpy())
+    ledger = ledger[LEDGER_COLUMNS + ["window"]]
+
+    stats = pd.DataFrame([row for row, _ in results])
+    stats.insert(1, "train_start", [dates[train[0]] for train, _ in spans])
+    stats.insert(2, "train_end", [dates[train[1] - 1] for train, _ in spans])
+    stats.insert(3, "test_start", [dates[test[0]] for _, test in spans])
+    stats.insert(4, "test_end", [dates[test[1] - 1] for _, test in spans])
+    stats["bankroll"] = START_BANKROLL + stats["profit"].cumsum()
+    return ledger, stats
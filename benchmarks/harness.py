@@ -0,0 +1,216 @@
+import contextlib
+import io
+import json
+import os
+import platform
+import runpy
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.synthetic import GAME_FILE_COLUMNS, SyntheticLeague
+
+
+# ---------------- CONFIG ----------------
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINES_PATH = REPO_ROOT / "benchmarks" / "baselines.json"
+
+TOLERANCE = 0.30        # slower than baseline by more than this = regression
+MIN_DELTA = 0.02        # ...and by at least this many seconds (timer noise)
+NOISE = 2.0             # ...and by this many times the run's own min-median spread
+REPEAT = 5              # timed runs per benchmark; the min is compared
+SCALAR_GAMES = 20000    # project_game is timed on at most this many games
+
+DAILY_COLUMNS = GAME_FILE_COLUMNS[1:17]
+
+
+# ================================
+# WORKSPACE
+# ================================
+class Workspace:
+    """
+    A temporary copy of the data/ layout filled from a SyntheticLeague:
+    Torvik exports, team stats, a slate, the season file, final scores,
+    closing lines, a pending-bet ledger and an archived picks file.
+    Benchmarks run with it as the working directory, since every script
+    reads relative data/ paths.
+    """
+
+    def __init__(self, league, root=None):
+        self.league = league
+        self.root = Path(root or tempfile.mkdtemp(prefix="ncaab-bench-"))
+        self.data = self.root / "data"
+        self.history = self.data / "history"
+        self.ledger_template = self.root / "bets.template.db"
+
+    def __enter__(self):
+        self._cwd = os.getcwd()
+        os.chdir(self.root)
+        return self
+
+    def __exit__(self, *exc):
+        os.chdir(self._cwd)
+        return False
+
+    def build(self):
+        from ledger.store import BetLedger
+        from scripts.update_team_stats import update_team_stats
+
+        league = self.league
+        self.history.mkdir(parents=True, exist_ok=True)
+        (self.root / "backtest").mkdir(exist_ok=True)
+
+        with self, contextlib.redirect_stdout(io.StringIO()):
+            league.write_torvik(self.data)
+            update_team_stats()
+
+            games = league.games()
+            games.to_csv(self.data / "season_games.csv", index=False)
+            league.slate()[DAILY_COLUMNS].to_csv(self.data / "daily_games.csv", index=False)
+            league.final_scores(games).to_csv(self.data / "final_scores.csv", index=False)
+            league.closing_lines(games).to_csv(self.data / "closing_lines.csv", index=False)
+            league.legacy_picks(1000 * league.scale).to_csv(self.history / "2025-01-01_picks.csv", index=False)
+
+            with BetLedger(self.ledger_template) as ledger:
+                ledger.upsert(league.bets(games))
+        return self
+
+    def reset_ledger(self):
+        """Fresh copy of the pending-bet ledger (grading writes to it)."""
+        db = self.history / "bets.db"
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{db}{suffix}").unlink(missing_ok=True)
+        shutil.copyfile(self.ledger_template, db)
+
+    def cleanup(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+# ================================
+# BENCHMARKS
+# ================================
+def _project_game_scalar(games):
+    from models.projections import project_game
+
+    rows = games.head(SCALAR_GAMES)
+    A = rows[["A_off", "A_def", "A_tempo", "A_home", "A_rest", "A_injury"]]
+    A.columns = ["off_eff", "def_eff", "tempo", "home", "rest", "injury"]
+    B = rows[["B_off", "B_def", "B_tempo", "B_rest", "B_injury"]]
+    B.columns = ["off_eff", "def_eff", "tempo", "rest", "injury"]
+    teams = list(zip(A.to_dict("records"), B.to_dict("records")))
+    return lambda: [project_game(a, b) for a, b in teams]
+
+
+def benchmarks(workspace):
+    """
+    name -> (setup, run). `setup` (untimed) runs before every repeat;
+    `run` is what gets timed. All paths are relative to the workspace.
+    """
+    from backtest.backtest import run_backtest
+    from feeds.odds import flatten_odds, game_lines
+    from models.projections import project_games
+    from models.torvik import build_team_stats, load_team_stats
+    from run_daily import generate_daily_picks
+    from scripts.grade_bets import grade_bets
+
+    league = workspace.league
+    games = league.games()
+    payload = league.odds_payload(league.slate())
+
+    def none():
+        pass
+
+    return {
+        "project_game": (none, _project_game_scalar(games)),
+        "project_games": (none, lambda: project_games(games)),
+        "torvik_parse": (none, build_team_stats),
+        "torvik_cached": (none, load_team_stats),
+        "odds_board": (none, lambda: game_lines(flatten_odds(payload))),
+        "daily_picks_slate": (none, lambda: generate_daily_picks("data/daily_games.csv", "data/daily_picks.csv")),
+        "daily_picks_season": (none, lambda: generate_daily_picks("data/season_games.csv", "data/season_picks.csv")),
+        "run_backtest": (none, lambda: run_backtest("data/season_games.csv", "backtest/bankroll_history.npz")),
+        "grade_bets": (workspace.reset_ledger, grade_bets),
+        "grade_bets_legacy": (workspace.reset_ledger, lambda: runpy.run_path(str(REPO_ROOT / "grade_bets.py"))),
+    }
+
+
+def time_call(setup, run, repeat):
+    """Seconds for each of `repeat` runs, setup excluded, output silenced."""
+    times = []
+    for _ in range(repeat):
+        setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def run_benchmarks(scale=1, repeat=REPEAT, only=None, seed=0):
+    """
+    Builds a workspace for a SyntheticLeague at `scale` and times every
+    benchmark (or just `only`). Returns a frame of min / median seconds.
+    """
+    workspace = Workspace(SyntheticLeague(scale=scale, seed=seed)).build()
+    try:
+        with workspace:
+            rows = []
+            for name, (setup, run) in benchmarks(workspace).items():
+                if only and name not in only:
+                    continue
+                times = time_call(setup, run, repeat)
+                rows.append({"benchmark": name, "min": min(times), "median": statistics.median(times)})
+                print(f"⏱️ {name}: {min(times):.4f}s")
+    finally:
+        workspace.cleanup()
+    return pd.DataFrame(rows, columns=["benchmark", "min", "median"])
+
+
+# ================================
+# BASELINES
+# ================================
+def machine():
+    return f"{platform.system()} {platform.machine()} / Python {platform.python_version()}"
+
+
+def load_baselines(path=BASELINES_PATH):
+    try:
+        return json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def record_baselines(results, scale, path=BASELINES_PATH):
+    """Stores each benchmark's min time as the baseline for `scale`."""
+    baselines = load_baselines(path)
+    entry = baselines.setdefault(f"scale={scale}", {})
+    entry["machine"] = machine()
+    entry["seconds"] = {**entry.get("seconds", {}), **{r.benchmark: round(r.min, 5) for r in results.itertuples()}}
+    Path(path).write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+    return baselines
+
+
+def baseline_machine(scale, path=BASELINES_PATH):
+    """The machine the `scale` baselines were recorded on (None if unrecorded)."""
+    return load_baselines(path).get(f"scale={scale}", {}).get("machine")
+
+
+def compare(results, scale, tolerance=TOLERANCE, min_delta=MIN_DELTA, noise=NOISE, path=BASELINES_PATH):
+    """
+    Results joined to the recorded baselines, with the ratio and a
+    `regressed` flag: slower by more than `tolerance`, by more than
+    `min_delta` seconds and by more than `noise` times the run's own
+    median - min spread, so short benchmarks are not flagged on jitter.
+    """
+    seconds = load_baselines(path).get(f"scale={scale}", {}).get("seconds", {})
+    df = results.copy()
+    df["baseline"] = df["benchmark"].map(seconds)
+    df["ratio"] = (df["min"] / df["baseline"]).round(2)
+    delta = df["min"] - df["baseline"]
+    floor = (noise * (df["median"] - df["min"])).clip(lower=min_delta)
+    df["regressed"] = (df["min"] > df["baseline"] * (1 + tolerance)) & (delta > floor)
+    return df
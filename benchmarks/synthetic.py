@@ -0,0 +1,336 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from betting.moneyline import implied_probability
+from models.probability import MARGIN_SD, TOTAL_SD, normal_cdf
+from models.projections import project_games
+
+
+# ---------------- CONFIG ----------------
+N_TEAMS = 365
+SEASON_GAMES = 5500          # Division I regular season, roughly
+SEASON_START = (11, 4)       # month, day
+SEASON_DAYS = 128            # early November -> mid March
+LAST_SEASON = 2025
+
+BOOKS = ["draftkings", "fanduel", "betmgm", "caesars", "bovada", "pointsbetus"]
+
+# The only games grade_bets.py (top level) has final scores for
+LEGACY_GAMES = {
+    "Duke vs UNC": ("Duke", "UNC"),
+    "Kansas vs Baylor": ("Kansas", "Baylor"),
+    "UConn vs Villanova": ("UConn", "Villanova"),
+}
+
+GAME_FILE_COLUMNS = [
+    "date", "A_team", "B_team",
+    "A_off", "A_def", "A_tempo", "A_home", "A_rest", "A_injury",
+    "B_off", "B_def", "B_tempo", "B_rest", "B_injury",
+    "spread_line", "total_line", "ml_odds",
+    "home_score", "away_score", "spread_result", "total_result", "ml_result",
+]
+
+
+def american_odds(prob, vig=0.02):
+    """American price for a win probability, with `vig` added to it."""
+    prob = np.clip(np.asarray(prob, dtype=float) + vig / 2, 0.01, 0.99)
+    odds = np.where(prob >= 0.5, -100 * prob / (1 - prob), 100 * (1 - prob) / prob)
+    return np.round(odds / 5) * 5
+
+
+def _result(diff):
+    return np.select([diff > 0, diff < 0], ["WIN", "LOSS"], "PUSH")
+
+
+class SyntheticLeague:
+    """
+    A seeded, fully synthetic NCAAB league for benchmarks and fixtures.
+
+    `scale` is in seasons: 1 is a real season (~5,500 games over 365
+    teams), 10 and 100 stack that many seasons (ending LAST_SEASON), each
+    with freshly drawn ratings. The same seed and scale always produce
+    the same teams, schedule, lines, scores and payloads.
+    """
+
+    def __init__(self, scale=1, seed=0, n_teams=N_TEAMS):
+        self.scale = scale
+        self.seed = seed
+        self.n_teams = n_teams
+        self.teams = [f"Team {i:03d}" for i in range(n_teams)]
+        self._games = None
+
+    def _rng(self, *stream):
+        return np.random.default_rng([self.seed, *stream])
+
+    # ---------------- TEAMS ----------------
+    def ratings(self, season=LAST_SEASON):
+        """
+        One season's team_stats frame (off/def efficiency, tempo and
+        home / away splits), indexed by team.
+        """
+        rng = self._rng(1, season)
+        strength = rng.normal(0, 1, self.n_teams)
+        off = 105 + 6 * strength + rng.normal(0, 3, self.n_teams)
+        deff = 105 - 6 * strength + rng.normal(0, 3, self.n_teams)
+        home_edge = rng.normal(1.5, 1.0, self.n_teams)
+        return pd.DataFrame({
+            "off_eff": off.round(3),
+            "def_eff": deff.round(3),
+            "tempo": rng.normal(68, 3, self.n_teams).round(3),
+            "off_eff_home": (off + home_edge).round(3),
+            "def_eff_home": (deff - home_edge).round(3),
+            "off_eff_away": (off - home_edge).round(3),
+            "def_eff_away": (deff + home_edge).round(3),
+        }, index=pd.Index(self.teams, name="team"))
+
+    def write_torvik(self, data_dir, season=LAST_SEASON):
+        """
+        The three headerless Torvik exports (team, adjoe, adjde, adjt)
+        for `season` under `data_dir`, in the layout models.torvik reads.
+        """
+        data_dir = Path(data_dir)
+        data_dir.mkdir(parents=True, exist_ok=True)
+        stats = self.ratings(season)
+        paths = {}
+        for split, suffix in [("raw", ""), ("home", "_home"), ("away", "_away")]:
+            frame = pd.DataFrame({
+                "team": stats.index,
+                "adjoe": stats[f"off_eff{suffix}"].to_numpy(),
+                "adjde": stats[f"def_eff{suffix}"].to_numpy(),
+                "adjt": stats["tempo"].to_numpy(),
+            })
+            paths[split] = data_dir / f"torvik_{split}.csv"
+            paths[split].write_text("\n" + frame.to_csv(index=False, header=False))
+        return paths
+
+    # ---------------- SCHEDULE / GAMES ----------------
+    def seasons(self):
+        return list(range(LAST_SEASON - self.scale + 1, LAST_SEASON + 1))
+
+    def _season_games(self, season):
+        rng = self._rng(2, season)
+        start = pd.Timestamp(season - 1, *SEASON_START)
+        per_day = -(-SEASON_GAMES // SEASON_DAYS)
+
+        # Each day pairs 2 * per_day distinct teams, home team first
+        order = rng.random((SEASON_DAYS, self.n_teams)).argsort(axis=1)[:, : 2 * per_day]
+        home, away = order[:, 0::2].ravel(), order[:, 1::2].ravel()
+        days = np.repeat(np.arange(SEASON_DAYS), per_day)
+        keep = slice(0, SEASON_GAMES)
+        home, away, days = home[keep], away[keep], days[keep]
+
+        stats = self.ratings(season)
+        teams = np.asarray(self.teams, dtype=object)
+        games = pd.DataFrame({
+            "date": (start + pd.to_timedelta(days, unit="D")).strftime("%Y-%m-%d"),
+            "A_team": teams[home],
+            "B_team": teams[away],
+        })
+        for side, ids, home_flag in [("A", home, 1), ("B", away, None)]:
+            games[f"{side}_off"] = stats["off_eff"].to_numpy()[ids]
+            games[f"{side}_def"] = stats["def_eff"].to_numpy()[ids]
+            games[f"{side}_tempo"] = stats["tempo"].to_numpy()[ids]
+            if home_flag is not None:
+                games[f"{side}_home"] = home_flag
+            games[f"{side}_rest"] = rng.integers(1, 4, len(games))
+            games[f"{side}_injury"] = rng.binomial(1, 0.1, len(games))
+
+        # ---------- MARKET (a sharp-ish book around the truth) ----------
+        # spread_line is the home handicap (-5.5 = home gives 5.5), as in
+        # daily_games.csv; spread_result grades the home side
+        margin, total, _ = project_games(games)
+        spread_line = -np.round((margin + rng.normal(0, 2.0, len(games))) * 2) / 2
+        total_line = np.round((total + rng.normal(0, 3.0, len(games))) * 2) / 2
+        home_prob = 1 - normal_cdf(0, margin, MARGIN_SD)
+        games["spread_line"] = spread_line
+        games["total_line"] = total_line
+        games["ml_odds"] = american_odds(home_prob)
+
+        # ---------- RESULTS ----------
+        final_margin = np.rint(margin + rng.normal(0, MARGIN_SD, len(games)))
+        final_margin = np.where(final_margin == 0, 1, final_margin)   # overtime
+        final_total = np.rint(total + rng.normal(0, TOTAL_SD, len(games)))
+        final_total += (final_total + final_margin) % 2                # same parity
+        games["home_score"] = ((final_total + final_margin) / 2).astype(int)
+        games["away_score"] = ((final_total - final_margin) / 2).astype(int)
+        games["spread_result"] = _result(final_margin + spread_line)
+        games["total_result"] = _result(final_total - total_line)
+        games["ml_result"] = np.where(final_margin > 0, "WIN", "LOSS")
+        return games
+
+    def games(self):
+        """
+        Every game of every season in the daily_games.csv layout plus
+        date, final scores and per-market outcomes for home (A) spread,
+        the over and home moneyline — the file run_backtest reads.
+        """
+        if self._games is None:
+            self._games = pd.concat(
+                [self._season_games(s) for s in self.seasons()], ignore_index=True
+            )[GAME_FILE_COLUMNS]
+        return self._games
+
+    def slate(self, day=None):
+        """One day's games (default the first of January of the last season)."""
+        games = self.games()
+        day = day or f"{LAST_SEASON}-01-01"
+        return games[games["date"] == day].reset_index(drop=True)
+
+    # ---------------- FEED PAYLOADS ----------------
+    def odds_payload(self, games, books=BOOKS):
+        """
+        Odds API /v4/sports/basketball_ncaab/odds response for `games`:
+        h2h / spreads / totals from every book, each a little off the
+        consensus line and price.
+        """
+        rng = self._rng(3, len(games))
+        payload = []
+        for i, game in enumerate(games.itertuples(index=False)):
+            tip = datetime.fromisoformat(game.date).replace(hour=23, tzinfo=timezone.utc)
+            bookmakers = []
+            for book in books:
+                shade = rng.choice([-0.5, 0.0, 0.0, 0.5], 2)
+                juice = rng.choice([-115, -110, -110, -105], 4)
+                home_ml = float(game.ml_odds + rng.choice([-10, 0, 10]))
+                away_ml = float(american_odds(1 - implied_probability(game.ml_odds), vig=0.04))
+                spread = game.spread_line + shade[0]
+                total = game.total_line + shade[1]
+                bookmakers.append({
+                    "key": book,
+                    "title": book.title(),
+                    "last_update": (tip - timedelta(hours=6)).isoformat().replace("+00:00", "Z"),
+                    "markets": [
+                        {"key": "h2h", "outcomes": [
+                            {"name": game.A_team, "price": home_ml},
+                            {"name": game.B_team, "price": away_ml},
+                        ]},
+                        {"key": "spreads", "outcomes": [
+                            {"name": game.A_team, "price": int(juice[0]), "point": spread},
+                            {"name": game.B_team, "price": int(juice[1]), "point": -spread},
+                        ]},
+                        {"key": "totals", "outcomes": [
+                            {"name": "Over", "price": int(juice[2]), "point": total},
+                            {"name": "Under", "price": int(juice[3]), "point": total},
+                        ]},
+                    ],
+                })
+            payload.append({
+                "id": f"synthetic-{game.date}-{i}",
+                "sport_key": "basketball_ncaab",
+                "commence_time": tip.isoformat().replace("+00:00", "Z"),
+                "home_team": game.A_team,
+                "away_team": game.B_team,
+                "bookmakers": bookmakers,
+            })
+        return payload
+
+    def scoreboard(self, games):
+        """ESPN scoreboard response ({"events": [...]}) with `games` final."""
+        events = []
+        for i, game in enumerate(games.itertuples(index=False)):
+            events.append({
+                "id": str(i),
+                "date": f"{game.date}T23:00Z",
+                "status": {"type": {"state": "post", "completed": True}},
+                "competitions": [{"competitors": [
+                    {"homeAway": "home", "team": {"displayName": game.A_team}, "score": str(game.home_score)},
+                    {"homeAway": "away", "team": {"displayName": game.B_team}, "score": str(game.away_score)},
+                ]}],
+            })
+        return {"events": events}
+
+    def final_scores(self, games):
+        """data/final_scores.csv rows for `games`."""
+        return pd.DataFrame({
+            "date": games["date"],
+            "home_team": games["A_team"],
+            "away_team": games["B_team"],
+            "home_score": games["home_score"],
+            "away_score": games["away_score"],
+            "status": "FINAL",
+        })
+
+    def closing_lines(self, games):
+        """data/closing_lines.csv rows for `games` (the close moves a little)."""
+        rng = self._rng(4, len(games))
+        return pd.DataFrame({
+            "home_team": games["A_team"],
+            "away_team": games["B_team"],
+            "closing_spread": games["spread_line"] + rng.choice([-1.0, -0.5, 0.0, 0.5, 1.0], len(games)),
+            "closing_total": games["total_line"] + rng.choice([-1.5, -0.5, 0.0, 0.5, 1.5], len(games)),
+            "closing_ml_home": games["ml_odds"],
+            "closing_ml_away": american_odds(1 - implied_probability(games["ml_odds"]), vig=0.04),
+        })
+
+    # ---------------- LEDGERS ----------------
+    def bets(self, games, graded=False):
+        """
+        A bet ledger (BET_COLUMNS) with one spread, total and moneyline
+        bet per game; pending unless `graded`, in which case results come
+        from the final scores.
+        """
+        rng = self._rng(5, len(games), int(graded))
+        n = len(games)
+        game = (games["A_team"] + " vs " + games["B_team"]).to_numpy()
+        take_home = rng.random(n) < 0.5
+        take_over = rng.random(n) < 0.5
+        spread_team = np.where(take_home, games["A_team"], games["B_team"])
+        spread_line = np.where(take_home, games["spread_line"], -games["spread_line"])
+
+        bets = pd.DataFrame({
+            "date": np.tile(games["date"].to_numpy(), 3),
+            "game": np.tile(game, 3),
+            "market": np.repeat(["Spread", "Total", "Moneyline"], n),
+            "selection": np.concatenate([
+                spread_team + " " + pd.Series(spread_line).astype(str).to_numpy(),
+                np.where(take_over, "Over ", "Under ") + games["total_line"].astype(str).to_numpy(),
+                games["A_team"].to_numpy() + " ML",
+            ]),
+            "odds": np.concatenate([np.full(2 * n, -110), games["ml_odds"].to_numpy()]).astype(int),
+            "bet_size": np.round(rng.choice([5.0, 10.0, 15.0, 20.0], 3 * n), 2),
+            "confidence": rng.choice(["LOW", "MEDIUM", "HIGH"], 3 * n),
+        })
+        if not graded:
+            return bets
+
+        home_margin = (games["home_score"] - games["away_score"]).to_numpy()
+        points = (games["home_score"] + games["away_score"]).to_numpy()
+        diff = np.concatenate([
+            np.where(take_home, home_margin, -home_margin) + spread_line,
+            np.where(take_over, points - games["total_line"], games["total_line"] - points),
+            np.where(home_margin > 0, 1, -1),
+        ])
+        bets["result"] = _result(diff)
+        stake = np.where(bets["odds"] < 0, bets["bet_size"] * np.abs(bets["odds"]) / 100, bets["bet_size"] * 100 / bets["odds"])
+        bets["profit"] = np.select([bets["result"] == "WIN", bets["result"] == "PUSH"], [bets["bet_size"], 0.0], -stake).round(2)
+        bets["home_score"] = np.tile(games["home_score"].to_numpy(), 3)
+        bets["away_score"] = np.tile(games["away_score"].to_numpy(), 3)
+        bets["graded_at"] = bets["date"] + "T23:59:00"
+        return bets
+
+    def legacy_picks(self, n):
+        """
+        An archived *_picks.csv for the top-level grade_bets.py, which
+        only knows LEGACY_GAMES: `n` picks spread over those games.
+        """
+        rng = self._rng(6, n)
+        names = list(LEGACY_GAMES)
+        game = np.asarray(names, dtype=object)[rng.integers(0, len(names), n)]
+        home = np.array([LEGACY_GAMES[g][0] for g in game], dtype=object)
+        line = rng.choice(np.arange(-12.5, 13, 1.0), n)
+        total = rng.choice(np.arange(130.5, 160, 1.0), n)
+        kind = rng.integers(0, 3, n)
+        market = np.select(
+            [kind == 0, kind == 1],
+            [home + " ML", np.where(line > 0, "Over ", "Under ") + total.astype(str)],
+            home + " " + line.astype(str),
+        )
+        return pd.DataFrame({
+            "game": game,
+            "market": market,
+            "odds": np.where(kind == 0, rng.choice([-150, 120, 180], n), -110),
+            "bet_size": rng.choice([10.0, 15.0, 20.0], n),
+        })
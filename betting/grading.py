@@ -0,0 +1,181 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from betting.moneyline import implied_probability, payout_from_odds
+from models.teams import get_resolver, team_key
+from pipeline.trace import count, span
+
+
+GRADE_COLUMNS = ["result", "profit", "home_score", "away_score", "graded_at", "closing_line", "clv"]
+
+
+# ---------------- KEYS ----------------
+def canonical_teams(names, resolver=None):
+    """Canonical team names for a column; unknown teams keep their spelling key."""
+    resolver = resolver or get_resolver()
+    names = pd.Series(names, dtype=object).fillna("").astype(str).str.strip()
+    canonical = pd.Series(resolver.resolve_names(names), index=names.index, dtype=object)
+    missing = canonical.isna()
+    if missing.any():
+        canonical[missing] = names[missing].map(team_key)
+    return canonical
+
+
+def matchup_key(team_a, team_b):
+    """Order-free key for a game from two canonical team columns."""
+    a = np.asarray(team_a, dtype=object).astype(str)
+    b = np.asarray(team_b, dtype=object).astype(str)
+    return pd.Series(np.where(a <= b, a + "|" + b, b + "|" + a), dtype=object)
+
+
+def pending_mask(bets):
+    """Bets with no result yet (blank or PENDING) and never graded."""
+    result = bets.get("result", pd.Series(index=bets.index, dtype=object))
+    graded_at = bets.get("graded_at", pd.Series(index=bets.index, dtype=object))
+    ungraded = result.isna() | result.astype(str).str.strip().isin(["", "PENDING"])
+    return ungraded & graded_at.isna()
+
+
+def _keyed(table, resolver):
+    home = canonical_teams(table["home_team"], resolver)
+    away = canonical_teams(table["away_team"], resolver)
+    keyed = table.assign(_home=home.to_numpy(), _away=away.to_numpy())
+    keyed["_key"] = matchup_key(keyed["_home"], keyed["_away"]).to_numpy()
+    return keyed.drop_duplicates("_key")
+
+
+# ---------------- GRADING ----------------
+def grade_pending(bets, scores, closing=None, resolver=None, now=None):
+    """
+    Grades the pending rows of `bets` against final scores and closing
+    lines with hash joins on a canonical matchup key.
+
+    Only pending bets are keyed and joined, and each table is keyed once,
+    so a run costs O(pending bets + games) regardless of ledger size.
+    Returns the graded rows only: a frame indexed like `bets` with
+    GRADE_COLUMNS, ready to write back.
+    """
+    resolver = resolver or get_resolver()
+    pending = bets[pending_mask(bets)]
+    if pending.empty or scores.empty:
+        return pd.DataFrame(columns=GRADE_COLUMNS)
+
+    # ---------- BET KEYS ----------
+    sides = pending["game"].astype(str).str.split(" vs ", n=1, expand=True).reindex(columns=[0, 1])
+    keys = matchup_key(
+        canonical_teams(sides[0].fillna(""), resolver),
+        canonical_teams(sides[1].fillna(""), resolver),
+    )
+    left = pd.DataFrame({"_row": pending.index, "_key": keys.to_numpy()})
+
+    # ---------- JOIN FINAL SCORES ----------
+    final = scores[scores["status"] == "FINAL"] if "status" in scores.columns else scores
+    with span("grading.join_scores"):
+        final = _keyed(final, resolver)[["_key", "_home", "_away", "home_score", "away_score"]]
+        joined = left.merge(final, on="_key", how="inner")
+    if joined.empty:
+        return pd.DataFrame(columns=GRADE_COLUMNS)
+
+    # ---------- JOIN CLOSING LINES ----------
+    closing_cols = ["closing_spread", "closing_total", "closing_ml_home", "closing_ml_away"]
+    if closing is not None and not closing.empty:
+        with span("grading.join_closing"):
+            lines = _keyed(closing, resolver).reindex(columns=["_key", "_home"] + closing_cols)
+            joined = joined.merge(lines.rename(columns={"_home": "_closing_home"}), on="_key", how="left")
+
+        # Orient closing prices to the scoreboard's home team
+        flipped = joined["_closing_home"].notna() & (joined["_closing_home"] != joined["_home"])
+        joined.loc[flipped, "closing_spread"] = -joined.loc[flipped, "closing_spread"]
+        joined.loc[flipped, ["closing_ml_home", "closing_ml_away"]] = (
+            joined.loc[flipped, ["closing_ml_away", "closing_ml_home"]].to_numpy()
+        )
+    else:
+        joined = joined.assign(**{c: np.nan for c in closing_cols})
+
+    joined = joined.set_index("_row")
+    graded = _grade(pending.loc[joined.index], joined, resolver, now or datetime.now().isoformat())
+    count("graded", len(graded))
+    return graded
+
+
+def _grade(bet, game, resolver, graded_at):
+    market = bet["market"].astype(str).to_numpy()
+    selection = bet["selection"].astype(str)
+    odds = pd.to_numeric(bet["odds"], errors="coerce").to_numpy(dtype=float)
+    stake = pd.to_numeric(bet["bet_size"], errors="coerce").to_numpy(dtype=float)
+
+    home_score = game["home_score"].to_numpy(dtype=float)
+    away_score = game["away_score"].to_numpy(dtype=float)
+    margin = home_score - away_score
+    points = home_score + away_score
+
+    # ---------- SELECTION PARTS ----------
+    last = selection.str.rsplit(" ", n=1)
+    head = last.str[0].where(last.str.len() > 1, "")
+    line = pd.to_numeric(last.str[-1], errors="coerce").to_numpy(dtype=float)
+
+    team = np.select(
+        [market == "Moneyline", market == "Spread"],
+        [selection.str.replace(" ML", "", regex=False), head],
+        "",
+    )
+    side = canonical_teams(team, resolver).to_numpy()
+    side_is_home = side == game["_home"].to_numpy()
+
+    # A spread / moneyline without a team in the game ("-6", a typo) can't
+    # be oriented: it stays pending instead of grading as the away side
+    in_game = side_is_home | (side == game["_away"].to_numpy())
+    blank = pd.Series(team).str.strip().eq("").to_numpy()
+    unknown = ((market == "Spread") | (market == "Moneyline")) & (blank | ~in_game)
+    if unknown.any():
+        count("grading_unknown_side", int(unknown.sum()))
+        labels = (bet["game"].astype(str) + ": " + selection)[unknown]
+        print(f"⚠️ {int(unknown.sum())} bets left pending, no team from their game in the selection: "
+              + "; ".join(labels.head(5)) + (" ..." if unknown.sum() > 5 else ""))
+
+    side_margin = np.where(side_is_home, margin, -margin)
+    is_over = head.to_numpy() == "Over"
+
+    # ---------- RESULT ----------
+    spread_diff = side_margin + line
+    total_diff = np.where(is_over, points - line, line - points)
+    home_won = home_score > away_score
+    ml_win = np.where(side_is_home, home_won, ~home_won)
+
+    diff = np.select([market == "Spread", market == "Total"], [spread_diff, total_diff], 0.0)
+    result = np.select([diff > 0, diff < 0], ["WIN", "LOSS"], "PUSH")
+    result = np.where(market == "Moneyline", np.where(ml_win, "WIN", "LOSS"), result)
+
+    # ---------- PROFIT ----------
+    win_amt = np.round(payout_from_odds(odds, stake), 2)
+    profit = np.select([result == "WIN", result == "PUSH"], [win_amt, 0.0], -stake)
+
+    # ---------- CLV (points / probability gained vs the close) ----------
+    closing_ml = np.where(side_is_home, game["closing_ml_home"], game["closing_ml_away"]).astype(float)
+    closing_spread = game["closing_spread"].to_numpy(dtype=float)
+    closing_line = np.select(
+        [market == "Spread", market == "Total"],
+        [np.where(side_is_home, closing_spread, -closing_spread), game["closing_total"].to_numpy(dtype=float)],
+        np.nan,
+    )
+    clv = np.select(
+        [market == "Spread", market == "Total", market == "Moneyline"],
+        [
+            np.round(line - closing_line, 2),
+            np.round((closing_line - line) * np.where(is_over, 1, -1), 2),
+            np.round(implied_probability(closing_ml) - implied_probability(odds), 4),
+        ],
+        np.nan,
+    )
+
+    return pd.DataFrame({
+        "result": result,
+        "profit": profit,
+        "home_score": home_score,
+        "away_score": away_score,
+        "graded_at": graded_at,
+        "closing_line": closing_line,
+        "clv": clv,
+    }, index=bet.index)[~unknown]
@@ -0,0 +1,123 @@
+import numpy as np
+
+from betting.moneyline import payout_from_odds
+from models.probability import MARGIN_SD, TOTAL_SD
+
+
+# ---------------- CONFIG ----------------
+KELLY_FRACTION = 0.25        # quarter Kelly: the model's edges are estimates
+N_SCENARIOS = 2000           # simulated results per game (antithetic pairs)
+MARGIN_TOTAL_CORR = 0.0      # correlation of a game's margin and total
+
+
+# ---------------- SCENARIOS ----------------
+def simulate_games(model_spread, model_total, n=N_SCENARIOS, seed=0, corr=MARGIN_TOTAL_CORR):
+    """
+    (margin, total) draws shaped (n, games) around the projections, from
+    the same normal model as models.probability. Fixed seed and antithetic
+    pairs, so the same slate always sizes the same way.
+    """
+    model_spread = np.asarray(model_spread, dtype=float)
+    model_total = np.asarray(model_total, dtype=float)
+    rng = np.random.default_rng(seed)
+    half = rng.standard_normal((2, n // 2, len(model_spread)))
+    z = np.concatenate([half, -half], axis=1)
+    z_total = corr * z[0] + np.sqrt(1 - corr ** 2) * z[1]
+    return model_spread + MARGIN_SD * z[0], model_total + TOTAL_SD * z_total
+
+
+def scenario_returns(side, line, odds, margin, total):
+    """
+    Profit per 1 staked for each bet (columns) in each scenario (rows).
+
+    `side` is A / B (spread), over / under (total) or ml (team A to win);
+    `line` is the bet's own line; `margin` / `total` are the scenarios of
+    each bet's game, shaped (n, bets). Scores are rounded to whole points
+    so whole-number lines push; bets on one game share its draws, which is
+    what correlates them (a spread and moneyline on one team move together).
+    """
+    side = np.asarray(side)
+    line = np.asarray(line, dtype=float)
+    points = np.array(margin, dtype=float)
+    # side -> (scores, sign of score, sign of line) in points = score + line
+    for name, scores, sign, line_sign in [
+        ("A", margin, 1, 1), ("B", margin, -1, 1), ("over", total, 1, -1), ("under", total, -1, 1),
+    ]:
+        bets = side == name
+        if bets.any():
+            points[:, bets] = sign * np.rint(scores[:, bets]) + line_sign * line[bets]
+
+    payout = payout_from_odds(np.asarray(odds, dtype=float), 1.0)
+    returns = np.where(points > 0, payout, -1.0)
+    returns[points == 0] = 0.0
+    return returns
+
+
+# ---------------- SOLVER ----------------
+def project_budget(f, budget):
+    """Euclidean projection onto {f >= 0, sum(f) <= budget}."""
+    f = np.maximum(f, 0)
+    if f.sum() <= budget:
+        return f
+    u = np.sort(f)[::-1]
+    cumulative = np.cumsum(u) - budget
+    k = np.nonzero(u > cumulative / np.arange(1, len(u) + 1))[0][-1]
+    return np.maximum(f - cumulative[k] / (k + 1), 0)
+
+
+def kelly_fractions(returns, budget, iterations=500, tol=1e-8):
+    """
+    Bankroll fractions maximizing mean(log(1 + returns @ f)) subject to
+    f >= 0 and sum(f) <= budget (< 1, so wealth stays positive in every
+    scenario). Projected gradient ascent with Barzilai-Borwein steps and
+    backtracking.
+    """
+    returns = np.asarray(returns, dtype=float)
+    f = np.zeros(returns.shape[1])
+    if not returns.size:
+        return f
+
+    def growth(f):
+        return np.log1p(returns @ f).mean()
+
+    value, step = growth(f), 1.0
+    gradient = returns.T @ (1 / (1 + returns @ f)) / len(returns)
+    for _ in range(iterations):
+        # Stationary: a unit gradient step projects straight back onto f
+        if np.abs(project_budget(f + gradient, budget) - f).max() < tol:
+            break
+        while True:
+            candidate = project_budget(f + step * gradient, budget)
+            candidate_value = growth(candidate)
+            if candidate_value >= value + 1e-4 * gradient @ (candidate - f) or step < 1e-12:
+                break
+            step *= 0.5
+
+        # Barzilai-Borwein step for the next iteration
+        new_gradient = returns.T @ (1 / (1 + returns @ candidate)) / len(returns)
+        s, y = candidate - f, new_gradient - gradient
+        curvature = -(s @ y)
+        step = (s @ s) / curvature if curvature > 1e-16 else step * 2
+        gain = candidate_value - value
+        f, value, gradient = candidate, candidate_value, new_gradient
+        if gain < 1e-12:
+            break
+    return f
+
+
+def kelly_stakes(side, line, odds, game, model_spread, model_total, bankroll, max_risk,
+                 fraction=KELLY_FRACTION, n=N_SCENARIOS, seed=0):
+    """
+    Stakes (risked, in bankroll currency) for a slate of candidate bets,
+    sized together: fractional Kelly on the joint scenarios of every game,
+    with total risk capped at `max_risk`. `game` indexes each bet's game
+    in `model_spread` / `model_total`.
+    """
+    # Only the games with a candidate bet are simulated
+    games, game = np.unique(np.asarray(game, dtype=np.int64), return_inverse=True)
+    margin, total = simulate_games(
+        np.asarray(model_spread, dtype=float)[games], np.asarray(model_total, dtype=float)[games], n=n, seed=seed,
+    )
+    returns = scenario_returns(side, line, odds, margin[:, game], total[:, game])
+    budget = min(max_risk / bankroll / fraction, 0.99)
+    return fraction * bankroll * kelly_fractions(returns, budget)
@@ -1,18 +1,37 @@
+import numpy as np
+
+
+# Every helper accepts scalars or arrays; scalars come back as plain floats
+def _as_result(values):
+    return values if np.ndim(values) else float(values)
+
+
 def implied_probability(odds):
-    if odds < 0:
-        return abs(odds) / (abs(odds) + 100)
-    else:
-        return 100 / (odds + 100)
+    odds = np.asarray(odds, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        prob = np.where(
+            odds < 0,
+            np.abs(odds) / (np.abs(odds) + 100),
+            100 / (odds + 100),
+        )
+    return _as_result(prob)
 
 
 def is_plus_ev(model_prob, odds):
     return model_prob > implied_probability(odds)
+
+
 def payout_from_odds(odds, stake):
-    if odds < 0:
-        return stake * (100 / abs(odds))
-    else:
-        return stake * (odds / 100)
-    
-def kelly_lite_bet(unit, edge):
-    multiplier = max(0.5, min(3.0, edge * 10))
-    return unit * multiplier
+    odds = np.asarray(odds, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payout = np.where(
+            odds < 0,
+            stake * (100 / np.abs(odds)),
+            stake * (odds / 100),
+        )
+    return _as_result(payout)
+
+
+def kelly_lite_bet(unit, edge, min_multiplier=0.5, max_multiplier=3.0):
+    multiplier = np.clip(np.multiply(edge, 10), min_multiplier, max_multiplier)
+    return _as_result(unit * multiplier)
@@ -1,6 +1,25 @@
-def spread_value(model_spread, book_spread):
-    return abs(model_spread - book_spread) >= 2
+import numpy as np
 
 
-def total_value(model_total, book_total):
-    return abs(model_total - book_total) >= 5
+def spread_value(model_spread, book_spread, threshold=2):
+    return abs(model_spread - book_spread) >= threshold
+
+
+def total_value(model_total, book_total, threshold=5):
+    return abs(model_total - book_total) >= threshold
+
+
+# (minimum confidence score, units) — scores below the first tier are skipped
+CONFIDENCE_TIERS = [
+    (1.0, 1.0),
+    (1.5, 1.5),
+    (2.2, 2.0),
+]
+
+
+def units_from_confidence(confidence_score, tiers=CONFIDENCE_TIERS):
+    confidence_score = np.asarray(confidence_score, dtype=float)
+    units = np.zeros(confidence_score.shape)
+    for threshold, tier_units in tiers:
+        units = np.where(confidence_score >= threshold, tier_units, units)
+    return units
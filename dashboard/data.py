@@ -0,0 +1,103 @@
+import os
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+from pandas.errors import EmptyDataError
+
+from ledger.store import DB_PATH, open_ledger
+from pipeline.trace import span
+
+
+# ================================
+# FILE SIGNATURES
+# ================================
+def file_signature(path):
+    """(path, mtime_ns, size) — changes whenever the file is rewritten."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return str(path), None, None
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+def read_csv_safe(path):
+    try:
+        return pd.read_csv(path)
+    except (FileNotFoundError, EmptyDataError):
+        return pd.DataFrame()
+
+
+# ================================
+# SHARED RESOURCES
+# ================================
+# Everything below is cached once per file version and shared by every
+# session, so returned frames are read-only: copy before modifying.
+
+@st.cache_resource
+def get_ledger():
+    return open_ledger()
+
+
+@st.cache_resource
+def get_slate_projections(slate_path):
+    # Imported here: the projection stack is only needed by the private view
+    from dashboard.slate import SlateProjections
+    return SlateProjections(slate_path)
+
+
+@st.cache_resource(max_entries=4)
+def _csv_frame(path, mtime_ns, size):
+    with span("dashboard.read_csv", path=path) as s:
+        frame = read_csv_safe(path)
+        s.count("rows", len(frame))
+    return frame
+
+
+def load_csv(path):
+    """Parsed CSV, re-read only when its mtime or size changes."""
+    return _csv_frame(*file_signature(path))
+
+
+@st.cache_resource(max_entries=4)
+def _results_frame(path, mtime_ns, size):
+    with span("dashboard.query_results") as s:
+        results = get_ledger().query()
+        results["date"] = pd.to_datetime(results["date"], errors="coerce")
+        s.count("rows", len(results))
+    return results
+
+
+def load_results(path=DB_PATH):
+    """Every bet (newest first), re-queried only when the ledger file changes."""
+    return _results_frame(*file_signature(Path(path)))
+
+
+@st.cache_resource(max_entries=4)
+def _performance(path, mtime_ns, size):
+    ledger = get_ledger()
+    with span("dashboard.rollups"):
+        return {
+            "totals": ledger.totals(),
+            **{grain: ledger.rollup(grain) for grain in ("day", "month", "market", "confidence")},
+        }
+
+
+def performance(path=DB_PATH):
+    """
+    Totals plus day / month / market / confidence rollups. The rollups
+    are maintained by the ledger as bets are graded, so this reads a
+    few small tables whatever the ledger size.
+    """
+    return _performance(*file_signature(Path(path)))
+
+
+def monthly_summary(path=DB_PATH):
+    """Bets / wins / win rate by month for the public view."""
+    month = performance(path)["month"]
+    return pd.DataFrame({
+        "month": month["month"],
+        "Bets": month["bets"],
+        "Wins": month["wins"],
+        "Win Rate %": (month["win_rate"] * 100).round(1),
+    })
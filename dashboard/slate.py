@@ -0,0 +1,99 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from betting.moneyline import implied_probability
+from dashboard.data import file_signature, read_csv_safe
+from models.fit import load_params, params_path
+from models.projections import project_games
+from models.team_stats import STATS_CSV, TeamStatsStore, attach_team_stats
+from run_daily import build_picks
+
+
+SLATE_COLUMNS = [
+    "game", "spread_line", "model_spread", "spread_edge", "total_line", "model_total",
+    "total_edge", "ml_odds", "win_prob", "ml_edge", "Spread", "Total", "Moneyline",
+]
+
+
+def project_slate(games, team_stats, params=None):
+    """
+    Every game on the slate with the model's spread / total / win
+    probability, edges against the market, and which markets made the
+    daily card. One batched projection for the whole slate, with the
+    latest (or pinned) fitted coefficients unless `params` are given.
+    """
+    if games.empty:
+        return pd.DataFrame(columns=SLATE_COLUMNS)
+
+    params = params or load_params()
+    games = attach_team_stats(games, team_stats).reset_index(drop=True)
+    model_spread, model_total, win_prob = project_games(games, params)
+
+    slate = pd.DataFrame({
+        "game": games["A_team"].astype(str) + " vs " + games["B_team"].astype(str),
+        "spread_line": games["spread_line"],
+        "model_spread": np.round(model_spread, 1),
+        "spread_edge": np.round(np.abs(model_spread + games["spread_line"].to_numpy(dtype=float)), 1),
+        "total_line": games["total_line"],
+        "model_total": np.round(model_total, 1),
+        "total_edge": np.round(model_total - games["total_line"].to_numpy(dtype=float), 1),
+        "ml_odds": games["ml_odds"],
+        "win_prob": np.round(win_prob, 3),
+        "ml_edge": np.round(win_prob - implied_probability(games["ml_odds"].to_numpy(dtype=float)), 3),
+    })
+
+    # ---------- PICK FLAGS (the same card run_daily writes) ----------
+    picks = build_picks(games, params=params)
+    for market in ["Spread", "Total", "Moneyline"]:
+        picked = set(picks.loc[picks["market"] == market, "game"])
+        slate[market] = np.where(slate["game"].isin(picked), "✅", "")
+    return slate[SLATE_COLUMNS]
+
+
+class SlateProjections:
+    """
+    Projections for the current slate, kept fresh by a daemon thread.
+
+    The thread re-projects whenever daily_games.csv, the team stats or
+    the fitted model version change (checked every `interval` seconds by
+    mtime / size). Readers
+    only ever take the last finished frame, so a page load never waits
+    on parsing or projection.
+    """
+
+    def __init__(self, slate_path, stats_path=STATS_CSV, interval=5.0):
+        self.slate_path = slate_path
+        self.stats_path = stats_path
+        self.interval = interval
+        self.error = None
+        self.updated_at = None
+        self._frame = None
+        self._signature = None
+        self._thread = threading.Thread(target=self._run, name="slate-projections", daemon=True)
+        self._thread.start()
+
+    def frame(self):
+        """The latest projected slate, or None until the first pass finishes."""
+        return self._frame
+
+    def refresh(self):
+        signature = (file_signature(self.slate_path), file_signature(self.stats_path), params_path())
+        if signature == self._signature:
+            return False
+
+        slate = project_slate(read_csv_safe(self.slate_path), TeamStatsStore.open(csv_path=self.stats_path))
+        self._frame, self._signature = slate, signature
+        self.updated_at = pd.Timestamp.now()
+        self.error = None
+        return True
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as exc:
+                self.error = exc
+            time.sleep(self.interval)
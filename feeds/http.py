@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from pipeline.trace import count, span
+
+
+# ---------------- CONFIG ----------------
+CACHE_DIR = Path("data/cache/http")
+DEFAULT_TTL = 300
+TIMEOUT = (5, 30)
+RETRIES = 3
+BACKOFF = 0.5
+POOL_SIZE = 8
+
+# Query params that identify the caller, not the request
+SECRET_PARAMS = {"apiKey", "api_key", "key"}
+
+# Odds API quota headers -> quota field
+QUOTA_HEADERS = {
+    "x-requests-remaining": "remaining",
+    "x-requests-used": "used",
+    "x-requests-last": "last",
+}
+
+
+def cache_key(url, params=None):
+    """Content address of a GET: URL + sorted params, secrets excluded."""
+    params = sorted((k, str(v)) for k, v in (params or {}).items() if k not in SECRET_PARAMS)
+    return hashlib.sha256(json.dumps([url, params]).encode()).hexdigest()
+
+
+class HttpClient:
+    """
+    Shared fetch layer for the odds and scores feeds.
+
+    One pooled `requests.Session` with timeouts and retry / backoff on
+    429 and 5xx. Successful JSON responses are cached on disk under the
+    hash of (url, params), so an identical request inside its TTL is
+    served from disk, and identical requests in flight at the same time
+    share one call. Quota headers are recorded per host in `quota`.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, timeout=TIMEOUT, retries=RETRIES,
+                 backoff=BACKOFF, pool_size=POOL_SIZE):
+        self.cache_dir = Path(cache_dir)
+        self.timeout = timeout
+        self.pool_size = pool_size
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.quota = {}
+        self.stats = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    # ---------------- CACHE ----------------
+    def _path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _read_cache(self, key, ttl):
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+        if ttl is not None and time.time() - entry["fetched_at"] > ttl:
+            return None
+        return entry
+
+    def _write_cache(self, key, entry):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry))
+        os.replace(tmp, path)
+
+    # ---------------- FETCH ----------------
+    def get_json(self, url, params=None, ttl=DEFAULT_TTL):
+        """
+        Parsed JSON for a GET. `ttl` is how many seconds a cached copy
+        stays fresh (0 always refetches, None never expires).
+        """
+        key = cache_key(url, params)
+        entry = self._read_cache(key, ttl) if ttl != 0 else None
+        if entry is not None:
+            self.stats["hits"] += 1
+            count("http_cache_hits", host=urlsplit(url).netloc)
+            return entry["body"]
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if not owner:
+            self.stats["hits"] += 1
+            return future.result()
+
+        try:
+            body = self._fetch(key, url, params)
+            future.set_result(body)
+            return body
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def _fetch(self, key, url, params):
+        host = urlsplit(url).netloc
+        with span("http.fetch", host=host):
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+        count("api_calls", host=host)
+        with span("json.parse", host=host):
+            body = response.json()
+        self.stats["misses"] += 1
+        self._record_quota(url, response.headers)
+        self._write_cache(key, {"url": url, "fetched_at": time.time(), "body": body})
+        return body
+
+    def get_many(self, requests_, ttl=DEFAULT_TTL):
+        """
+        Fetches [(url, params), ...] concurrently over the pooled
+        session; results come back in request order.
+        """
+        with ThreadPoolExecutor(max_workers=self.pool_size) as pool:
+            futures = [pool.submit(self.get_json, url, params, ttl) for url, params in requests_]
+            return [f.result() for f in futures]
+
+    # ---------------- QUOTA ----------------
+    def _record_quota(self, url, headers):
+        quota = {field: headers[h] for h, field in QUOTA_HEADERS.items() if h in headers}
+        if not quota:
+            return
+        quota = {k: int(float(v)) for k, v in quota.items()}
+        self.quota[urlsplit(url).netloc] = quota
+        if quota.get("remaining", 1) <= 0:
+            print(f"⚠️ API quota exhausted for {urlsplit(url).netloc}")
+
+    def close(self):
+        self.session.close()
+
+
+_CLIENT = None
+
+
+def get_client():
+    """Process-wide client, so every fetcher shares one connection pool."""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = HttpClient()
+    return _CLIENT
@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+
+from betting.moneyline import implied_probability, payout_from_odds
+
+
+# One row per (game, book, market, outcome)
+ODDS_COLUMNS = [
+    "game_id", "commence_time", "home_team", "away_team",
+    "book", "market", "outcome", "point", "price",
+]
+
+
+def flatten_odds(games):
+    """
+    Flattens an Odds API payload (games -> bookmakers -> markets ->
+    outcomes) into a columnar table in one pass. commence_time is parsed
+    once for the whole column as a UTC timestamp.
+    """
+    cols = {c: [] for c in ODDS_COLUMNS}
+    game_id, commence, home, away = (cols[c] for c in ODDS_COLUMNS[:4])
+    book, market, outcome, point, price = (cols[c] for c in ODDS_COLUMNS[4:])
+
+    for game in games:
+        g = (game.get("id"), game.get("commence_time"), game.get("home_team"), game.get("away_team"))
+        for bookmaker in game.get("bookmakers", ()):
+            b = bookmaker.get("key")
+            for m in bookmaker.get("markets", ()):
+                k = m.get("key")
+                for o in m.get("outcomes", ()):
+                    game_id.append(g[0])
+                    commence.append(g[1])
+                    home.append(g[2])
+                    away.append(g[3])
+                    book.append(b)
+                    market.append(k)
+                    outcome.append(o.get("name"))
+                    point.append(o.get("point"))
+                    price.append(o.get("price"))
+
+    df = pd.DataFrame(cols, columns=ODDS_COLUMNS)
+    df["commence_time"] = pd.to_datetime(df["commence_time"], utc=True, errors="coerce")
+    df["point"] = pd.to_numeric(df["point"], errors="coerce").astype(float)
+    df["price"] = pd.to_numeric(df["price"], errors="coerce").astype(float)
+    return df
+
+
+# ---------------- LINES PER MARKET ----------------
+MARKET_KEYS = ["game_id", "market", "outcome"]
+
+
+def _bettor_score(odds):
+    # Higher is better for the bettor: more points on spreads / unders,
+    # fewer on overs; moneylines compare on price alone
+    point = odds["point"].to_numpy(dtype=float)
+    market = odds["market"].to_numpy()
+    over = odds["outcome"].to_numpy() == "Over"
+    return np.where(market == "h2h", 0.0, np.where(over, -point, point))
+
+
+def best_lines(odds):
+    """
+    Best available number per (game, market, outcome): the most
+    favorable point, then the best price among books hanging it.
+    """
+    ranked = odds.dropna(subset=["price"])
+    ranked = ranked.assign(
+        _score=_bettor_score(ranked),
+        _payout=payout_from_odds(ranked["price"].to_numpy(dtype=float), 1.0),
+    ).sort_values(MARKET_KEYS + ["_score", "_payout"], ascending=[True, True, True, False, False], kind="stable")
+
+    best = ranked.drop_duplicates(MARKET_KEYS)
+    return best[MARKET_KEYS + ["book", "point", "price"]].rename(
+        columns={"book": "best_book", "point": "best_point", "price": "best_price"}
+    ).reset_index(drop=True)
+
+
+def consensus(odds):
+    """
+    No-vig consensus per (game, market, outcome): each book's implied
+    probabilities are normalized to sum to 1 within its two-way market
+    and averaged across books. `hold` is the books' average margin,
+    1 - 1 / (sum of implied probabilities).
+    """
+    odds = odds.dropna(subset=["price"])
+    implied = pd.Series(implied_probability(odds["price"].to_numpy(dtype=float)), index=odds.index)
+    book_market = [odds["game_id"], odds["book"], odds["market"]]
+    overround = implied.groupby(book_market).transform("sum")
+    two_way = implied.groupby(book_market).transform("size") == 2
+
+    table = odds.assign(fair_prob=implied / overround, hold=1 - 1 / overround)[two_way]
+    return table.groupby(MARKET_KEYS, as_index=False).agg(
+        consensus_point=("point", "median"),
+        fair_prob=("fair_prob", "mean"),
+        hold=("hold", "mean"),
+        books=("book", "nunique"),
+    )
+
+
+def market_table(odds):
+    """best_lines and consensus side by side, one row per (game, market, outcome)."""
+    return best_lines(odds).merge(consensus(odds), on=MARKET_KEYS, how="left")
+
+
+# ---------------- LINES PER GAME ----------------
+# daily_games column -> (market_table column, market, side); A is the home team
+LINE_COLUMNS = {
+    "spread_line": ("consensus_point", "spreads", "A"),
+    "total_line": ("consensus_point", "totals", "over"),
+    "ml_odds": ("best_price", "h2h", "A"),
+    "spread_A_line": ("best_point", "spreads", "A"),
+    "spread_A_odds": ("best_price", "spreads", "A"),
+    "spread_B_line": ("best_point", "spreads", "B"),
+    "spread_B_odds": ("best_price", "spreads", "B"),
+    "over_line": ("best_point", "totals", "over"),
+    "over_odds": ("best_price", "totals", "over"),
+    "under_line": ("best_point", "totals", "under"),
+    "under_odds": ("best_price", "totals", "under"),
+    "ml_B_odds": ("best_price", "h2h", "B"),
+    "ml_fair_A": ("fair_prob", "h2h", "A"),
+    "spread_hold": ("hold", "spreads", "A"),
+    "total_hold": ("hold", "totals", "over"),
+    "ml_hold": ("hold", "h2h", "A"),
+}
+
+
+def game_lines(odds):
+    """
+    One row per game with consensus lines, the best number and price for
+    every side, the no-vig home win probability and each market's hold.
+    spread_line is the home team's point; ml_odds is the best home price.
+    """
+    games = odds.drop_duplicates("game_id")[["game_id", "commence_time", "home_team", "away_team"]]
+    if games.empty:
+        return games.assign(**{c: pd.Series(dtype=float) for c in LINE_COLUMNS})
+
+    table = market_table(odds).merge(games[["game_id", "home_team", "away_team"]], on="game_id")
+    outcome = table["outcome"].to_numpy()
+    table["side"] = np.select(
+        [outcome == table["home_team"].to_numpy(), outcome == table["away_team"].to_numpy(),
+         outcome == "Over", outcome == "Under"],
+        ["A", "B", "over", "under"],
+        "",
+    )
+
+    values = sorted({v for v, _, _ in LINE_COLUMNS.values()})
+    wide = table[table["side"] != ""].set_index(["game_id", "market", "side"])[values].unstack(["market", "side"])
+    wide = wide.reindex(columns=pd.MultiIndex.from_tuples(LINE_COLUMNS.values()))
+    wide.columns = list(LINE_COLUMNS)
+
+    return games.merge(wide, left_on="game_id", right_index=True, how="left").reset_index(drop=True)
@@ -0,0 +1,216 @@
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from feeds.odds import ODDS_COLUMNS
+
+
+# ---------------- CONFIG ----------------
+SNAPSHOT_DIR = Path("data/odds_snapshots")
+STATE_FILE = "latest.npz"
+
+KEY_COLUMNS = ["game_id", "book", "market", "outcome"]
+STRING_COLUMNS = ["game_id", "home_team", "away_team", "book", "market", "outcome"]
+TIME_COLUMNS = ["commence_time", "polled_at"]
+SNAPSHOT_COLUMNS = ODDS_COLUMNS + ["polled_at"]
+
+# How far back an as-of query looks for a line's last change.
+# Lines are posted a few days before tip, so a week covers every game.
+LOOKBACK = pd.Timedelta(days=7)
+
+
+def _utc(ts):
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def _to_arrays(df):
+    arrays = {}
+    for c in STRING_COLUMNS:
+        arrays[c] = np.asarray(df[c].fillna("").astype(str).tolist(), dtype=str)
+    for c in TIME_COLUMNS:
+        arrays[c] = df[c].dt.tz_convert("UTC").dt.tz_localize(None).to_numpy("datetime64[ns]")
+    arrays["point"] = df["point"].to_numpy(dtype=float)
+    arrays["price"] = df["price"].to_numpy(dtype=float)
+    return arrays
+
+
+def _from_arrays(arrays):
+    df = pd.DataFrame({c: arrays[c] for c in SNAPSHOT_COLUMNS})
+    for c in STRING_COLUMNS:
+        df[c] = df[c].astype(str)
+    for c in TIME_COLUMNS:
+        df[c] = df[c].dt.tz_localize("UTC")
+    return df
+
+
+def _save(path, df):
+    tmp = path.with_name(f"{path.stem}.tmp.npz")
+    np.savez_compressed(tmp, **_to_arrays(df))
+    os.replace(tmp, path)
+
+
+def _load(path):
+    with np.load(path) as data:
+        return _from_arrays(data)
+
+
+def _empty():
+    df = pd.DataFrame({c: pd.Series(dtype=str) for c in STRING_COLUMNS})
+    for c in TIME_COLUMNS:
+        df[c] = pd.Series(dtype="datetime64[ns, UTC]")
+    df["point"] = pd.Series(dtype=float)
+    df["price"] = pd.Series(dtype=float)
+    return df[SNAPSHOT_COLUMNS]
+
+
+def _changed(new, old):
+    return (new != old) & ~(np.isnan(new) & np.isnan(old))
+
+
+class OddsSnapshotStore:
+    """
+    Every odds poll, kept as a time series.
+
+    A poll is stored as the rows that changed since the previous poll
+    (a new line, a moved point or price, or a line taken off the board,
+    recorded with a NaN price). Segments are compressed .npz files
+    partitioned by UTC day of the poll; `compact` folds a finished day
+    into a single file. The current board is kept in latest.npz so an
+    append only diffs against it, and queries load just the days they
+    cover.
+    """
+
+    def __init__(self, root=SNAPSHOT_DIR):
+        self.root = Path(root)
+
+    # ---------------- WRITE ----------------
+    def append(self, odds, polled_at=None):
+        """
+        Records one flattened poll (feeds.odds.flatten_odds). Returns
+        the number of changed rows written.
+        """
+        polled_at = _utc(polled_at or pd.Timestamp.now(tz="UTC"))
+        odds = odds.dropna(subset=["game_id"]).drop_duplicates(KEY_COLUMNS, keep="last")
+        odds = odds.assign(polled_at=polled_at)[SNAPSHOT_COLUMNS]
+
+        state = self.latest()
+        merged = odds.merge(
+            state[KEY_COLUMNS + ["point", "price"]],
+            on=KEY_COLUMNS, how="left", suffixes=("", "_prev"), indicator=True,
+        )
+        changed = (
+            (merged["_merge"] == "left_only").to_numpy()
+            | _changed(merged["point"].to_numpy(float), merged["point_prev"].to_numpy(float))
+            | _changed(merged["price"].to_numpy(float), merged["price_prev"].to_numpy(float))
+        )
+
+        gone = state.merge(odds[KEY_COLUMNS], on=KEY_COLUMNS, how="left", indicator=True)
+        gone = gone[gone["_merge"] == "left_only"][SNAPSHOT_COLUMNS].assign(
+            point=np.nan, price=np.nan, polled_at=polled_at,
+        )
+
+        rows = pd.concat([odds[changed], gone], ignore_index=True) if len(gone) else odds[changed]
+        if rows.empty:
+            return 0
+
+        day = self.root / polled_at.strftime("%Y-%m-%d")
+        day.mkdir(parents=True, exist_ok=True)
+        _save(day / f"{polled_at.strftime('%H%M%S%f')}.npz", rows)
+        _save(self.root / STATE_FILE, odds)
+        return len(rows)
+
+    def compact(self, day=None):
+        """
+        Merges a day's segments into one file (default: every day
+        before today). Returns the days compacted.
+        """
+        if day is None:
+            today = pd.Timestamp.now(tz="UTC").strftime("%Y-%m-%d")
+            days = sorted(p.name for p in self.root.glob("????-??-??") if p.is_dir() and p.name < today)
+        else:
+            days = [pd.Timestamp(day).strftime("%Y-%m-%d")]
+
+        for name in days:
+            rows = self._read_day(name)
+            if rows.empty:
+                continue
+            _save(self.root / f"{name}.npz", rows)
+            shutil.rmtree(self.root / name, ignore_errors=True)
+        return days
+
+    # ---------------- READ ----------------
+    def latest(self):
+        """The board as of the last poll."""
+        path = self.root / STATE_FILE
+        return _load(path) if path.exists() else _empty()
+
+    def _read_day(self, name):
+        paths = [self.root / f"{name}.npz"] + sorted((self.root / name).glob("*.npz"))
+        frames = [_load(p) for p in paths if p.exists() and not p.name.endswith(".tmp.npz")]
+        return pd.concat(frames, ignore_index=True) if frames else _empty()
+
+    def history(self, start=None, end=None, game_ids=None, books=None, markets=None):
+        """Changed rows polled in [start, end], oldest first."""
+        start = _utc(start) if start is not None else None
+        end = _utc(end) if end is not None else None
+
+        names = sorted({p.name[:10] for p in self.root.glob("????-??-??*")})
+        if start is not None:
+            names = [n for n in names if n >= start.strftime("%Y-%m-%d")]
+        if end is not None:
+            names = [n for n in names if n <= end.strftime("%Y-%m-%d")]
+        if not names:
+            return _empty()
+
+        rows = pd.concat([self._read_day(n) for n in names], ignore_index=True)
+        keep = np.ones(len(rows), dtype=bool)
+        if start is not None:
+            keep &= (rows["polled_at"] >= start).to_numpy()
+        if end is not None:
+            keep &= (rows["polled_at"] <= end).to_numpy()
+        for column, values in (("game_id", game_ids), ("book", books), ("market", markets)):
+            if values is not None:
+                keep &= rows[column].isin([values] if isinstance(values, str) else values).to_numpy()
+        return rows[keep].sort_values("polled_at", kind="stable").reset_index(drop=True)
+
+    def as_of(self, ts, lookback=LOOKBACK, **filters):
+        """Every line on the board at `ts` (e.g. the line at bet time)."""
+        ts = _utc(ts)
+        rows = self.history(ts - lookback, ts, **filters)
+        rows = rows.drop_duplicates(KEY_COLUMNS, keep="last")
+        return rows[rows["price"].notna()].reset_index(drop=True)
+
+    def closing(self, start=None, end=None, lookback=LOOKBACK, **filters):
+        """
+        The last line before commence_time for each game starting in
+        [start, end] (default: the past `lookback` onward). Games that
+        have not started yet get their current line.
+        """
+        now = pd.Timestamp.now(tz="UTC")
+        start = _utc(start) if start is not None else now - lookback
+        end = _utc(end) if end is not None else None
+
+        rows = self.history(start - lookback, min(end, now) if end is not None else now, **filters)
+        keep = (rows["commence_time"] >= start) & (rows["polled_at"] < rows["commence_time"])
+        if end is not None:
+            keep &= rows["commence_time"] <= end
+        rows = rows[keep].drop_duplicates(KEY_COLUMNS, keep="last")
+        return rows[rows["price"].notna()].reset_index(drop=True)
+
+    def movement(self, t0, t1, lookback=LOOKBACK, **filters):
+        """Point and price change of every line between t0 and t1."""
+        before = self.as_of(t0, lookback, **filters)
+        after = self.as_of(t1, lookback, **filters)
+        games = pd.concat([before, after]).drop_duplicates(KEY_COLUMNS, keep="last")
+        moves = (
+            games[KEY_COLUMNS + ["commence_time", "home_team", "away_team"]]
+            .merge(before[KEY_COLUMNS + ["point", "price"]], on=KEY_COLUMNS, how="left")
+            .merge(after[KEY_COLUMNS + ["point", "price"]], on=KEY_COLUMNS, how="left", suffixes=("_open", "_close"))
+        )
+        moves["point_move"] = moves["point_close"] - moves["point_open"]
+        moves["price_move"] = moves["price_close"] - moves["price_open"]
+        return moves.reset_index(drop=True)
@@ -1,135 +1,82 @@
-import requests
-import pandas as pd
-from datetime import datetime, date
-from zoneinfo import ZoneInfo
+from datetime import date
 
-# ---------------- LOAD TEAM STATS ----------------
-TEAM_STATS = pd.read_csv("data/team_stats.csv").set_index("team")
-TEAM_NAMES = set(TEAM_STATS.index)
-
-# ---------------- API CONFIG ----------------
-API_KEY = "685d1eb4a3f00e7adc99c2035864bb83"
-SPORT = "basketball_ncaab"
-REGION = "us"
-MARKETS = "h2h,spreads,totals"
-ODDS_FORMAT = "american"
-
-# ---------------- EXPLICIT ALIASES ----------------
-TEAM_ALIASES = {
-    "IUPUI": "IUPUI",
-    "Omaha": "Omaha",
-    "Miami": "Miami (FL)",
-    "Sam Houston St": "Sam Houston",
-    "Murray St": "Murray",
-    "Kennesaw St": "Kennesaw St",
-    "Loyola (MD)": "Loyola (MD)",
-}
+from feeds.odds import LINE_COLUMNS, flatten_odds, game_lines
+from feeds.snapshots import OddsSnapshotStore
+from feeds.sources import fetch_odds
+from models.team_stats import TeamStatsStore, attach_team_stats
+from models.teams import get_resolver
+from pipeline.trace import count, span
 
-# ---------------- TEAM NAME NORMALIZATION ----------------
-def normalize_team(name: str) -> str:
-    cleaned = name.strip()
-    cleaned = cleaned.replace("Univ.", "University")
-    cleaned = cleaned.replace(" St.", " St")
+# ---------------- LOAD TEAM STATS ----------------
+TEAM_STATS = TeamStatsStore.open()
+TEAM_NAMES = set(TEAM_STATS.teams)
 
-    parts = cleaned.split(" ")
+GAME_COLUMNS = [
+    "A_team", "B_team",
+    "A_off", "A_def", "A_tempo", "A_home", "A_rest", "A_injury",
+    "B_off", "B_def", "B_tempo", "B_rest", "B_injury",
+    *LINE_COLUMNS,
+]
 
-    for i in range(len(parts), 0, -1):
-        candidate = " ".join(parts[:i])
-        if candidate in TEAM_ALIASES:
-            return TEAM_ALIASES[candidate]
-        if candidate in TEAM_NAMES:
-            return candidate
+LOCAL_TZ = "America/New_York"
+GAMES_PATH = "data/daily_games.csv"
 
-    return name
+# ---------------- TEAM NAME NORMALIZATION ----------------
+def normalize_team(name: str) -> str:
+    return get_resolver().resolve(name) or name
 
 # ---------------- MAIN FUNCTION ----------------
-def fetch_today_games():
-    url = f"https://api.the-odds-api.com/v4/sports/{SPORT}/odds"
-
-    params = {
-        "apiKey": API_KEY,
-        "regions": REGION,
-        "markets": MARKETS,
-        "oddsFormat": ODDS_FORMAT,
-    }
-
-    response = requests.get(url, params=params)
-    response.raise_for_status()
-    games = response.json()
-
-    today_local = date.today()
-    rows = []
-
-    for game in games:
-        # ---------- DATE GUARD (LOCAL TIME – FINAL FIX) ----------
-        commence_time = game.get("commence_time")
-        if not commence_time:
-            continue
-
-        game_dt_local = (
-            datetime.fromisoformat(commence_time.replace("Z", "+00:00"))
-            .astimezone(ZoneInfo("America/New_York"))
-        )
-
-        if game_dt_local.date() != today_local:
-            continue
-
-        # ---------- BOOKMAKER GUARD ----------
-        if not game.get("bookmakers"):
-            continue
-
-        bookmaker = game["bookmakers"][0]
-        markets = {m["key"]: m for m in bookmaker["markets"]}
-
-        if not all(k in markets for k in ["h2h", "spreads", "totals"]):
-            continue
-
-        ml_outcomes = markets["h2h"]["outcomes"]
-        spread_outcomes = markets["spreads"]["outcomes"]
-        total_outcomes = markets["totals"]["outcomes"]
-
-        raw_A = game["home_team"]
-        raw_B = game["away_team"]
-
-        teamA = normalize_team(raw_A)
-        teamB = normalize_team(raw_B)
-
-        # ---------- TEAM STATS GUARD ----------
-        if teamA not in TEAM_STATS.index or teamB not in TEAM_STATS.index:
-            continue
-
-        A_stats = TEAM_STATS.loc[teamA]
-        B_stats = TEAM_STATS.loc[teamB]
-
-        ml_lookup = {o["name"]: o["price"] for o in ml_outcomes}
-        if raw_A not in ml_lookup:
-            continue
-
-        rows.append({
-            "A_team": teamA,
-            "B_team": teamB,
-
-            "A_off": A_stats["off_eff"],
-            "A_def": A_stats["def_eff"],
-            "A_tempo": A_stats["tempo"],
-            "A_home": 1,
-            "A_rest": 1,
-            "A_injury": 0,
-
-            "B_off": B_stats["off_eff"],
-            "B_def": B_stats["def_eff"],
-            "B_tempo": B_stats["tempo"],
-            "B_rest": 1,
-            "B_injury": 0,
-
-            "spread_line": spread_outcomes[0]["point"],
-            "total_line": total_outcomes[0]["point"],
-            "ml_odds": ml_lookup[raw_A],
-        })
-
-    df = pd.DataFrame(rows)
-    df.to_csv("data/daily_games.csv", index=False)
+def fetch_odds_board():
+    """Polls every book once, records the poll and returns it flattened."""
+    games = fetch_odds()
+    with span("odds.flatten"):
+        odds = flatten_odds(games)
+        count("odds_rows", len(odds))
+    with span("odds.snapshot"):
+        OddsSnapshotStore().append(odds)
+    return odds
+
+
+def build_today_games(odds, team_stats=None):
+    """Today's slate in the daily_games.csv layout from a flattened odds board."""
+    team_stats = team_stats if team_stats is not None else TEAM_STATS
+
+    # ---------- DATE GUARD (LOCAL TIME, ONE CONVERSION PER COLUMN) ----------
+    local_date = odds["commence_time"].dt.tz_convert(LOCAL_TZ).dt.date
+    odds = odds[local_date == date.today()]
+
+    # ---------- EVERY BOOK: CONSENSUS + BEST NUMBER PER SIDE ----------
+    lines = game_lines(odds)
+
+    # ---------- MARKET GUARD ----------
+    lines = lines.dropna(subset=["spread_line", "total_line", "ml_odds"])
+
+    # ---------- TEAM STATS GUARD ----------
+    resolver = get_resolver()
+    with span("resolve"):
+        lines["A_team"] = resolver.resolve_names(lines["home_team"])
+        lines["B_team"] = resolver.resolve_names(lines["away_team"])
+        lines = lines.dropna(subset=["A_team", "B_team"])
+
+    df = lines.assign(A_home=1, A_rest=1, A_injury=0, B_rest=1, B_injury=0)
+
+    # ---------- TEAM STATS (ONE GATHER PER SIDE) ----------
+    if not df.empty:
+        with span("attach_stats"):
+            df = attach_team_stats(df, team_stats)
+    resolver.report_unresolved()
+    count("games", len(df))
+    return df.reindex(columns=GAME_COLUMNS).reset_index(drop=True)
+
+
+def fetch_today_games(odds=None, team_stats=None):
+    if odds is None:
+        odds = fetch_odds_board()
+    df = build_today_games(odds, team_stats)
+    with span("csv.write", path=GAMES_PATH):
+        df.to_csv(GAMES_PATH, index=False)
     print(f"✅ Wrote {len(df)} games scheduled for TODAY only")
+    return df
 
 # ---------------- RUN ----------------
 if __name__ == "__main__":
@@ -2,6 +2,8 @@ import pandas as pd
 from datetime import date
 from pathlib import Path
 
+from ledger.store import open_ledger
+
 # ---------------- CONFIG ----------------
 archive_files = list(Path("data/history").glob("*_picks.csv"))
 
@@ -30,7 +32,6 @@ def stake_from_to_win(to_win: float, odds: int) -> float:
 
 
 # ---------------- GRADING ----------------
-results_path = Path("data/history/bet_results.csv")
 today = date.today().isoformat()
 
 rows = []
@@ -122,12 +123,13 @@ for _, row in picks.iterrows():
     })
 
 
-results_df = pd.DataFrame(rows)
+results_df = pd.DataFrame(rows, columns=["date", "game", "bet_type", "pick", "odds", "to_win", "stake", "result", "profit"])
 
-if results_path.exists():
-    existing = pd.read_csv(results_path)
-    results_df = pd.concat([existing, results_df], ignore_index=True)
+# Upsert into the bet ledger: re-grading a pick updates its row
+ledger_rows = results_df.rename(columns={"pick": "selection", "to_win": "bet_size"})
+ledger_rows["market"] = ledger_rows["bet_type"].str.capitalize()
 
-results_df.to_csv(results_path, index=False)
+with open_ledger() as ledger:
+    ledger.upsert(ledger_rows)
 
 print(f"✅ Graded {len(rows)} bets using TO-WIN unit logic")
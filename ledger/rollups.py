@@ -0,0 +1,156 @@
+import numpy as np
+import pandas as pd
+
+
+# ---------------- CONFIG ----------------
+UNIT = 10.0  # 1U = $10 to win, as in run_daily
+
+GRADED = "('WIN', 'LOSS', 'PUSH')"
+
+# grain -> SQL bucket for a bet row `r`. The *_day grains exist so
+# drawdown can be computed per market / tier from daily paths.
+GRAINS = {
+    "day": "r.date",
+    "month": "substr(r.date, 1, 7)",
+    "market": "COALESCE(r.market, '')",
+    "confidence": "COALESCE(r.confidence, '')",
+    "market_day": "COALESCE(r.market, '') || '|' || r.date",
+    "confidence_day": "COALESCE(r.confidence, '') || '|' || r.date",
+}
+
+# Additive measures -> SQL for one bet row `r`
+MEASURES = {
+    "bets": "1",
+    "wins": "r.result = 'WIN'",
+    "losses": "r.result = 'LOSS'",
+    "pushes": "r.result = 'PUSH'",
+    "staked": (
+        "COALESCE(CASE WHEN r.odds < 0 THEN r.bet_size * ABS(r.odds) / 100.0 "
+        "WHEN r.odds > 0 THEN r.bet_size * 100.0 / r.odds END, 0)"
+    ),
+    "profit": "COALESCE(r.profit, 0)",
+    "clv_sum": "COALESCE(r.clv, 0)",
+    "clv_n": "r.clv IS NOT NULL",
+}
+
+_TABLE = f"""
+CREATE TABLE IF NOT EXISTS rollups (
+    grain TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    {", ".join(f"{m} REAL NOT NULL DEFAULT 0" for m in MEASURES)},
+    PRIMARY KEY (grain, bucket)
+);
+"""
+
+
+def _apply(row, sign):
+    # One UPSERT per grain adding (sign=+1) or removing (-1) a graded bet
+    statements = []
+    for grain, bucket in GRAINS.items():
+        bucket = bucket.replace("r.", f"{row}.")
+        values = ", ".join(f"{sign} * ({sql.replace('r.', f'{row}.')})" for sql in MEASURES.values())
+        updates = ", ".join(f"{m} = {m} + excluded.{m}" for m in MEASURES)
+        statements.append(
+            f"INSERT INTO rollups (grain, bucket, {', '.join(MEASURES)}) "
+            f"SELECT '{grain}', {bucket}, {values} WHERE {row}.result IN {GRADED} "
+            f"ON CONFLICT (grain, bucket) DO UPDATE SET {updates};"
+        )
+    return "\n    ".join(statements)
+
+
+_TRIGGERS = f"""
+CREATE TRIGGER IF NOT EXISTS rollups_insert AFTER INSERT ON bets BEGIN
+    {_apply("new", 1)}
+END;
+CREATE TRIGGER IF NOT EXISTS rollups_delete AFTER DELETE ON bets BEGIN
+    {_apply("old", -1)}
+END;
+CREATE TRIGGER IF NOT EXISTS rollups_update AFTER UPDATE ON bets BEGIN
+    {_apply("old", -1)}
+    {_apply("new", 1)}
+END;
+"""
+
+
+# ---------------- MAINTENANCE ----------------
+def install(conn):
+    """
+    Creates the rollups table and the triggers that keep it current on
+    every insert / update / delete of `bets`. Rebuilds it the first time.
+    """
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'rollups'").fetchone()
+    with conn:
+        conn.executescript(_TABLE + _TRIGGERS)
+    if not exists:
+        rebuild(conn)
+
+
+def rebuild(conn):
+    """Recomputes every rollup from the bets table."""
+    with conn:
+        conn.execute("DELETE FROM rollups")
+        for grain, bucket in GRAINS.items():
+            conn.execute(
+                f"INSERT INTO rollups (grain, bucket, {', '.join(MEASURES)}) "
+                f"SELECT '{grain}', {bucket}, {', '.join(f'SUM({sql})' for sql in MEASURES.values())} "
+                f"FROM bets AS r WHERE r.result IN {GRADED} GROUP BY 2"
+            )
+
+
+# ---------------- READS ----------------
+def _max_drawdown(profit):
+    path = np.cumsum(np.asarray(profit, dtype=float))
+    peak = np.maximum.accumulate(np.maximum(path, 0))
+    return float((peak - path).max()) if len(path) else 0.0
+
+
+def _metrics(df):
+    df = df.copy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df["win_rate"] = np.where(df["bets"] > 0, df["wins"] / df["bets"], np.nan)
+        df["roi"] = np.where(df["staked"] > 0, df["profit"] / df["staked"], np.nan)
+        df["avg_clv"] = np.where(df["clv_n"] > 0, df["clv_sum"] / df["clv_n"], np.nan)
+    df["units"] = df["profit"] / UNIT
+    return df
+
+
+def _read(conn, grain):
+    df = pd.read_sql_query(
+        f"SELECT bucket, {', '.join(MEASURES)} FROM rollups WHERE grain = ? AND bets > 0 ORDER BY bucket",
+        conn, params=[grain],
+    )
+    for m in ["bets", "wins", "losses", "pushes", "clv_n"]:
+        df[m] = df[m].round().astype(int)
+    return df
+
+
+def rollup(conn, grain):
+    """
+    Performance by day / month / market / confidence: bets, W-L-P,
+    staked, profit, units, ROI, win rate, average CLV and max drawdown
+    (from the daily profit path within each bucket).
+    """
+    if grain in ("day", "month"):
+        df = _metrics(_read(conn, grain))
+        days = _read(conn, "day")
+        key = days["bucket"] if grain == "day" else days["bucket"].str[:7]
+    else:
+        df = _metrics(_read(conn, grain))
+        days = _read(conn, f"{grain}_day")
+        key = days["bucket"].str.rsplit("|", n=1).str[0]
+
+    if grain == "day":
+        path = df["profit"].cumsum()
+        df["drawdown"] = np.maximum.accumulate(np.maximum(path, 0)) - path
+    else:
+        drawdowns = days.groupby(key.to_numpy(), sort=False)["profit"].apply(_max_drawdown)
+        df["drawdown"] = df["bucket"].map(drawdowns).fillna(0.0)
+    return df.rename(columns={"bucket": grain})
+
+
+def totals(conn):
+    """One-row overall performance, including the max drawdown."""
+    days = _read(conn, "day")
+    df = _metrics(days[list(MEASURES)].sum().to_frame().T)
+    df["max_drawdown"] = _max_drawdown(days["profit"])
+    return df.iloc[0]
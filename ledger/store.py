@@ -0,0 +1,327 @@
+import os
+import re
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+from pandas.errors import EmptyDataError
+
+from ledger import rollups
+
+
+# ---------------- CONFIG ----------------
+DB_PATH = Path("data/history/bets.db")
+CSV_PATH = Path("data/history/bet_results.csv")
+
+# bet_results.csv columns, in file order
+BET_COLUMNS = {
+    "date": "TEXT",
+    "game": "TEXT",
+    "market": "TEXT",
+    "selection": "TEXT",
+    "odds": "INTEGER",
+    "bet_size": "REAL",
+    "result": "TEXT",
+    "profit": "REAL",
+    "confidence": "TEXT",
+    "home_score": "REAL",
+    "away_score": "REAL",
+    "graded_at": "TEXT",
+    "closing_line": "REAL",
+    "clv": "REAL",
+}
+
+# A bet is identified by what was bet, not by where it sits in a file
+KEY_COLUMNS = ["date", "game", "market", "selection"]
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS bets (
+    bet_id INTEGER PRIMARY KEY,
+    bet_key TEXT NOT NULL UNIQUE,
+    {", ".join(f"{c} {t}" for c, t in BET_COLUMNS.items())}
+);
+CREATE INDEX IF NOT EXISTS idx_bets_date ON bets(date);
+CREATE INDEX IF NOT EXISTS idx_bets_result ON bets(result);
+CREATE INDEX IF NOT EXISTS idx_bets_market ON bets(market);
+"""
+
+# Full-text index over what a bet is labelled by (game / selection / market),
+# kept in step with `bets` by triggers
+SEARCH_COLUMNS = ["game", "selection", "market"]
+
+_SEARCH_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS bets_search USING fts5(
+    {", ".join(SEARCH_COLUMNS)}, content='bets', content_rowid='bet_id'
+);
+CREATE TRIGGER IF NOT EXISTS bets_search_insert AFTER INSERT ON bets BEGIN
+    INSERT INTO bets_search(rowid, {", ".join(SEARCH_COLUMNS)})
+    VALUES (new.bet_id, {", ".join(f"new.{c}" for c in SEARCH_COLUMNS)});
+END;
+CREATE TRIGGER IF NOT EXISTS bets_search_delete AFTER DELETE ON bets BEGIN
+    INSERT INTO bets_search(bets_search, rowid, {", ".join(SEARCH_COLUMNS)})
+    VALUES ('delete', old.bet_id, {", ".join(f"old.{c}" for c in SEARCH_COLUMNS)});
+END;
+CREATE TRIGGER IF NOT EXISTS bets_search_update AFTER UPDATE OF {", ".join(SEARCH_COLUMNS)} ON bets BEGIN
+    INSERT INTO bets_search(bets_search, rowid, {", ".join(SEARCH_COLUMNS)})
+    VALUES ('delete', old.bet_id, {", ".join(f"old.{c}" for c in SEARCH_COLUMNS)});
+    INSERT INTO bets_search(rowid, {", ".join(SEARCH_COLUMNS)})
+    VALUES (new.bet_id, {", ".join(f"new.{c}" for c in SEARCH_COLUMNS)});
+END;
+"""
+
+
+def bet_keys(df):
+    parts = [df[c].fillna("").astype(str).str.strip() for c in KEY_COLUMNS]
+    key = parts[0]
+    for part in parts[1:]:
+        key = key + "|" + part
+    return key
+
+
+def iso_dates(dates):
+    """YYYY-MM-DD for every parseable date; anything else is left as is."""
+    return pd.to_datetime(dates, errors="coerce").dt.strftime("%Y-%m-%d").fillna(dates)
+
+
+def search_query(text):
+    """FTS5 query matching every word of `text` as a prefix."""
+    words = re.findall(r"\w+", str(text))
+    return " ".join(f'"{w}"*' for w in words)
+
+
+def _records(df, columns):
+    values = df[columns].astype(object)
+    return values.where(values.notna(), None).itertuples(index=False, name=None)
+
+
+class BetLedger:
+    """
+    The bet history in SQLite.
+
+    Every bet has a stable `bet_id`. Re-inserting the same
+    (date, game, market, selection) updates the existing row instead of
+    duplicating it, and date / result / market are indexed, so edits and
+    range queries touch only the rows involved. Text search runs against
+    an FTS5 index of game / selection / market when SQLite has FTS5, and
+    triggers keep the performance rollups (ledger.rollups) current.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.executescript(_SCHEMA)
+        self.searchable = self._create_search_index()
+        rollups.install(self.conn)
+
+    def _create_search_index(self):
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'bets_search'"
+        ).fetchone()
+        try:
+            with self.conn:
+                self.conn.executescript(_SEARCH_SCHEMA)
+                if not exists:
+                    self.conn.execute("INSERT INTO bets_search(bets_search) VALUES ('rebuild')")
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: search falls back to LIKE
+            return False
+        return True
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------------- WRITES ----------------
+    def upsert(self, df):
+        """
+        Inserts bets, updating any that already exist (same bet key).
+        Existing bets only get the columns `df` has; the rest keep their
+        stored values. Returns the bet ids in `df` order.
+        """
+        if df.empty:
+            return []
+
+        given = [c for c in BET_COLUMNS if c in df.columns and c not in KEY_COLUMNS]
+        df = df.reindex(columns=list(BET_COLUMNS)).copy()
+        df["date"] = iso_dates(df["date"])
+        df.insert(0, "bet_key", bet_keys(df))
+
+        columns = ["bet_key"] + list(BET_COLUMNS)
+        conflict = (
+            f"DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in given)}" if given else "DO NOTHING"
+        )
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO bets ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT(bet_key) {conflict}",
+                _records(df, columns),
+            )
+        ids = self._ids_for(df["bet_key"])
+        return [ids[k] for k in df["bet_key"]]
+
+    def _ids_for(self, keys):
+        # Chunked to stay under SQLite's bound-parameter limit
+        ids = {}
+        keys = list(keys)
+        for start in range(0, len(keys), 900):
+            chunk = keys[start:start + 900]
+            ids.update(self.conn.execute(
+                f"SELECT bet_key, bet_id FROM bets WHERE bet_key IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall())
+        return ids
+
+    def update(self, bet_id, **fields):
+        """
+        Updates one bet's columns in place. Raises ValueError, writing
+        nothing, when the new date / game / market / selection are
+        another bet's.
+        """
+        fields = {c: v for c, v in fields.items() if c in BET_COLUMNS}
+        if not fields:
+            return
+        if "date" in fields:
+            fields["date"] = iso_dates(pd.Series([fields["date"]], dtype=object)).iloc[0]
+        if set(KEY_COLUMNS) & set(fields):
+            row = self.get(bet_id)
+            if row is None:
+                return
+            key = bet_keys(pd.DataFrame([{**row.to_dict(), **fields}])).iloc[0]
+            other = self.conn.execute(
+                "SELECT bet_id FROM bets WHERE bet_key = ? AND bet_id != ?", (key, int(bet_id))
+            ).fetchone()
+            if other:
+                raise ValueError(f"Duplicates bet #{other[0]}")
+            fields["bet_key"] = key
+        with self.conn:
+            self.conn.execute(
+                f"UPDATE bets SET {', '.join(f'{c} = ?' for c in fields)} WHERE bet_id = ?",
+                [None if pd.isna(v) else v for v in fields.values()] + [int(bet_id)],
+            )
+
+    def update_many(self, df):
+        """Writes the columns of `df` (indexed by bet_id) back to those bets."""
+        columns = [c for c in df.columns if c in BET_COLUMNS]
+        if df.empty or not columns:
+            return
+        rows = df[columns].assign(bet_id=df.index.astype(int))
+        with self.conn:
+            self.conn.executemany(
+                f"UPDATE bets SET {', '.join(f'{c} = ?' for c in columns)} WHERE bet_id = ?",
+                _records(rows, columns + ["bet_id"]),
+            )
+
+    def delete(self, bet_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM bets WHERE bet_id = ?", (int(bet_id),))
+
+    # ---------------- READS ----------------
+    def get(self, bet_id):
+        rows = self.query(bet_ids=[bet_id])
+        return rows.iloc[0] if not rows.empty else None
+
+    def _where(self, start=None, end=None, result=None, market=None, search=None, bet_ids=None):
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("date >= ?")
+            params.append(str(start))
+        if end is not None:
+            clauses.append("date <= ?")
+            params.append(str(end))
+        for column, values in (("result", result), ("market", market)):
+            if values is None:
+                continue
+            values = [values] if isinstance(values, str) else list(values)
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        if search and search_query(search):
+            if self.searchable:
+                clauses.append("bet_id IN (SELECT rowid FROM bets_search WHERE bets_search MATCH ?)")
+                params.append(search_query(search))
+            else:
+                clauses.append("(game || ' ' || selection) LIKE ?")
+                params.append(f"%{search}%")
+        if bet_ids is not None:
+            bet_ids = [int(i) for i in bet_ids]
+            clauses.append(f"bet_id IN ({', '.join('?' * len(bet_ids))})")
+            params.extend(bet_ids)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(self, start=None, end=None, result=None, market=None, search=None,
+              bet_ids=None, order="date DESC, bet_id DESC", limit=None, offset=0):
+        """
+        Bets as a DataFrame indexed by bet_id. Date bounds are inclusive
+        ISO dates; result / market take one value or a list; `search`
+        matches words (prefixes) of the game, selection or market.
+        """
+        where, params = self._where(start, end, result, market, search, bet_ids)
+        sql = f"SELECT bet_id, {', '.join(BET_COLUMNS)} FROM bets{where} ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [int(limit), int(offset)]
+        return pd.read_sql_query(sql, self.conn, params=params, index_col="bet_id")
+
+    def count(self, start=None, end=None, result=None, market=None, search=None):
+        where, params = self._where(start, end, result, market, search)
+        return self.conn.execute(f"SELECT COUNT(*) FROM bets{where}", params).fetchone()[0]
+
+    def pending(self):
+        """Bets with no result yet (blank or PENDING) and never graded."""
+        return pd.read_sql_query(
+            f"SELECT bet_id, {', '.join(BET_COLUMNS)} FROM bets "
+            "WHERE (result IS NULL OR result IN ('', 'PENDING')) AND graded_at IS NULL "
+            "ORDER BY bet_id",
+            self.conn,
+            index_col="bet_id",
+        )
+
+    def __len__(self):
+        return self.count()
+
+    # ---------------- ROLLUPS ----------------
+    def rollup(self, grain):
+        """Precomputed performance by "day", "month", "market" or "confidence"."""
+        return rollups.rollup(self.conn, grain)
+
+    def totals(self):
+        return rollups.totals(self.conn)
+
+    # ---------------- CSV ----------------
+    def import_csv(self, path=CSV_PATH):
+        """Upserts every row of a bet_results.csv; safe to re-run."""
+        try:
+            df = pd.read_csv(path)
+        except (FileNotFoundError, EmptyDataError):
+            return 0
+        return len(set(self.upsert(df)))
+
+    def export_csv(self, path=CSV_PATH):
+        """
+        Writes a snapshot of the ledger to bet_results.csv. Writes do not
+        export; the daily pipeline's ledger_csv stage and
+        `scripts/ledger_csv.py export` do.
+        """
+        df = self.query(order="date, bet_id")
+        path = Path(path)
+        tmp = path.with_suffix(".tmp")
+        df.to_csv(tmp, index=False)
+        os.replace(tmp, path)
+        return len(df)
+
+
+def open_ledger(path=DB_PATH, csv_path=CSV_PATH):
+    """
+    The ledger, seeded from bet_results.csv the first time it is created.
+    The CSV is a snapshot (see export_csv), not a live mirror: bets
+    written since the last export are only in the database.
+    """
+    ledger = BetLedger(path)
+    if len(ledger) == 0 and Path(csv_path).exists():
+        ledger.import_csv(csv_path)
+    return ledger
@@ -0,0 +1,254 @@
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from models.projections import DEFAULT_PARAMS, _column, _split_column
+
+
+# ---------------- CONFIG ----------------
+PARAMS_DIR = Path("data/model_params")
+STATE_NAME = "fit_state.npz"
+
+# Pins picks / backtests to one fitted version (0 = DEFAULT_PARAMS);
+# unset, they use the latest
+VERSION_ENV = "NCAAB_MODEL_VERSION"
+
+# Point coefficients, in design-matrix column order
+FEATURES = ["tempo_A", "tempo_B", "home_boost", "away_penalty", "rest", "injury"]
+
+RIDGE = 10.0        # shrinkage toward the previous (or default) coefficients
+NEWTON_STEPS = 25
+MIN_WEIGHT = 1e-4   # decayed games below this weight are dropped
+
+
+# ================================
+# DESIGN
+# ================================
+def design(games):
+    """
+    project_game is linear in its coefficients once the efficiencies are
+    fixed: each team's points are
+
+        ppp * (tempo_A * A_tempo + tempo_B * B_tempo)
+        + home_boost (A at home) - away_penalty (B, A at home)
+        + rest * rest advantage (A) - injury * injuries
+
+    Returns (A_rows, B_rows): one (games x FEATURES) matrix per team, so
+    A_points = A_rows @ beta, B_points = B_rows @ beta and the spread is
+    (A_rows - B_rows) @ beta.
+    """
+    A_off = _split_column(games, "A_off_home", _column(games, "A_off"))
+    A_def = _split_column(games, "A_def_home", _column(games, "A_def"))
+    B_off = _split_column(games, "B_off_away", _column(games, "B_off"))
+    B_def = _split_column(games, "B_def_away", _column(games, "B_def"))
+    A_ppp = (A_off / 100) * (100 / B_def)
+    B_ppp = (B_off / 100) * (100 / A_def)
+
+    A_tempo, B_tempo = _column(games, "A_tempo"), _column(games, "B_tempo")
+    home = (_column(games, "A_home", 0) != 0).astype(float)
+    rest = _column(games, "A_rest", 0) - _column(games, "B_rest", 0)
+    zero = np.zeros(len(home))
+
+    A_rows = np.column_stack([A_ppp * A_tempo, A_ppp * B_tempo, home, zero, rest, -_column(games, "A_injury", 0)])
+    B_rows = np.column_stack([B_ppp * A_tempo, B_ppp * B_tempo, zero, -home, zero, -_column(games, "B_injury", 0)])
+    return A_rows, B_rows
+
+
+def scored(games):
+    """Games with both final scores, in the run_backtest layout (A = home)."""
+    games = games.dropna(subset=["home_score", "away_score"])
+    return games.reset_index(drop=True)
+
+
+# ================================
+# SOLVERS
+# ================================
+def solve_points(XtX, Xty, prior, ridge=RIDGE):
+    """
+    Ridge least squares from the normal equations:
+    (X'X + ridge I) beta = X'y + ridge prior.
+    """
+    A = XtX + ridge * np.eye(len(prior))
+    b = Xty + ridge * np.asarray(prior, dtype=float)
+    try:
+        return np.linalg.solve(A, b)
+    except np.linalg.LinAlgError:
+        return np.linalg.lstsq(A, b, rcond=None)[0]
+
+
+def fit_logistic_scale(spread, won, scale=DEFAULT_PARAMS["logistic_scale"], weights=None, steps=NEWTON_STEPS):
+    """
+    (Weighted) maximum-likelihood `s` in win_prob = 1 / (1 + e^(-spread / s)),
+    by Newton's method on k = 1 / s warm-started from `scale`. project_game
+    uses 2.71828 for e, which the slope absorbs.
+    """
+    spread = np.asarray(spread, dtype=float)
+    won = np.asarray(won, dtype=float)
+    w = np.ones(len(won)) if weights is None else np.asarray(weights, dtype=float)
+    x = spread * np.log(2.71828)
+    k = 1 / scale
+    for _ in range(steps):
+        p = 1 / (1 + np.exp(-k * x))
+        gradient = x @ (w * (won - p))
+        hessian = -(w * x * x) @ (p * (1 - p))
+        if hessian >= 0:
+            break
+        step = gradient / hessian
+        k -= step
+        if abs(step) < 1e-10 * max(abs(k), 1):
+            break
+    return 1 / k if k > 0 else scale
+
+
+# ================================
+# INCREMENTAL FITTER
+# ================================
+class ModelFitter:
+    """
+    Fits project_game's coefficients to final scores.
+
+    Keeps the sufficient statistics of the points regression (X'X, X'y
+    over both teams of every game) and each game's spread row and result,
+    so adding a day of scores is a rank update plus a few warm-started
+    Newton steps, never a refit from the raw history. `decay` < 1 fades
+    older games each time new ones are added.
+    """
+
+    def __init__(self, root=PARAMS_DIR):
+        self.root = Path(root)
+        k = len(FEATURES)
+        self.XtX = np.zeros((k, k))
+        self.Xty = np.zeros(k)
+        self.diffs = np.empty((0, k))
+        self.won = np.empty(0)
+        self.weights = np.empty(0)
+        self.params = dict(DEFAULT_PARAMS)
+
+    @classmethod
+    def load(cls, root=PARAMS_DIR):
+        """The saved fit state (and latest parameters), or a fresh fitter."""
+        fitter = cls(root)
+        path = fitter.root / STATE_NAME
+        if path.exists():
+            with np.load(path) as state:
+                fitter.XtX, fitter.Xty = state["XtX"], state["Xty"]
+                fitter.diffs, fitter.won, fitter.weights = state["diffs"], state["won"], state["weights"]
+        fitter.params = load_params((param_versions(root) or [0])[-1], root)
+        return fitter
+
+    @property
+    def games(self):
+        return len(self.won)
+
+    def add(self, games, decay=1.0):
+        """Accumulates scored games (home_score / away_score, A = home)."""
+        games = scored(games)
+        if games.empty:
+            return 0
+        A_rows, B_rows = design(games)
+        A_score = games["home_score"].to_numpy(dtype=float)
+        B_score = games["away_score"].to_numpy(dtype=float)
+
+        self.XtX = decay * self.XtX + A_rows.T @ A_rows + B_rows.T @ B_rows
+        self.Xty = decay * self.Xty + A_rows.T @ A_score + B_rows.T @ B_score
+        self.diffs = np.vstack([self.diffs, A_rows - B_rows])
+        self.won = np.concatenate([self.won, (A_score > B_score).astype(float)])
+        self.weights = np.concatenate([decay * self.weights, np.ones(len(games))])
+
+        # Games decayed to nothing no longer count; drop them
+        keep = self.weights > MIN_WEIGHT
+        self.diffs, self.won, self.weights = self.diffs[keep], self.won[keep], self.weights[keep]
+        return len(games)
+
+    def solve(self, ridge=RIDGE):
+        """
+        New coefficients: ridge least squares shrunk toward the current
+        ones, then the logistic scale on the refitted spreads.
+        """
+        if not self.games:
+            return dict(self.params)
+        prior = [self.params[f] for f in FEATURES]
+        beta = solve_points(self.XtX, self.Xty, prior, ridge)
+
+        scale = fit_logistic_scale(self.diffs @ beta, self.won, self.params["logistic_scale"], self.weights)
+
+        self.params = {**dict(zip(FEATURES, np.round(beta, 6).tolist())), "logistic_scale": round(float(scale), 6)}
+        return dict(self.params)
+
+    def save(self, **meta):
+        """Writes the fit state and the parameters as a new version."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / f"{STATE_NAME}.tmp.npz"
+        np.savez(tmp, XtX=self.XtX, Xty=self.Xty, diffs=self.diffs, won=self.won, weights=self.weights)
+        os.replace(tmp, self.root / STATE_NAME)
+        return save_params(self.params, root=self.root, games=self.games, **meta)
+
+
+# ================================
+# VERSIONED PARAMETERS
+# ================================
+def param_versions(root=PARAMS_DIR):
+    return sorted(int(p.stem[1:]) for p in Path(root).glob("v[0-9]*.json"))
+
+
+def save_params(params, root=PARAMS_DIR, **meta):
+    """Writes `params` as the next vNNNN.json; returns the version."""
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    version = (param_versions(root) or [0])[-1] + 1
+    record = {
+        "version": version,
+        "fitted_at": datetime.now().isoformat(timespec="seconds"),
+        "params": {k: float(params[k]) for k in DEFAULT_PARAMS},
+        **meta,
+    }
+    path = root / f"v{version:04d}.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(record, indent=2))
+    os.replace(tmp, path)
+    return version
+
+
+def param_record(version, root=PARAMS_DIR):
+    """The saved vNNNN.json: version, fitted_at, params and any metadata."""
+    return json.loads((Path(root) / f"v{version:04d}.json").read_text())
+
+
+def params_version(version=None, root=PARAMS_DIR):
+    """
+    The version load_params(version) uses: `version`, else the one pinned
+    by NCAAB_MODEL_VERSION, else the latest. 0 when there is none.
+    """
+    if version is None and os.getenv(VERSION_ENV, "").strip():
+        version = int(os.getenv(VERSION_ENV))
+    if version is None:
+        version = (param_versions(root) or [0])[-1]
+    return int(version)
+
+
+def params_path(version=None, root=PARAMS_DIR):
+    """The vNNNN.json load_params(version) reads; None for DEFAULT_PARAMS."""
+    version = params_version(version, root)
+    return Path(root) / f"v{version:04d}.json" if version else None
+
+
+def load_params(version=None, root=PARAMS_DIR):
+    """
+    Coefficients for project_game / project_games: the given version, the
+    pinned one (NCAAB_MODEL_VERSION) or the latest. DEFAULT_PARAMS for
+    version 0 or when nothing has been fitted.
+    """
+    version = params_version(version, root)
+    if not version:
+        return dict(DEFAULT_PARAMS)
+    return {**DEFAULT_PARAMS, **param_record(version, root)["params"]}
+
+
+def fit_games(games, ridge=RIDGE):
+    """One-shot fit of a frame of scored games; returns the parameters."""
+    fitter = ModelFitter()
+    fitter.add(games)
+    return fitter.solve(ridge)
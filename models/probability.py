@@ -0,0 +1,126 @@
+import numpy as np
+
+from betting.moneyline import payout_from_odds
+
+
+# ---------------- CONFIG ----------------
+# Spread of final results around the projection (typical NCAA residuals)
+MARGIN_SD = 11.0
+TOTAL_SD = 12.0
+
+
+# ---------------- NORMAL CDF ----------------
+def erf(x):
+    """
+    Vectorized error function (Abramowitz & Stegun 7.1.26, |error| < 1.5e-7),
+    so a whole slate is one NumPy expression instead of a math.erf loop.
+    """
+    x = np.asarray(x, dtype=float)
+    t = 1 / (1 + 0.3275911 * np.abs(x))
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    return np.sign(x) * (1 - poly * np.exp(-x * x))
+
+
+def normal_cdf(x, mean=0.0, sd=1.0):
+    return 0.5 * (1 + erf((np.asarray(x, dtype=float) - mean) / (sd * np.sqrt(2))))
+
+
+# ---------------- OUTCOMES ----------------
+def outcome_probabilities(mean, threshold, sd):
+    """
+    (P(X > t), P(X = t), P(X < t)) for an integer score X ~ Normal(mean, sd)
+    with a continuity correction. Half-point thresholds never push; an
+    integer threshold pushes with the mass of (t - 0.5, t + 0.5].
+    """
+    mean = np.asarray(mean, dtype=float)
+    threshold = np.asarray(threshold, dtype=float)
+    above = 1 - normal_cdf(np.floor(threshold) + 0.5, mean, sd)
+    below = normal_cdf(np.ceil(threshold) - 0.5, mean, sd)
+    return above, np.clip(1 - above - below, 0, 1), below
+
+
+def spread_probabilities(model_spread, line, sd=MARGIN_SD):
+    """
+    (cover, push, lose) for team A at `line`, A's handicap in book terms
+    (spread_A_line: -5.5 = A gives 5.5). model_spread is A_points - B_points,
+    and A covers when margin + line > 0.
+    """
+    return outcome_probabilities(model_spread, -np.asarray(line, dtype=float), sd)
+
+
+def total_probabilities(model_total, line, sd=TOTAL_SD):
+    """(over, push, under) at total `line`."""
+    return outcome_probabilities(model_total, line, sd)
+
+
+def expected_value(win, push, odds):
+    """
+    Expected profit per 1 staked at American `odds`: wins pay out at the
+    price, pushes return the stake, everything else loses it.
+    """
+    win = np.asarray(win, dtype=float)
+    lose = 1 - win - np.asarray(push, dtype=float)
+    return win * payout_from_odds(odds, 1.0) - lose
+
+
+# ---------------- LOOKUP TABLES ----------------
+class LineTable:
+    """
+    P(X <= k) for every game's integer score X over a grid of lines.
+
+    Built with one erf per (game, whole point in [lo, hi]); after that,
+    the win / push / lose split at any line on the grid (half points,
+    whole points, every alternate line, either side) is an index into
+    the table. Lines beyond the grid are treated as certain.
+    """
+
+    def __init__(self, mean, sd, lo, hi):
+        self.mean = np.atleast_1d(np.asarray(mean, dtype=float))
+        self.sd = sd
+        self.lo = int(np.floor(lo)) - 1
+        points = np.arange(self.lo, int(np.ceil(hi)) + 1)
+        self.cdf = normal_cdf(points[None, :] + 0.5, self.mean[:, None], sd)
+
+    def _cdf(self, k, rows):
+        index = k.astype(np.int64) - self.lo
+        inside = (index >= 0) & (index < self.cdf.shape[1])
+        values = self.cdf[rows, np.clip(index, 0, self.cdf.shape[1] - 1)]
+        return np.where(inside, values, np.where(index < 0, 0.0, 1.0))
+
+    def outcomes(self, threshold):
+        """
+        (P(X > t), P(X = t), P(X < t)) for thresholds shaped (games,) or
+        (games, lines), row i priced from game i's distribution.
+        """
+        threshold = np.asarray(threshold, dtype=float)
+        if threshold.ndim == 0:
+            threshold = np.full(len(self.mean), float(threshold))
+        rows = np.arange(len(self.mean)).reshape((-1,) + (1,) * (threshold.ndim - 1))
+        above = 1 - self._cdf(np.floor(threshold), rows)
+        below = self._cdf(np.ceil(threshold) - 1, rows)
+        return above, np.clip(1 - above - below, 0, 1), below
+
+
+def spread_table(model_spread, lo=-40, hi=40, sd=MARGIN_SD):
+    """LineTable of the A - B margin; covers A's handicaps in [-hi, -lo]."""
+    return LineTable(model_spread, sd, lo, hi)
+
+
+def total_table(model_total, lo=100, hi=200, sd=TOTAL_SD):
+    return LineTable(model_total, sd, lo, hi)
+
+
+def price_spreads(table, lines, odds=-110):
+    """
+    (cover, push, lose, ev) for team A at each of `lines` (A's handicap,
+    shaped (games,) or (games, lines)) from a spread_table. Team B at
+    line L is team A at -L with cover and lose swapped.
+    """
+    cover, push, lose = table.outcomes(-np.asarray(lines, dtype=float))
+    return cover, push, lose, expected_value(cover, push, odds)
+
+
+def price_totals(table, lines, odds=-110):
+    """(over, push, under, ev of the over) at each of `lines` from a total_table."""
+    over, push, under = table.outcomes(lines)
+    return over, push, under, expected_value(over, push, odds)
@@ -1,21 +1,49 @@
-def project_game(A, B):
+from itertools import repeat
+
+import numpy as np
+
+from pipeline.trace import traced
+
+
+# Coefficients of the projection; models.fit estimates them from results
+DEFAULT_PARAMS = {
+    "tempo_A": 0.6,          # weight of A's tempo in the game's pace
+    "tempo_B": 0.4,
+    "home_boost": 3.0,       # points added to A at home
+    "away_penalty": 1.5,     # points taken from B when A is at home
+    "rest": 0.5,             # points per day of rest advantage
+    "injury": 1.5,           # points per injury
+    "logistic_scale": 5.0,   # spread -> win probability
+}
+
+
+def _split_or_overall(value, overall):
+    # Missing, zero or NaN split values fall back to the overall rating
+    if not value or value != value:
+        return overall
+    return value
+
+
+def project_game(A, B, params=None):
     """
     Improved NCAA projection with offense/defense interaction
     Now split-aware (home/away) with automatic fallback
+    `params` (e.g. models.fit.load_params()) defaults to DEFAULT_PARAMS
     """
+    p = params or DEFAULT_PARAMS
 
     # ---------------- HELPER ----------------
     def get_eff(team, location):
         if location == "home":
-            off = team.get("off_eff_home") or team["off_eff"]
-            deff = team.get("def_eff_home") or team["def_eff"]
+            off = _split_or_overall(team.get("off_eff_home"), team["off_eff"])
+            deff = _split_or_overall(team.get("def_eff_home"), team["def_eff"])
         else:
-            off = team.get("off_eff_away") or team["off_eff"]
-            deff = team.get("def_eff_away") or team["def_eff"]
+            off = _split_or_overall(team.get("off_eff_away"), team["off_eff"])
+            deff = _split_or_overall(team.get("def_eff_away"), team["def_eff"])
         return off, deff
 
     # ---------------- TEMPO ----------------
-    tempo = 0.6 * A["tempo"] + 0.4 * B["tempo"]
+    tempo = p["tempo_A"] * A["tempo"] + p["tempo_B"] * B["tempo"]
 
     # ---------------- EFFICIENCIES ----------------
     A_off, A_def = get_eff(A, "home")
@@ -31,21 +59,87 @@ def project_game(A, B):
 
     # ---------------- HOME / AWAY ADJUSTMENT ----------------
     if A["home"]:
-        A_points += 3
-        B_points -= 1.5
+        A_points += p["home_boost"]
+        B_points -= p["away_penalty"]
 
     # ---------------- REST ADVANTAGE ----------------
-    A_points += (A.get("rest", 0) - B.get("rest", 0)) * 0.5
+    A_points += (A.get("rest", 0) - B.get("rest", 0)) * p["rest"]
 
     # ---------------- INJURY IMPACT ----------------
-    A_points -= A.get("injury", 0) * 1.5
-    B_points -= B.get("injury", 0) * 1.5
+    A_points -= A.get("injury", 0) * p["injury"]
+    B_points -= B.get("injury", 0) * p["injury"]
 
     # ---------------- FINAL OUTPUTS ----------------
     spread = A_points - B_points
     total = A_points + B_points
 
     # ---------------- WIN PROBABILITY ----------------
-    win_prob = 1 / (1 + pow(2.71828, -spread / 5))
+    win_prob = 1 / (1 + pow(2.71828, -spread / p["logistic_scale"]))
+
+    return spread, total, win_prob
+
+
+# ---------------- BATCHED PROJECTIONS ----------------
+def _column(games, name, default=None):
+    if name in games:
+        return np.asarray(games[name], dtype=float)
+    if default is None:
+        raise KeyError(f"Missing projection column: {name}")
+    return np.full(len(games[next(iter(games.keys()))]), default, dtype=float)
+
+
+def _split_column(games, name, overall):
+    if name not in games:
+        return overall
+    split = np.asarray(games[name], dtype=float)
+    return np.where(np.isnan(split) | (split == 0), overall, split)
+
+
+@traced("projection")
+def project_games(games, params=None):
+    """
+    Column-wise project_game for a whole slate or season.
+
+    `games` is a DataFrame (or dict of arrays) in the daily_games.csv
+    layout: A_off, A_def, A_tempo, A_home, A_rest, A_injury and the same
+    B_ columns. Optional A_off_home / A_def_home / B_off_away / B_def_away
+    split columns fall back to the overall ratings like project_game.
+
+    Returns (spread, total, win_prob) as float arrays, row for row equal
+    to calling project_game on each game with the same `params`.
+    """
+    p = params or DEFAULT_PARAMS
+
+    # ---------------- TEMPO ----------------
+    tempo = p["tempo_A"] * _column(games, "A_tempo") + p["tempo_B"] * _column(games, "B_tempo")
+
+    # ---------------- EFFICIENCIES ----------------
+    A_off = _split_column(games, "A_off_home", _column(games, "A_off"))
+    A_def = _split_column(games, "A_def_home", _column(games, "A_def"))
+    B_off = _split_column(games, "B_off_away", _column(games, "B_off"))
+    B_def = _split_column(games, "B_def_away", _column(games, "B_def"))
+
+    # ---------------- EXPECTED PPP / RAW POINTS ----------------
+    A_points = (A_off / 100) * (100 / B_def) * tempo
+    B_points = (B_off / 100) * (100 / A_def) * tempo
+
+    # ---------------- HOME / AWAY ADJUSTMENT ----------------
+    home = _column(games, "A_home", 0) != 0
+    A_points = np.where(home, A_points + p["home_boost"], A_points)
+    B_points = np.where(home, B_points - p["away_penalty"], B_points)
+
+    # ---------------- REST / INJURY ----------------
+    A_points = A_points + (_column(games, "A_rest", 0) - _column(games, "B_rest", 0)) * p["rest"]
+    A_points = A_points - _column(games, "A_injury", 0) * p["injury"]
+    B_points = B_points - _column(games, "B_injury", 0) * p["injury"]
+
+    # ---------------- FINAL OUTPUTS ----------------
+    spread = A_points - B_points
+    total = A_points + B_points
+
+    # Builtin pow keeps win_prob bit-identical to project_game
+    # (np.power's SIMD path can differ in the last ulp)
+    exponent = (-spread / p["logistic_scale"]).tolist()
+    win_prob = 1 / (1 + np.fromiter(map(pow, repeat(2.71828), exponent), float, len(exponent)))
 
     return spread, total, win_prob
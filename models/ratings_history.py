@@ -0,0 +1,139 @@
+import os
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from models.team_stats import GAME_COLUMNS, STAT_COLUMNS
+
+
+# ---------------- CONFIG ----------------
+HISTORY_DIR = Path("data/ratings_history")
+
+
+class RatingsHistory:
+    """
+    Dated snapshots of every team's ratings, for point-in-time lookups.
+
+    One compressed .npz per snapshot date (team names + a float32
+    teams x STAT_COLUMNS matrix, ~10 KB), grouped in a directory per
+    year. Reads load only the dates a query covers, so many seasons of
+    daily snapshots never have to be in memory at once.
+    """
+
+    def __init__(self, root=HISTORY_DIR):
+        self.root = Path(root)
+
+    def _path(self, day):
+        return self.root / day[:4] / f"{day}.npz"
+
+    # ---------------- WRITE ----------------
+    def append(self, store, as_of=None):
+        """
+        Records a TeamStatsStore (or a team_stats frame) as the ratings
+        valid on `as_of` (default today). Re-running on the same day
+        replaces that day's snapshot.
+        """
+        day = pd.Timestamp(as_of or date.today()).strftime("%Y-%m-%d")
+        if isinstance(store, pd.DataFrame):
+            frame = store.set_index("team") if "team" in store.columns else store
+        else:
+            frame = store.frame()
+        frame = frame.reindex(columns=STAT_COLUMNS)
+
+        path = self._path(day)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{day}.tmp.npz")
+        np.savez_compressed(
+            tmp,
+            teams=np.asarray(frame.index.astype(str).tolist(), dtype=str),
+            values=frame.to_numpy(dtype=np.float32),
+        )
+        os.replace(tmp, path)
+        return path
+
+    # ---------------- READ ----------------
+    def dates(self):
+        return sorted(p.stem for p in self.root.glob("*/*.npz") if not p.stem.endswith(".tmp"))
+
+    def snapshot(self, day):
+        with np.load(self._path(pd.Timestamp(day).strftime("%Y-%m-%d"))) as data:
+            return pd.DataFrame(data["values"].astype(float), index=pd.Index(data["teams"], name="team"), columns=STAT_COLUMNS)
+
+    def load(self, start=None, end=None):
+        """
+        Long table (date, team, STAT_COLUMNS) of the snapshots dated in
+        [start, end], sorted by date. Teams are categorical.
+        """
+        days = self.dates()
+        if start is not None:
+            days = [d for d in days if d >= pd.Timestamp(start).strftime("%Y-%m-%d")]
+        if end is not None:
+            days = [d for d in days if d <= pd.Timestamp(end).strftime("%Y-%m-%d")]
+
+        teams, values, dates = [], [], []
+        for day in days:
+            with np.load(self._path(day)) as data:
+                teams.append(data["teams"])
+                values.append(data["values"])
+                dates.append(np.full(len(data["teams"]), np.datetime64(day, "ns")))
+
+        if not days:
+            history = pd.DataFrame(np.empty((0, len(STAT_COLUMNS)), dtype=np.float32), columns=STAT_COLUMNS)
+            history.insert(0, "team", pd.Categorical([]))
+            history.insert(0, "date", pd.Series(dtype="datetime64[ns]"))
+            return history
+
+        history = pd.DataFrame(np.concatenate(values), columns=STAT_COLUMNS)
+        history.insert(0, "team", pd.Categorical(np.concatenate(teams)))
+        history.insert(0, "date", np.concatenate(dates))
+        return history
+
+    # ---------------- AS-OF JOIN ----------------
+    def attach(self, games, date_column="date", allow_exact_matches=False, max_staleness=None, overwrite=False):
+        """
+        attach_team_stats with the ratings valid at each game's date:
+        the latest snapshot strictly before it (or on it, with
+        allow_exact_matches), so backtests never see later ratings.
+
+        Both sides of every game go through a single merge_asof over the
+        snapshots spanning the games' dates. Teams with no snapshot in
+        range (or one older than `max_staleness`) get NaN.
+        """
+        games = games.copy()
+        game_dates = pd.to_datetime(games[date_column], errors="coerce")
+        if game_dates.notna().any():
+            lookback = pd.Timedelta(max_staleness) if max_staleness is not None else pd.Timedelta(days=366)
+            history = self.load(game_dates.min() - lookback, game_dates.max())
+        else:
+            history = self.load(end=pd.Timestamp.min)
+
+        n = len(games)
+        sides = pd.DataFrame({
+            "_row": np.tile(np.arange(n), 2),
+            "_side": np.repeat(["A", "B"], n),
+            "team": np.concatenate([games["A_team"].astype(str).to_numpy(), games["B_team"].astype(str).to_numpy()]),
+            "date": np.concatenate([game_dates.to_numpy("datetime64[ns]")] * 2),
+        })
+        dated = sides["date"].notna()
+
+        history = history.assign(team=history["team"].astype(str))
+        joined = pd.merge_asof(
+            sides[dated].sort_values("date"),
+            history.sort_values("date"),
+            on="date",
+            by="team",
+            allow_exact_matches=allow_exact_matches,
+            tolerance=pd.Timedelta(max_staleness) if max_staleness is not None else None,
+        )
+
+        for side in ("A", "B"):
+            rows = joined[joined["_side"] == side]
+            values = np.full((n, len(STAT_COLUMNS)), np.nan)
+            values[rows["_row"].to_numpy()] = rows[STAT_COLUMNS].to_numpy(dtype=float)
+            for i, column in enumerate(STAT_COLUMNS):
+                name = f"{side}_{GAME_COLUMNS[column]}"
+                if overwrite or name not in games.columns:
+                    games[name] = values[:, i]
+        return games
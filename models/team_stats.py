@@ -0,0 +1,173 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+# ---------------- CONFIG ----------------
+STATS_CSV = Path("data/team_stats.csv")
+STORE_PATH = Path("data/team_stats.bin")
+
+STAT_COLUMNS = [
+    "off_eff",
+    "def_eff",
+    "tempo",
+    "off_eff_home",
+    "def_eff_home",
+    "off_eff_away",
+    "def_eff_away",
+]
+
+# team_stats column -> suffix of the per-side game columns (A_off, B_def_away, ...)
+GAME_COLUMNS = {
+    "off_eff": "off",
+    "def_eff": "def",
+    "tempo": "tempo",
+    "off_eff_home": "off_home",
+    "def_eff_home": "def_home",
+    "off_eff_away": "off_away",
+    "def_eff_away": "def_away",
+}
+
+_MAGIC = b"NCAATS1\n"
+_ALIGN = 64
+
+
+def _source_signature(path):
+    stat = os.stat(path)
+    return {"path": str(path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+class TeamStatsStore:
+    """
+    Team ratings keyed by integer team id.
+
+    Names map to ids through one dict; ratings live in a single
+    (teams x columns) float64 matrix, so a slate lookup is one gather.
+    The matrix persists to a binary file that `open` memory-maps, so
+    any process can load it without parsing the CSV.
+    """
+
+    def __init__(self, teams, values, columns=STAT_COLUMNS, source=None):
+        self.teams = list(teams)
+        self.columns = list(columns)
+        self.values = values
+        self.source = source
+        self.team_ids = {team: i for i, team in enumerate(self.teams)}
+        self._column_index = {c: i for i, c in enumerate(self.columns)}
+
+    # ---------------- BUILD ----------------
+    @classmethod
+    def from_frame(cls, df, source=None):
+        if "team" in df.columns:
+            df = df.set_index("team")
+        df = df.reindex(columns=STAT_COLUMNS)
+        values = np.ascontiguousarray(df.to_numpy(dtype=np.float64))
+        return cls(df.index.astype(str).str.strip(), values, STAT_COLUMNS, source)
+
+    @classmethod
+    def from_csv(cls, path=STATS_CSV):
+        return cls.from_frame(pd.read_csv(path), source=_source_signature(path))
+
+    # ---------------- PERSIST ----------------
+    def save(self, path=STORE_PATH):
+        header = json.dumps({
+            "teams": self.teams,
+            "columns": self.columns,
+            "source": self.source,
+        }).encode()
+        offset = len(_MAGIC) + 8 + len(header)
+        offset += -offset % _ALIGN
+
+        tmp = Path(f"{path}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(_MAGIC)
+            f.write(len(header).to_bytes(8, "little"))
+            f.write(header)
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(np.ascontiguousarray(self.values, dtype="<f8").tobytes())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=STORE_PATH):
+        with open(path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"Not a team stats store: {path}")
+            header_len = int.from_bytes(f.read(8), "little")
+            header = json.loads(f.read(header_len))
+
+        offset = len(_MAGIC) + 8 + header_len
+        offset += -offset % _ALIGN
+        shape = (len(header["teams"]), len(header["columns"]))
+        values = (
+            np.memmap(path, dtype="<f8", mode="r", offset=offset, shape=shape)
+            if shape[0] else np.empty(shape)
+        )
+        return cls(header["teams"], values, header["columns"], header.get("source"))
+
+    @classmethod
+    def open(cls, path=STORE_PATH, csv_path=STATS_CSV):
+        """
+        Memory-maps the binary store, rebuilding it from the CSV first
+        when it is missing or the CSV has changed since it was built.
+        """
+        path, csv_path = Path(path), Path(csv_path)
+        if path.exists():
+            store = cls.load(path)
+            if not csv_path.exists() or store.source == _source_signature(csv_path):
+                return store
+
+        store = cls.from_csv(csv_path)
+        store.save(path)
+        return cls.load(path)
+
+    # ---------------- LOOKUPS ----------------
+    def __len__(self):
+        return len(self.teams)
+
+    def __contains__(self, team):
+        return team in self.team_ids
+
+    def ids(self, names):
+        """Team ids for a sequence of names; -1 for unknown teams."""
+        get = self.team_ids.get
+        return np.fromiter((get(n, -1) for n in names), dtype=np.int64, count=len(names))
+
+    def gather(self, ids, columns=STAT_COLUMNS):
+        """(len(ids) x len(columns)) ratings; rows for id -1 are NaN."""
+        ids = np.asarray(ids, dtype=np.int64)
+        cols = [self._column_index[c] for c in columns]
+        if not len(self):
+            # No row 0 to stand in for the unknown ids
+            return np.full((len(ids), len(cols)), np.nan)
+        out = np.asarray(self.values)[np.where(ids < 0, 0, ids)][:, cols]
+        out[ids < 0] = np.nan
+        return out
+
+    def lookup(self, team):
+        """One team's ratings as a dict (the project_game input shape)."""
+        row = np.asarray(self.values)[self.team_ids[team]]
+        return {c: float(row[i]) for c, i in self._column_index.items()}
+
+    def frame(self, names=None):
+        names = self.teams if names is None else list(names)
+        return pd.DataFrame(self.gather(self.ids(names)), index=pd.Index(names, name="team"), columns=STAT_COLUMNS)
+
+
+# ---------------- GAME FRAMES ----------------
+def attach_team_stats(games, store, overwrite=False):
+    """
+    Fills A_off / A_def / A_tempo / split columns (and the B_ side) on a
+    games frame from A_team / B_team with one gather per side. Existing
+    columns are kept unless `overwrite`.
+    """
+    games = games.copy()
+    for side in ("A", "B"):
+        values = store.gather(store.ids(games[f"{side}_team"].astype(str).tolist()))
+        for i, column in enumerate(STAT_COLUMNS):
+            name = f"{side}_{GAME_COLUMNS[column]}"
+            if overwrite or name not in games.columns:
+                games[name] = values[:, i]
+    return games
@@ -0,0 +1,222 @@
+import re
+import unicodedata
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from models.team_stats import TeamStatsStore
+
+
+UNRESOLVED_PATH = Path("data/unresolved_teams.csv")
+
+# ---------------- EXPLICIT ALIASES ----------------
+# Spellings (Odds API, ESPN, common short forms) -> Torvik name.
+# Mascots never need an entry: a known name followed by a mascot resolves.
+TEAM_ALIASES = {
+    "IUPUI": "IU Indy",
+    "IU Indianapolis": "IU Indy",
+    "Omaha": "Nebraska Omaha",
+    "Miami": "Miami FL",
+    "Sam Houston": "Sam Houston St.",
+    "UConn": "Connecticut",
+    "Ole Miss": "Mississippi",
+    "Pitt": "Pittsburgh",
+    "NC State": "N.C. State",
+    "UNC": "North Carolina",
+    "UMass": "Massachusetts",
+    "Southern Mississippi": "Southern Miss",
+    "Texas A&M-Corpus Christi": "Texas A&M Corpus Chris",
+    "Texas A&M-CC": "Texas A&M Corpus Chris",
+    "Texas A&M-Commerce": "East Texas A&M",
+    "UL Monroe": "Louisiana Monroe",
+    "UL Lafayette": "Louisiana",
+    "Louisiana-Lafayette": "Louisiana",
+    "CSUN": "Cal St. Northridge",
+    "CSU Northridge": "Cal St. Northridge",
+    "CSU Fullerton": "Cal St. Fullerton",
+    "CSU Bakersfield": "Cal St. Bakersfield",
+    "UT Martin": "Tennessee Martin",
+    "Fort Wayne": "Purdue Fort Wayne",
+    "App State": "Appalachian St.",
+    "Florida International": "FIU",
+    "Florida Int'l": "FIU",
+    "Miami (OH)": "Miami OH",
+    "Miami (FL)": "Miami FL",
+    "Long Island University": "LIU",
+    "Long Island": "LIU",
+    "UTRGV": "UT Rio Grande Valley",
+    "Grambling": "Grambling St.",
+    "Nicholls": "Nicholls St.",
+    "McNeese": "McNeese St.",
+    "SE Missouri St": "Southeast Missouri St.",
+    "SE Louisiana": "Southeastern Louisiana",
+    "Prairie View": "Prairie View A&M",
+    "College of Charleston": "Charleston",
+    "Loyola (Chi)": "Loyola Chicago",
+    "Texas Christian": "TCU",
+    "Brigham Young": "BYU",
+    "Southern California": "USC",
+    "Louisiana State": "LSU",
+    "Central Florida": "UCF",
+    "Virginia Commonwealth": "VCU",
+    "Southern Methodist": "SMU",
+    "UAlbany": "Albany",
+    "Kansas City": "UMKC",
+    "UIC": "Illinois Chicago",
+    "Arkansas-Little Rock": "Little Rock",
+}
+
+_WORDS = {
+    "state": "st",
+    "saint": "st",
+    "univ": "university",
+}
+
+
+def team_key(name):
+    """
+    Spelling-insensitive key: ASCII, lower case, punctuation dropped,
+    "State"/"St."/"Saint" -> "st", "&" -> "and".
+    """
+    name = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode()
+    name = name.lower().replace("'", "").replace("&", " and ")
+    words = re.sub(r"[^a-z0-9]+", " ", name).split()
+    return " ".join(_WORDS.get(w, w) for w in words)
+
+
+# ---------------- MASCOTS ----------------
+# The only words a name may carry after a known team ("Duke Blue Devils").
+# Anything else is unresolved rather than matched to a shorter name
+# ("Florida Int'l Golden Panthers" must not become Florida).
+MASCOTS = frozenset(team_key(m) for m in """
+    49ers, Aggies, Anteaters, Antelopes, Aztecs, Badgers, Beach, Beacons, Bearcats,
+    Bearkats, Bears, Beavers, Bengals, Big Green, Big Red, Billikens, Bison, Bisons,
+    Black Bears, Black Knights, Blazers, Blue Demons, Blue Devils, Blue Hens, Blue Hose,
+    Blue Raiders, Bluejays, Bobcats, Boilermakers, Bonnies, Braves, Broncos, Broncs,
+    Bruins, Buccaneers, Buckeyes, Buffaloes, Bulldogs, Bulls, Camels, Cardinal, Cardinals,
+    Catamounts, Cavaliers, Chanticleers, Chargers, Chippewas, Colonels, Colonials,
+    Commodores, Cornhuskers, Cougars, Cowboys, Coyotes, Crimson, Crimson Tide, Crusaders,
+    Cyclones, Delta Devils, Demon Deacons, Demons, Dolphins, Dons, Dragons, Ducks, Dukes,
+    Eagles, Explorers, Falcons, Fighting Camels, Fighting Hawks, Fighting Illini,
+    Fighting Irish, Flames, Flyers, Friars, Gaels, Gamecocks, Gators, Gauchos,
+    Golden Bears, Golden Eagles, Golden Flashes, Golden Gophers, Golden Griffins,
+    Golden Grizzlies, Golden Hurricane, Golden Lions, Golden Panthers, Governors,
+    Great Danes, Green Wave, Greyhounds, Griffins, Grizzlies, Hatters, Hawkeyes, Hawks,
+    Highlanders, Hilltoppers, Hokies, Hoosiers, Horned Frogs, Hornets, Hoyas, Hurricanes,
+    Huskies, Islanders, Jackrabbits, Jaguars, Jaspers, Jayhawks, Keydets, Knights,
+    Lakers, Lancers, Leathernecks, Leopards, Lions, Lobos, Longhorns, Lopes, Lumberjacks,
+    Mastodons, Matadors, Mavericks, Mean Green, Midshipmen, Miners, Minutemen, Mocs,
+    Monarchs, Mountain Hawks, Mountaineers, Musketeers, Mustangs, Nittany Lions, Norse,
+    Orange, Ospreys, Owls, Paladins, Panthers, Patriots, Peacocks, Penguins, Phoenix,
+    Pilots, Pioneers, Pirates, Pride, Privateers, Purple Aces, Purple Eagles, Quakers,
+    Racers, Ragin' Cajuns, Raiders, Rainbow Warriors, Ramblers, Rams, Rattlers,
+    Razorbacks, Rebels, Red Flash, Red Foxes, Red Hawks, Red Raiders, Red Storm,
+    Red Wolves, Redbirds, RedHawks, Retrievers, Revolutionaries, River Hawks, Roadrunners,
+    Rockets, Roos, Royals, Runnin' Bulldogs, Runnin' Rebels, Saints, Salukis,
+    Scarlet Knights, Screaming Eagles, Seahawks, Seawolves, Seminoles, Sharks, Shockers,
+    Skyhawks, Sooners, Spartans, Spiders, Stags, Sun Devils, Sycamores, Tar Heels,
+    Terrapins, Terriers, Texans, Thunderbirds, Thundering Herd, Tigers, Titans, Tommies,
+    Toreros, Trailblazers, Tribe, Tritons, Trojans, Utes, Vandals, Vaqueros, Vikings,
+    Volunteers, Warhawks, Warriors, Waves, Wildcats, Wolf Pack, Wolfpack, Wolverines,
+    Wolves, Yellow Jackets, Zips
+""".split(","))
+
+
+class TeamResolver:
+    """
+    Resolves any spelling of a team to its TeamStatsStore id.
+
+    The key index is built once from the store's Torvik names plus
+    TEAM_ALIASES. A name resolves to its longest word prefix present in
+    the index when the words after it are a known mascot (so "Toledo
+    Rockets" -> "Toledo", but "Florida Int'l" is not "Florida"), and
+    every raw name is memoized, so repeat lookups are a single dict
+    hit. Names that fail are counted in `unresolved`.
+    """
+
+    def __init__(self, teams, aliases=TEAM_ALIASES):
+        self.teams = list(teams)
+        self.index = {team_key(team): i for i, team in enumerate(self.teams)}
+
+        for alias, team in aliases.items():
+            key = team_key(team)
+            if key in self.index:
+                self.index.setdefault(team_key(alias), self.index[key])
+
+        self._cache = {}
+        self.unresolved = Counter()
+
+    @classmethod
+    def from_store(cls, store=None):
+        return cls((store if store is not None else TeamStatsStore.open()).teams)
+
+    # ---------------- SINGLE NAMES ----------------
+    def resolve_id(self, name):
+        """Team id for `name`, or -1."""
+        team_id = self._cache.get(name)
+        if team_id is None:
+            team_id = self._lookup(name)
+            self._cache[name] = team_id
+            if team_id < 0 and name:
+                self.unresolved[name] += 1
+        return team_id
+
+    def resolve(self, name):
+        """Canonical (Torvik) name for `name`, or None."""
+        team_id = self.resolve_id(name)
+        return self.teams[team_id] if team_id >= 0 else None
+
+    def _lookup(self, name):
+        words = team_key(name).split()
+        for i in range(len(words), 0, -1):
+            team_id = self.index.get(" ".join(words[:i]))
+            if team_id is not None and (i == len(words) or " ".join(words[i:]) in MASCOTS):
+                return team_id
+        return -1
+
+    # ---------------- BULK ----------------
+    def resolve_ids(self, names):
+        """Team ids for a whole column; each distinct name is resolved once."""
+        codes, uniques = pd.factorize(pd.Series(names, dtype=object).fillna(""))
+        unique_ids = np.fromiter((self.resolve_id(n) for n in uniques), dtype=np.int64, count=len(uniques))
+        return unique_ids[codes] if len(codes) else np.empty(0, dtype=np.int64)
+
+    def resolve_names(self, names):
+        """Canonical names for a whole column; None where unresolved."""
+        ids = self.resolve_ids(names)
+        teams = np.array(self.teams + [None], dtype=object)
+        return teams[np.where(ids < 0, len(self.teams), ids)]
+
+    # ---------------- REPORTING ----------------
+    def report_unresolved(self, path=UNRESOLVED_PATH):
+        """
+        Merges unresolved names into `path` (count = runs they showed up
+        in) so they can be added to TEAM_ALIASES. Returns the names
+        reported this call.
+        """
+        if not self.unresolved:
+            return []
+
+        report = pd.DataFrame(sorted(self.unresolved.items()), columns=["name", "count"])
+        if Path(path).exists():
+            existing = pd.read_csv(path)
+            report = pd.concat([existing, report]).groupby("name", as_index=False)["count"].sum()
+        report.to_csv(path, index=False)
+
+        names = sorted(self.unresolved)
+        print(f"⚠️ {len(names)} unresolved team names → {path}")
+        self.unresolved.clear()
+        return names
+
+
+_RESOLVER = None
+
+
+def get_resolver():
+    """Process-wide resolver over the current team stats store."""
+    global _RESOLVER
+    if _RESOLVER is None:
+        _RESOLVER = TeamResolver.from_store()
+    return _RESOLVER
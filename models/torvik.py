@@ -0,0 +1,125 @@
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from models.team_stats import STAT_COLUMNS, TeamStatsStore
+
+
+# ---------------- CONFIG ----------------
+RAW_CSV = Path("data/torvik_raw.csv")
+HOME_CSV = Path("data/torvik_home.csv")
+AWAY_CSV = Path("data/torvik_away.csv")
+CACHE_PATH = Path("data/cache/torvik_stats.bin")
+
+# Known Torvik column positions for exports without a header row
+TORVIK_POSITIONS = {"team": 0, "adjoe": 1, "adjde": 2, "adjt": 3}
+HEADER_NAMES = {"team", "adjoe", "adjde", "adjt"}
+
+# split -> (Torvik column, team_stats column)
+SPLIT_COLUMNS = {
+    "raw": [("adjoe", "off_eff"), ("adjde", "def_eff"), ("adjt", "tempo")],
+    "home": [("adjoe", "off_eff_home"), ("adjde", "def_eff_home")],
+    "away": [("adjoe", "off_eff_away"), ("adjde", "def_eff_away")],
+}
+
+
+def has_header(path):
+    """
+    True when the first non-blank line is a header row: it names one of
+    the Torvik columns instead of starting with a team.
+    """
+    with open(path, "rb") as f:
+        head = f.read(4096).decode("utf-8", "ignore")
+    for line in head.splitlines():
+        if line.strip():
+            fields = {f.strip().strip('"').lower() for f in line.split(",")}
+            return bool(fields & HEADER_NAMES)
+    return False
+
+
+def read_torvik(path, columns=("adjoe", "adjde", "adjt")):
+    """
+    Reads only `team` + `columns` from a Torvik export, with or without a
+    header row, in a single parse with explicit dtypes.
+    """
+    wanted = ["team", *columns]
+    dtypes = {c: "float64" for c in columns}
+    dtypes["team"] = str
+
+    if has_header(path):
+        df = pd.read_csv(path, usecols=lambda c: c.strip().lower() in wanted)
+        df.columns = df.columns.str.strip().str.lower()
+        df = df.astype(dtypes)
+    else:
+        positions = sorted((TORVIK_POSITIONS[c], c) for c in wanted)
+        df = pd.read_csv(
+            path,
+            header=None,
+            usecols=[p for p, _ in positions],
+            names=[c for _, c in positions],
+            dtype=dtypes,
+        )
+
+    missing = set(wanted) - set(df.columns)
+    if missing:
+        raise ValueError(
+            f"Missing required Torvik columns {missing} in {path}. "
+            f"Columns found: {list(df.columns)}"
+        )
+
+    df["team"] = df["team"].str.strip()
+    return df[wanted]
+
+
+def _sha256(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def build_team_stats(raw_csv=RAW_CSV, home_csv=HOME_CSV, away_csv=AWAY_CSV):
+    """
+    Overall ratings plus home / away splits as a TeamStatsStore. Teams
+    come from the raw file; each split is scattered into the one
+    (teams x STAT_COLUMNS) matrix by team id, so no merges are needed.
+    Teams missing from a split keep NaN there.
+    """
+    paths = {"raw": raw_csv, "home": home_csv, "away": away_csv}
+    raw = read_torvik(raw_csv, [c for c, _ in SPLIT_COLUMNS["raw"]])
+
+    teams = raw["team"].tolist()
+    team_ids = {team: i for i, team in enumerate(teams)}
+    values = np.full((len(teams), len(STAT_COLUMNS)), np.nan)
+    column_index = {c: i for i, c in enumerate(STAT_COLUMNS)}
+
+    for split, columns in SPLIT_COLUMNS.items():
+        df = raw if split == "raw" else read_torvik(paths[split], [c for c, _ in columns])
+        ids = df["team"].map(team_ids).to_numpy(dtype=float)
+        known = ~np.isnan(ids)
+        rows = ids[known].astype(np.int64)
+        for torvik, stat in columns:
+            values[rows, column_index[stat]] = df[torvik].to_numpy()[known]
+
+    source = {"torvik": {split: {"path": str(p), "sha256": _sha256(p)} for split, p in paths.items()}}
+    return TeamStatsStore(teams, values, STAT_COLUMNS, source)
+
+
+def load_team_stats(raw_csv=RAW_CSV, home_csv=HOME_CSV, away_csv=AWAY_CSV, cache_path=CACHE_PATH):
+    """
+    build_team_stats, cached in the binary store format under
+    `cache_path` and keyed by the sha256 of the three source files:
+    unchanged exports are memory-mapped instead of parsed.
+    """
+    paths = {"raw": raw_csv, "home": home_csv, "away": away_csv}
+    cache_path = Path(cache_path)
+    if cache_path.exists():
+        cached = TeamStatsStore.load(cache_path)
+        hashes = {split: _sha256(p) for split, p in paths.items()}
+        source = (cached.source or {}).get("torvik", {})
+        if {split: s.get("sha256") for split, s in source.items()} == hashes:
+            return cached
+
+    store = build_team_stats(raw_csv, home_csv, away_csv)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    store.save(cache_path)
+    return store
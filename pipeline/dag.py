@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import pandas as pd
+
+from pipeline.trace import span
+
+
+STATE_PATH = Path("data/pipeline_state.json")
+
+
+# ---------------- HASHING ----------------
+def file_hash(path):
+    """sha256 of a file's bytes; None when it does not exist."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def value_hash(value):
+    """
+    Content hash of a stage result. DataFrames hash their cells; other
+    results are identified by their output files only.
+    """
+    digest = hashlib.sha256()
+    if isinstance(value, pd.DataFrame):
+        digest.update(json.dumps([str(c) for c in value.columns]).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _combine(*parts):
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+# ---------------- STAGES ----------------
+class Stage:
+    """
+    One pipeline step.
+
+    `func` is called with the results of `deps` as keyword arguments and
+    returns this stage's result, which is handed to downstream stages in
+    memory. `inputs` / `outputs` are the files it reads / writes. `load`
+    rebuilds the result from the outputs when the stage was skipped and
+    a downstream stage needs it. `always` stages (network fetches) run
+    every time, but downstream stages still skip when their result hash
+    is unchanged.
+    """
+
+    def __init__(self, name, func, deps=(), inputs=(), outputs=(), load=None, always=False):
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.inputs = [Path(p) for p in inputs]
+        self.outputs = [Path(p) for p in outputs]
+        self.load = load
+        self.always = always
+
+
+class Pipeline:
+    """
+    In-process DAG runner.
+
+    Stages start as soon as their dependencies finish, on a thread pool,
+    so independent stages (e.g. a network fetch and a CSV rebuild)
+    overlap. Each stage is keyed by the content hash of its input files
+    and its dependencies' results; when the key matches the last
+    successful run and its outputs are still there, the stage is
+    skipped. Keys are kept in a small JSON state file.
+    """
+
+    def __init__(self, stages=(), state_path=STATE_PATH, workers=4):
+        self.stages = {}
+        self.state_path = Path(state_path)
+        self.workers = workers
+        for stage in stages:
+            self.add(stage)
+
+    def add(self, stage):
+        missing = [d for d in stage.deps if d not in self.stages]
+        if missing:
+            raise ValueError(f"Stage {stage.name} depends on unknown stages {missing}")
+        self.stages[stage.name] = stage
+        return stage
+
+    # ---------------- STATE ----------------
+    def _load_state(self):
+        try:
+            return json.loads(self.state_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_state(self, state):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, indent=2))
+        os.replace(tmp, self.state_path)
+
+    # ---------------- RUN ----------------
+    def _key(self, stage, fingerprints):
+        return _combine(
+            stage.name,
+            {str(p): file_hash(p) for p in stage.inputs},
+            {d: fingerprints[d] for d in stage.deps},
+        )
+
+    def _fingerprint(self, stage, result):
+        return _combine(value_hash(result), {str(p): file_hash(p) for p in stage.outputs})
+
+    def _execute(self, stage, results):
+        kwargs = {}
+        for dep in stage.deps:
+            if dep not in results:
+                loader = self.stages[dep].load
+                results[dep] = loader() if loader else None
+            kwargs[dep] = results[dep]
+        start = time.perf_counter()
+        with span(f"stage.{stage.name}") as s:
+            result = stage.func(**kwargs)
+            if isinstance(result, pd.DataFrame):
+                s.count("rows", len(result))
+        return result, time.perf_counter() - start
+
+    def run(self, force=False, only=None):
+        """
+        Runs the DAG (or just `only` and its dependencies). Returns a
+        dict of stage name -> "ran" / "skipped"; results are kept in
+        `self.results`.
+        """
+        names = self._closure(only) if only else list(self.stages)
+        state = self._load_state()
+        self.results = {}
+        fingerprints, status = {}, {}
+        pending = set(names)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while pending or running:
+                for name in [n for n in names if n in pending]:
+                    stage = self.stages[name]
+                    if any(d not in fingerprints for d in stage.deps):
+                        continue
+                    pending.discard(name)
+
+                    key = self._key(stage, fingerprints)
+                    previous = state.get(name, {})
+                    fresh = (
+                        not force and not stage.always
+                        and previous.get("key") == key
+                        and all(p.exists() for p in stage.outputs)
+                    )
+                    if fresh:
+                        fingerprints[name] = previous["fingerprint"]
+                        status[name] = "skipped"
+                        print(f"⏭️ {name}: inputs unchanged, skipped")
+                        continue
+
+                    print(f"\n--- {name} ---")
+                    running[pool.submit(self._execute, stage, self.results)] = (name, key)
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, key = running.pop(future)
+                    try:
+                        result, seconds = future.result()
+                    except Exception:
+                        print(f"❌ Failed at step: {name}")
+                        for other in running:
+                            other.cancel()
+                        raise
+
+                    stage = self.stages[name]
+                    self.results[name] = result
+                    fingerprints[name] = self._fingerprint(stage, result)
+                    status[name] = "ran"
+                    state[name] = {"key": key, "fingerprint": fingerprints[name], "seconds": round(seconds, 3)}
+                    self._save_state(state)
+
+        return status
+
+    def _closure(self, only):
+        only = [only] if isinstance(only, str) else list(only)
+        seen = []
+
+        def visit(name):
+            if name in seen:
+                return
+            for dep in self.stages[name].deps:
+                visit(dep)
+            seen.append(name)
+
+        for name in only:
+            visit(name)
+        return seen
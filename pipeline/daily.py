@@ -0,0 +1,71 @@
+import pandas as pd
+
+from fetch_games import GAMES_PATH, build_today_games, fetch_odds_board
+from ledger.store import CSV_PATH, DB_PATH, open_ledger
+from models.fit import params_path
+from models.team_stats import STATS_CSV, TeamStatsStore
+from pipeline.dag import Pipeline, Stage
+from pipeline.trace import span
+from run_daily import generate_daily_picks
+from scripts.update_team_stats import AWAY_CSV, HOME_CSV, RAW_CSV, update_team_stats
+
+PICKS_PATH = "data/daily_picks.csv"
+
+
+# ---------------- STAGES ----------------
+def team_stats_stage():
+    update_team_stats()
+    return TeamStatsStore.open()
+
+
+def games_stage(odds, team_stats):
+    games = build_today_games(odds, team_stats)
+    with span("csv.write", path=GAMES_PATH):
+        games.to_csv(GAMES_PATH, index=False)
+    print(f"✅ Wrote {len(games)} games scheduled for TODAY only")
+    return games
+
+
+def picks_stage(games, team_stats):
+    picks = generate_daily_picks(GAMES_PATH, PICKS_PATH, games=games, team_stats=team_stats)
+    print(f"✅ {len(picks)} picks → {PICKS_PATH}")
+    return picks
+
+
+def ledger_csv_stage():
+    with open_ledger() as ledger:
+        n = ledger.export_csv()
+    print(f"✅ Exported {n} bets → {CSV_PATH}")
+
+
+def daily_pipeline(**kwargs):
+    """
+    Team stats -> today's games -> daily picks. The odds poll and the
+    Torvik rebuild are independent and run side by side; games and
+    picks skip when neither the board nor the ratings changed (picks
+    also rerun after a new model fit). ledger_csv snapshots the bet
+    ledger to bet_results.csv when the database has changed.
+    """
+    return Pipeline([
+        Stage(
+            "team_stats", team_stats_stage,
+            inputs=[RAW_CSV, HOME_CSV, AWAY_CSV],
+            outputs=[STATS_CSV],
+            load=TeamStatsStore.open,
+        ),
+        Stage("odds", fetch_odds_board, always=True),
+        Stage(
+            "games", games_stage,
+            deps=["odds", "team_stats"],
+            outputs=[GAMES_PATH],
+            load=lambda: pd.read_csv(GAMES_PATH),
+        ),
+        Stage(
+            "picks", picks_stage,
+            deps=["games", "team_stats"],
+            inputs=[p for p in [params_path()] if p],
+            outputs=[PICKS_PATH],
+            load=lambda: pd.read_csv(PICKS_PATH),
+        ),
+        Stage("ledger_csv", ledger_csv_stage, inputs=[DB_PATH], outputs=[CSV_PATH]),
+    ], **kwargs)
@@ -0,0 +1,236 @@
+import atexit
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from functools import wraps
+from pathlib import Path
+
+
+# ---------------- CONFIG ----------------
+# NCAAB_TRACE=1 turns tracing on (NCAAB_TRACE=time skips tracemalloc)
+TRACE_ENV = "NCAAB_TRACE"
+TRACE_DIR = Path(os.getenv("NCAAB_TRACE_DIR", "data/traces"))
+TRACE_PATH = TRACE_DIR / "trace.jsonl"
+METRICS_PATH = TRACE_DIR / "ncaab.prom"
+
+MODE = os.getenv(TRACE_ENV, "").strip().lower()
+ENABLED = MODE not in ("", "0", "false", "off")
+TRACE_MEMORY = ENABLED and MODE != "time"
+
+
+class _NullSpan:
+    # Shared no-op span: tracing off costs one attribute lookup per call
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def count(self, name, n=1):
+        pass
+
+
+_NULL = _NullSpan()
+
+
+class Span:
+    """
+    One timed step. Nested spans get "/"-joined names (stage/games/http.fetch).
+
+    `peak_bytes` is the tracemalloc peak above the memory in use when the
+    span started. tracemalloc is process-wide, so spans open at the same
+    time on other threads share their peaks; a span resetting the peak
+    first credits it to every open span.
+    """
+
+    def __init__(self, name, parent, attrs):
+        self.name = f"{parent.name}/{name}" if parent else name
+        self.parent = parent
+        self.attrs = attrs
+        self.counts = {}
+        self.peak_seen = 0
+
+    def count(self, name, n=1):
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def __enter__(self):
+        _local.stack.append(self)
+        if TRACE_MEMORY:
+            with _lock:
+                self.start_bytes, peak = tracemalloc.get_traced_memory()
+                for other in _open:
+                    other.peak_seen = max(other.peak_seen, peak)
+                tracemalloc.reset_peak()
+                _open.add(self)
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self._t0
+        _local.stack.pop()
+        event = {
+            "run": RUN_ID,
+            "span": self.name,
+            "start": round(self.started, 6),
+            "seconds": round(seconds, 6),
+            "thread": threading.current_thread().name,
+            "ok": exc_type is None,
+        }
+        if TRACE_MEMORY:
+            with _lock:
+                _open.discard(self)
+                peak = max(tracemalloc.get_traced_memory()[1], self.peak_seen)
+            event["peak_bytes"] = max(peak - self.start_bytes, 0)
+        if self.counts:
+            event["counts"] = self.counts
+        if self.attrs:
+            event["attrs"] = self.attrs
+        _record(event)
+        return False
+
+
+# ---------------- STATE ----------------
+RUN_ID = uuid.uuid4().hex[:12]
+
+_lock = threading.Lock()
+_events = []
+_counters = {}
+_flushed = 0
+_open = set()
+
+
+class _Local(threading.local):
+    def __init__(self):
+        self.stack = []
+
+
+_local = _Local()
+
+
+def _record(event):
+    with _lock:
+        _events.append(event)
+
+
+# ---------------- API ----------------
+def span(name, **attrs):
+    """
+    Context manager timing one step:
+
+        with span("http.fetch", host=host) as s:
+            ...
+            s.count("rows", len(df))
+
+    A no-op unless NCAAB_TRACE is set.
+    """
+    if not ENABLED:
+        return _NULL
+    stack = _local.stack
+    return Span(name, stack[-1] if stack else None, attrs)
+
+
+def traced(name=None):
+    """Decorator form of span(), named after the function by default."""
+    def decorate(func):
+        if not ENABLED:
+            return func
+        label = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, n=1, **labels):
+    """
+    Adds `n` to a run-wide counter (rows, api_calls, ...) and to the
+    innermost open span's counts.
+    """
+    if not ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + n
+    if _local.stack:
+        _local.stack[-1].count(name, n)
+
+
+# ---------------- OUTPUT ----------------
+def _label_text(labels):
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"') for _, v in labels)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+
+def prometheus_text(events, counters):
+    """
+    Prometheus textfile exposition of one run: per-span total seconds,
+    call count and worst peak memory, plus every counter.
+    """
+    spans = {}
+    for event in events:
+        totals = spans.setdefault(event["span"], {"seconds": 0.0, "calls": 0, "peak": 0})
+        totals["seconds"] += event["seconds"]
+        totals["calls"] += 1
+        totals["peak"] = max(totals["peak"], event.get("peak_bytes", 0))
+
+    lines = [
+        "# HELP ncaab_span_seconds Wall time spent in a span during the last run.",
+        "# TYPE ncaab_span_seconds gauge",
+    ]
+    lines += [f'ncaab_span_seconds{{span="{s}"}} {t["seconds"]:.6f}' for s, t in sorted(spans.items())]
+    lines += ["# HELP ncaab_span_calls Times a span was entered during the last run.", "# TYPE ncaab_span_calls gauge"]
+    lines += [f'ncaab_span_calls{{span="{s}"}} {t["calls"]}' for s, t in sorted(spans.items())]
+    if TRACE_MEMORY:
+        lines += ["# HELP ncaab_span_peak_bytes Peak traced memory above a span's start.", "# TYPE ncaab_span_peak_bytes gauge"]
+        lines += [f'ncaab_span_peak_bytes{{span="{s}"}} {t["peak"]}' for s, t in sorted(spans.items())]
+
+    for name in sorted({n for n, _ in counters}):
+        lines += [f"# TYPE ncaab_{name} gauge"]
+        lines += [f"ncaab_{name}{_label_text(l)} {v}" for (n, l), v in sorted(counters.items()) if n == name]
+
+    lines.append(f"ncaab_last_run_timestamp_seconds {time.time():.0f}")
+    return "\n".join(lines) + "\n"
+
+
+def flush():
+    """
+    Appends the spans finished since the last flush (and the counters so
+    far) to the JSON-lines trace and rewrites the Prometheus textfile for
+    the whole run, atomically for node_exporter's textfile collector.
+    Runs at exit when tracing is on.
+    """
+    global _flushed
+    with _lock:
+        events, counters = list(_events), dict(_counters)
+        new_events, _flushed = events[_flushed:], len(events)
+    if not new_events and not counters:
+        return
+
+    TRACE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(TRACE_PATH, "a") as f:
+        for event in new_events:
+            f.write(json.dumps(event) + "\n")
+        if counters:
+            f.write(json.dumps({
+                "run": RUN_ID,
+                "counters": [{"name": n, **dict(l), "value": v} for (n, l), v in sorted(counters.items())],
+            }) + "\n")
+
+    tmp = METRICS_PATH.with_suffix(".tmp")
+    tmp.write_text(prometheus_text(events, counters))
+    os.replace(tmp, METRICS_PATH)
+
+
+if ENABLED:
+    if TRACE_MEMORY and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    atexit.register(flush)
@@ -1,13 +1,9 @@
 TEST_MODE = False
-import subprocess
 import sys
+import traceback
 
-def run_step(cmd, label):
-    print(f"\n--- {label} ---")
-    result = subprocess.run(cmd, shell=True)
-    if result.returncode != 0:
-        print(f"❌ Failed at step: {label}")
-        sys.exit(1)
+from pipeline.daily import daily_pipeline
+from pipeline.trace import span
 
 if __name__ == "__main__":
 
@@ -17,9 +13,13 @@ if __name__ == "__main__":
     # - torvik_home.csv
     # - torvik_away.csv
 
-    run_step("python3 scripts/update_team_stats.py", "Updating team stats from Torvik CSVs")
-    run_step("python3 fetch_games.py", "Fetching games & odds")
-    run_step("python3 run_daily.py", "Generating daily picks")
+    # Stages run in-process; unchanged inputs skip their stage
+    try:
+        with span("run_all"):
+            daily_pipeline().run(force="--force" in sys.argv)
+    except Exception:
+        traceback.print_exc()
+        sys.exit(1)
 
     print("\n✅ Daily run complete.")
     print("📄 Check: data/daily_picks.csv")
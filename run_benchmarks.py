@@ -0,0 +1,44 @@
+import argparse
+import sys
+
+from benchmarks.harness import REPEAT, TOLERANCE, baseline_machine, compare, machine, record_baselines, run_benchmarks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the pipeline on a synthetic league")
+    parser.add_argument("--scale", type=int, default=1, help="seasons of games (1, 10, 100)")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--only", nargs="*", help="benchmark names to run")
+    parser.add_argument("--record", action="store_true", help="store these timings as the baselines")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    print(f"RUN_BENCHMARKS scale={args.scale} repeat={args.repeat}")
+    results = run_benchmarks(scale=args.scale, repeat=args.repeat, only=args.only)
+
+    if args.record:
+        record_baselines(results, args.scale)
+        print(f"✅ Recorded {len(results)} baselines for scale={args.scale}")
+        return 0
+
+    report = compare(results, args.scale, tolerance=args.tolerance)
+    print(report.round(4).to_string(index=False))
+
+    # Timings from another machine are not comparable: report, don't fail
+    recorded_on = baseline_machine(args.scale)
+    if recorded_on and recorded_on != machine():
+        print(f"⚠️ Baselines were recorded on {recorded_on}, not {machine()}; regressions not checked")
+        return 0
+
+    regressed = report[report["regressed"]]
+    if not regressed.empty:
+        print(f"❌ {len(regressed)} regression(s): {', '.join(regressed['benchmark'])}")
+        return 1
+    if report["baseline"].isna().any():
+        print("⚠️ No baseline for some benchmarks (run with --record)")
+    print("✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,9 +3,13 @@ import numpy as np
 from datetime import date
 from pandas.errors import EmptyDataError
 
-from models.projections import project_game
-from betting.value import spread_value, total_value
-from betting.moneyline import kelly_lite_bet
+from models.fit import load_params
+from models.projections import project_games
+from models.team_stats import TeamStatsStore, attach_team_stats
+from betting.value import spread_value, total_value, units_from_confidence
+from betting.moneyline import implied_probability, is_plus_ev, payout_from_odds
+from betting.kelly import kelly_stakes
+from pipeline.trace import count, span
 
 
 # ---------------- WHY THIS BET ----------------
@@ -31,10 +35,39 @@ def build_reason(teamA, teamB):
     return ", ".join(reasons)
 
 
+def build_reasons(df):
+    """
+    Column-wise build_reason for a slate in the daily_games.csv layout.
+    """
+    off_edge = (df["A_off"] - df["B_def"]).to_numpy(dtype=float)
+    def_edge = (df["B_off"] - df["A_def"]).to_numpy(dtype=float)
+    tempo_diff = (df["A_tempo"] - df["B_tempo"]).to_numpy(dtype=float)
+
+    off_text = np.full(len(df), "", dtype=object)
+    off_mask = off_edge > 5
+    off_text[off_mask] = [f"+{e:.1f} offensive efficiency edge" for e in off_edge[off_mask]]
+
+    pieces = [
+        (off_mask, off_text),
+        (def_edge < -5, "strong defensive matchup"),
+        (np.abs(tempo_diff) > 3, np.where(
+            tempo_diff < 0, "slower projected tempo", "faster projected tempo"
+        )),
+    ]
+
+    reasons = pd.Series("", index=df.index, dtype=object)
+    for mask, text in pieces:
+        sep = np.where(reasons != "", ", ", "")
+        reasons = reasons.where(~mask, reasons + sep + text)
+
+    return reasons.where(reasons != "", "overall efficiency edge")
+
+
 # ---------------- CONFIG ----------------
 BANKROLL = 500.0
 MAX_DAILY_RISK_PCT = 0.10      # $50 max daily risk
 UNIT = 10.0                   # 1U = $10 TO WIN
+MIN_UNITS = 0.1               # Kelly stakes below this are dropped
 
 
 # ---------------- OUTPUT SCHEMA ----------------
@@ -54,177 +87,208 @@ PICK_COLUMNS = [
 
 
 # ---------------- STAKE FROM TO-WIN ----------------
-def stake_from_to_win(to_win: float, odds: int) -> float:
-    if odds < 0:
-        return to_win * (abs(odds) / 100)
-    return to_win * (100 / odds)
+def stake_from_to_win(to_win, odds):
+    odds = np.asarray(odds, dtype=float)
+    stake = np.where(odds < 0, to_win * (np.abs(odds) / 100), to_win * (100 / odds))
+    return stake if stake.ndim else float(stake)
+
+
+# ---------------- CANDIDATES ----------------
+def _line_column(df, name, fallback):
+    # Best-number columns from fetch_games; older slates only have the consensus line
+    if name not in df.columns:
+        return np.asarray(fallback, dtype=float)
+    values = df[name].to_numpy(dtype=float)
+    return np.where(np.isnan(values), fallback, values)
+
+
+def _line_text(values):
+    return pd.Series(values).astype(str).to_numpy()
+
+
+def _market_candidates(df, model_spread, model_total, win_prob):
+    """
+    One long table of every spread / total / moneyline candidate with
+    value, ordered game by game like the daily card.
+
+    The side is picked against the consensus line, then priced at the
+    best number available for that side (spread_A_line / over_line /
+    ... from fetch_games) when the slate has it.
+    """
+    n = len(df)
+    spread_line = df["spread_line"].to_numpy(dtype=float)
+    total_line = df["total_line"].to_numpy(dtype=float)
+    A_team = df["A_team"].astype(str).to_numpy()
+    B_team = df["B_team"].astype(str).to_numpy()
+
+    # ---------- SPREAD ----------
+    # Lines are handicaps (A -5.5 = A gives 5.5): A covers when margin + line > 0.
+    # B's number is expressed from A's side (-B line) so edges compare like for like
+    take_A = model_spread + spread_line > 0
+    A_line = _line_column(df, "spread_A_line", spread_line)
+    B_line = _line_column(df, "spread_B_line", -spread_line)
+    best_spread = np.where(take_A, A_line, -B_line)
+    spread = pd.DataFrame({
+        "row": np.arange(n),
+        "order": 0,
+        "market": "Spread",
+        "selection": np.where(
+            take_A,
+            A_team + " " + _line_text(A_line),
+            B_team + " " + _line_text(B_line),
+        ),
+        "side": np.where(take_A, "A", "B"),
+        "line": np.where(take_A, A_line, B_line),
+        "odds": np.where(take_A, _line_column(df, "spread_A_odds", -110.0), _line_column(df, "spread_B_odds", -110.0)),
+        "edge": np.abs(model_spread + best_spread),
+        "edge_group": "points",
+        "value": spread_value(model_spread, -best_spread),
+    })
+
+    # ---------- TOTAL ----------
+    take_over = model_total > total_line
+    best_total = np.where(take_over, _line_column(df, "over_line", total_line), _line_column(df, "under_line", total_line))
+    total = pd.DataFrame({
+        "row": np.arange(n),
+        "order": 1,
+        "market": "Total",
+        "selection": np.where(take_over, "Over ", "Under ") + _line_text(best_total),
+        "side": np.where(take_over, "over", "under"),
+        "line": best_total,
+        "odds": np.where(take_over, _line_column(df, "over_odds", -110.0), _line_column(df, "under_odds", -110.0)),
+        "edge": np.abs(model_total - best_total),
+        "edge_group": "points",
+        "value": total_value(model_total, best_total),
+    })
+
+    frames = [spread, total]
+
+    # ---------- MONEYLINE (home side, priced from ml_odds = best home price) ----------
+    if "ml_odds" in df.columns:
+        ml_odds = df["ml_odds"].to_numpy(dtype=float)
+        priced = ~np.isnan(ml_odds)
+        frames.append(pd.DataFrame({
+            "row": np.arange(n),
+            "order": 2,
+            "market": "Moneyline",
+            "selection": A_team + " ML",
+            "side": "ml",
+            "line": np.nan,
+            "odds": ml_odds,
+            "edge": win_prob - implied_probability(ml_odds),
+            "edge_group": "probability",
+            "value": priced & is_plus_ev(win_prob, ml_odds),
+        }))
+
+    candidates = pd.concat(frames, ignore_index=True)
+    return candidates[candidates["value"]].sort_values(["row", "order"], kind="stable")
+
+
+# ---------------- PICK ENGINE ----------------
+def _kelly_stakes(candidates, model_spread, model_total, max_daily_risk):
+    # Each date's card is sized as one portfolio under its own risk cap
+    stakes = pd.Series(0.0, index=candidates.index)
+    for _, card in candidates.groupby("date", sort=False):
+        stakes[card.index] = kelly_stakes(
+            card["side"], card["line"], card["odds"], card["row"],
+            model_spread, model_total, BANKROLL, max_daily_risk,
+        )
+    return stakes
 
 
-# ---------------- MAIN FUNCTION ----------------
-def generate_daily_picks(input_csv, output_csv):
+def build_picks(df, today=None, sizing="kelly", params=None):
+    """
+    Projects the slate once and returns the daily card as a DataFrame.
 
-    try:
-        df = pd.read_csv(input_csv)
-    except (FileNotFoundError, EmptyDataError):
-        pd.DataFrame(columns=PICK_COLUMNS).to_csv(output_csv, index=False)
-        return
+    Edge, confidence (edge / median edge of its group), units, stake and
+    reason are computed column-wise. When `df` has a `date` column each
+    date is its own card: medians and the MAX_DAILY_RISK_PCT cap are
+    applied per date.
 
+    sizing="kelly" stakes every value bet on a date together (betting.kelly:
+    fractional Kelly on simulated results, same-game bets correlated, total
+    risk capped). sizing="tiers" is the fixed confidence-tier units with the
+    cap as a cumulative-sum cutoff in card order. `params` are the model
+    coefficients (models.fit.load_params()); DEFAULT_PARAMS when omitted.
+    """
     if df.empty:
-        pd.DataFrame(columns=PICK_COLUMNS).to_csv(output_csv, index=False)
-        return
+        return pd.DataFrame(columns=PICK_COLUMNS)
+
+    df = df.reset_index(drop=True)
+    model_spread, model_total, win_prob = project_games(df, params)
 
-    today = date.today().isoformat()
+    with span("picks.filter"):
+        candidates = _market_candidates(df, model_spread, model_total, win_prob)
+        count("candidates", len(candidates))
+    if candidates.empty:
+        return pd.DataFrame(columns=PICK_COLUMNS)
+
+    if "date" in df.columns:
+        candidates["date"] = df["date"].astype(str).to_numpy()[candidates["row"]]
+    else:
+        candidates["date"] = today or date.today().isoformat()
+
+    # ---------- CONFIDENCE ----------
+    median_edge = candidates.groupby(["date", "edge_group"])["edge"].transform("median")
+    median_edge = median_edge.where(median_edge != 0, 0.1)
+    candidates["confidence_score"] = (candidates["edge"] / median_edge).round(2)
+
+    # ---------- SIZING + DAILY RISK CAP ----------
     max_daily_risk = BANKROLL * MAX_DAILY_RISK_PCT
-    daily_risk_used = 0.0
-
-    candidates = []
-    edge_magnitudes = []
-
-    # ---------- FIRST PASS: COLLECT EDGES ----------
-    for _, row in df.iterrows():
-
-        teamA = {
-            "off_eff": row["A_off"],
-            "def_eff": row["A_def"],
-            "tempo": row["A_tempo"],
-            "home": row["A_home"],
-            "rest": row["A_rest"],
-            "injury": row["A_injury"]
-        }
-
-        teamB = {
-            "off_eff": row["B_off"],
-            "def_eff": row["B_def"],
-            "tempo": row["B_tempo"],
-            "home": 0,
-            "rest": row["B_rest"],
-            "injury": row["B_injury"]
-        }
-
-        model_spread, model_total, _ = project_game(teamA, teamB)
-
-        if spread_value(model_spread, row["spread_line"]):
-            edge = abs(model_spread - row["spread_line"])
-            edge_magnitudes.append(edge)
-
-        if total_value(model_total, row["total_line"]):
-            edge = abs(model_total - row["total_line"])
-            edge_magnitudes.append(edge)
-
-    if not edge_magnitudes:
-        pd.DataFrame(columns=PICK_COLUMNS).to_csv(output_csv, index=False)
-        return
-
-    median_edge = np.median(edge_magnitudes)
-    if median_edge == 0:
-        median_edge = 0.1
-
-    # ---------- SECOND PASS: BUILD PICKS ----------
-    for _, row in df.iterrows():
-
-        teamA = {
-            "off_eff": row["A_off"],
-            "def_eff": row["A_def"],
-            "tempo": row["A_tempo"],
-            "home": row["A_home"],
-            "rest": row["A_rest"],
-            "injury": row["A_injury"]
-        }
-
-        teamB = {
-            "off_eff": row["B_off"],
-            "def_eff": row["B_def"],
-            "tempo": row["B_tempo"],
-            "home": 0,
-            "rest": row["B_rest"],
-            "injury": row["B_injury"]
-        }
-
-        model_spread, model_total, _ = project_game(teamA, teamB)
-        game_label = f"{row['A_team']} vs {row['B_team']}"
-        reason_text = build_reason(teamA, teamB)
-
-        # ---------- SPREAD ----------
-        if spread_value(model_spread, row["spread_line"]):
-
-            abs_edge = abs(model_spread - row["spread_line"])
-            confidence_score = round(abs_edge / median_edge, 2)
-
-            if confidence_score < 1.0:
-                pass
-            else:
-                if confidence_score < 1.5:
-                    units = 1.0
-                elif confidence_score < 2.2:
-                    units = 1.5
-                else:
-                    units = 2.0
-
-                to_win = units * UNIT
-                stake = stake_from_to_win(to_win, -110)
-
-                if daily_risk_used + stake <= max_daily_risk:
-                    candidates.append({
-                        "date": today,
-                        "game": game_label,
-                        "market": "Spread",
-                        "selection": (
-                            f"{row['A_team']} {row['spread_line']}"
-                            if model_spread < row["spread_line"]
-                            else f"{row['B_team']} {row['spread_line']}"
-                        ),
-                        "line": row["spread_line"],
-                        "odds": -110,
-                        "edge": round(abs_edge, 2),
-                        "confidence_score": confidence_score,
-                        "units": units,
-                        "bet_size": to_win,
-                        "reason": reason_text,
-                    })
-
-                    daily_risk_used += stake
-
-        # ---------- TOTAL ----------
-        if total_value(model_total, row["total_line"]):
-
-            abs_edge = abs(model_total - row["total_line"])
-            confidence_score = round(abs_edge / median_edge, 2)
-
-            if confidence_score < 1.0:
-                pass
-            else:
-                if confidence_score < 1.5:
-                    units = 1.0
-                elif confidence_score < 2.2:
-                    units = 1.5
-                else:
-                    units = 2.0
-
-                to_win = units * UNIT
-                stake = stake_from_to_win(to_win, -110)
-
-                if daily_risk_used + stake <= max_daily_risk:
-                    candidates.append({
-                        "date": today,
-                        "game": game_label,
-                        "market": "Total",
-                        "selection": (
-                            f"Over {row['total_line']}"
-                            if model_total > row["total_line"]
-                            else f"Under {row['total_line']}"
-                        ),
-                        "line": row["total_line"],
-                        "odds": -110,
-                        "edge": round(abs_edge, 2),
-                        "confidence_score": confidence_score,
-                        "units": units,
-                        "bet_size": to_win,
-                        "reason": reason_text,
-                    })
-
-                    daily_risk_used += stake
-
-    pd.DataFrame(candidates, columns=PICK_COLUMNS).to_csv(output_csv, index=False)
+    if sizing == "kelly":
+        with span("picks.kelly"):
+            candidates["stake"] = _kelly_stakes(candidates, model_spread, model_total, max_daily_risk)
+        candidates["bet_size"] = (candidates["stake"] * payout_from_odds(candidates["odds"], 1.0)).round(2)
+        candidates["units"] = (candidates["bet_size"] / UNIT).round(2)
+        candidates = candidates[candidates["units"] >= MIN_UNITS].copy()
+    else:
+        candidates["units"] = units_from_confidence(candidates["confidence_score"])
+        candidates = candidates[candidates["units"] > 0].copy()
+        candidates["bet_size"] = candidates["units"] * UNIT
+        candidates["stake"] = stake_from_to_win(candidates["bet_size"], candidates["odds"])
+
+        risk_used = candidates.groupby("date")["stake"].cumsum()
+        candidates = candidates[risk_used <= max_daily_risk].copy()
+
+    # ---------- LABELS ----------
+    games = df.loc[candidates["row"]]
+    candidates["game"] = (games["A_team"].astype(str) + " vs " + games["B_team"].astype(str)).to_numpy()
+    candidates["reason"] = build_reasons(games).to_numpy()
+    candidates["edge"] = np.where(
+        candidates["edge_group"] == "probability",
+        candidates["edge"].round(4),
+        candidates["edge"].round(2),
+    )
+    candidates["odds"] = candidates["odds"].astype(int)
+
+    return candidates[PICK_COLUMNS].reset_index(drop=True)
+
+
+# ---------------- MAIN FUNCTION ----------------
+def generate_daily_picks(input_csv, output_csv, games=None, team_stats=None, model_version=None):
+    """
+    Writes the daily card. `games` (the slate as a DataFrame) skips
+    reading `input_csv` when the caller already has it in memory.
+    Projections use the latest fitted coefficients unless `model_version`
+    (or NCAAB_MODEL_VERSION) pins one.
+    """
+    if games is None:
+        try:
+            df = pd.read_csv(input_csv)
+        except (FileNotFoundError, EmptyDataError):
+            df = pd.DataFrame()
+    else:
+        df = games
+
+    # Home/away splits come straight from the team stats store
+    if not df.empty:
+        df = attach_team_stats(df, team_stats if team_stats is not None else TeamStatsStore.open())
+
+    picks = build_picks(df, params=load_params(model_version))
+    count("picks", len(picks))
+    with span("csv.write", path=str(output_csv)):
+        picks.to_csv(output_csv, index=False)
+    return picks
 
 
 # ---------------- RUN ----------------
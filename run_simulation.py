@@ -0,0 +1,23 @@
+from backtest.simulate import bets_from_results, simulate
+from run_daily import BANKROLL, UNIT, MAX_DAILY_RISK_PCT
+
+if __name__ == "__main__":
+    bets = bets_from_results()
+    print(f"Simulating from {len(bets)} graded bets")
+    print(f"Bankroll ${BANKROLL:.0f} | 1U = ${UNIT:.0f} to win | max daily risk {MAX_DAILY_RISK_PCT:.0%}")
+
+    report = simulate(bets)
+
+    print("----- MONTE CARLO -----")
+    print(f"Paths: {report['paths']:,} x {report['days']} days x {report['bets_per_day']} bets/day")
+    print(f"Risk of ruin: {report['risk_of_ruin']:.2%}")
+    print(f"P(profit): {report['prob_profit']:.2%}")
+    for label, key, fmt in [
+        ("Final bankroll", "final_bankroll", "${:.2f}"),
+        ("Max drawdown", "max_drawdown", "${:.2f}"),
+        ("Max drawdown %", "max_drawdown_pct", "{:.1%}"),
+    ]:
+        values = " | ".join(f"p{p} {fmt.format(v)}" for p, v in report[key].items())
+        print(f"{label}: {values}")
+    print("-----------------------")
+    print(report["bands"].round(2).to_string(index=False))
@@ -0,0 +1,12 @@
+from backtest.sweep import run_sweep, grid, DEFAULT_GRID
+
+if __name__ == "__main__":
+    print("RUN_SWEEP FILE STARTED")
+
+    results = run_sweep("data/ncaa_games_real.csv", grid(DEFAULT_GRID))
+    results.to_csv("backtest/sweep_results.csv", index=False)
+
+    print(results.head(20).to_string(index=False))
+    print(f"✅ Ranked {len(results)} configurations → backtest/sweep_results.csv")
+
+    print("RUN_SWEEP FILE FINISHED")
@@ -0,0 +1,16 @@
+from backtest.backtest import save_history
+from backtest.walkforward import run_walkforward
+
+if __name__ == "__main__":
+    print("RUN_WALKFORWARD FILE STARTED")
+
+    ledger, windows = run_walkforward("data/ncaa_games_real.csv")
+    windows.to_csv("backtest/walkforward_windows.csv", index=False)
+    save_history(ledger, "backtest/walkforward_history.npz")
+
+    print(windows.round(3).to_string(index=False))
+    print(f"Out-of-sample bets: {len(ledger)} over {len(windows)} windows")
+    print(f"Final Bankroll: ${windows['bankroll'].iloc[-1]:.2f}")
+    print("✅ Bankroll path → backtest/walkforward_history.npz, windows → backtest/walkforward_windows.csv")
+
+    print("RUN_WALKFORWARD FILE FINISHED")
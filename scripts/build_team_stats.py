@@ -1,6 +1,9 @@
-import pandas as pd
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from models.torvik import read_torvik
+
 INPUT_FILE = Path("data/team_stats.csv")   # raw Torvik file
 OUTPUT_FILE = Path("data/team_stats.csv")  # overwrite with clean file
 
@@ -12,10 +15,8 @@ COLUMN_MAP = {
 }
 
 def main():
-    df = pd.read_csv(INPUT_FILE)
-
-    # Keep only what the model needs right now
-    df = df[list(COLUMN_MAP.keys())]
+    # Keep only what the model needs right now (same loader as update_team_stats)
+    df = read_torvik(INPUT_FILE, ["adjoe", "adjde", "adjt"])
 
     # Rename columns to model schema
     df = df.rename(columns=COLUMN_MAP)
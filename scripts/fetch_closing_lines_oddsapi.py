@@ -1,61 +1,82 @@
-import os
-import requests
+import sys
+import numpy as np
 import pandas as pd
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from feeds.odds import flatten_odds
+from feeds.snapshots import OddsSnapshotStore
+from feeds.sources import fetch_odds
 
-API_KEY = os.getenv("ODDS_API_KEY")
 OUTPUT_PATH = "data/closing_lines.csv"
 
-URL = "https://api.the-odds-api.com/v4/sports/basketball_ncaab/odds"
+CLOSING_COLUMNS = ["home_team", "away_team", "closing_spread", "closing_total", "closing_ml_home", "closing_ml_away"]
+
+
+# Both sides of each market, as labelled by outcome_side
+MARKET_SIDES = {"spreads": ["home", "away"], "totals": ["over", "under"], "h2h": ["home", "away"]}
+
+
+def outcome_side(lines):
+    """home / away / over / under for each line's outcome ("" for anything else)."""
+    outcome = lines["outcome"].to_numpy(dtype=object)
+    return np.select(
+        [
+            outcome == lines["home_team"].to_numpy(dtype=object),
+            outcome == lines["away_team"].to_numpy(dtype=object),
+            outcome == "Over",
+            outcome == "Under",
+        ],
+        ["home", "away", "over", "under"],
+        default="",
+    )
+
+
+def market_close(lines, market, value):
+    """
+    One book's closing quote per game for `market`: the book that moved
+    last before tip among those quoting both sides, so the two sides
+    always come from the same snapshot.
+    """
+    sides = MARKET_SIDES[market]
+    rows = lines[(lines["market"] == market) & lines["side"].isin(sides)]
+    quotes = rows.set_index(["game_id", "book", "side"])[value].unstack("side").reindex(columns=sides)
+    quotes["polled_at"] = rows.groupby(["game_id", "book"])["polled_at"].max()
+    quotes = quotes.dropna(subset=sides).reset_index()
+    return quotes.sort_values("polled_at", kind="stable").drop_duplicates("game_id", keep="last")
+
+
+def closing_table(lines):
+    """
+    One row per game from per-book closing lines. Each market is taken
+    from a single book, the one that moved last before tip.
+    """
+    lines = lines.sort_values("polled_at", kind="stable").assign(side=outcome_side)
+    games = lines.drop_duplicates("game_id")[["game_id", "home_team", "away_team"]]
+
+    for market, value, columns in [
+        ("spreads", "point", {"home": "closing_spread"}),
+        ("totals", "point", {"over": "closing_total"}),
+        ("h2h", "price", {"home": "closing_ml_home", "away": "closing_ml_away"}),
+    ]:
+        close = market_close(lines, market, value)
+        games = games.merge(close[["game_id"] + list(columns)].rename(columns=columns), on="game_id", how="left")
+
+    for c in ["closing_ml_home", "closing_ml_away"]:
+        games[c] = games[c].round().astype("Int64")
+    return games[CLOSING_COLUMNS]
 
-PARAMS = {
-    "apiKey": API_KEY,
-    "regions": "us",
-    "markets": "spreads,totals,h2h",
-    "oddsFormat": "american"
-}
 
 def fetch_closing_lines():
-    response = requests.get(URL, params=PARAMS)
-    response.raise_for_status()
-    data = response.json()
-
-    rows = []
-
-    for game in data:
-        home = game["home_team"]
-        away = game["away_team"]
-
-        closing = {
-            "home_team": home,
-            "away_team": away,
-            "closing_spread": None,
-            "closing_total": None,
-            "closing_ml_home": None,
-            "closing_ml_away": None
-        }
-
-        for book in game.get("bookmakers", []):
-            for market in book.get("markets", []):
-
-                if market["key"] == "spreads":
-                    for o in market["outcomes"]:
-                        if o["name"] == home:
-                            closing["closing_spread"] = o.get("point")
-
-                if market["key"] == "totals":
-                    closing["closing_total"] = market["outcomes"][0].get("point")
-
-                if market["key"] == "h2h":
-                    for o in market["outcomes"]:
-                        if o["name"] == home:
-                            closing["closing_ml_home"] = o.get("price")
-                        if o["name"] == away:
-                            closing["closing_ml_away"] = o.get("price")
-
-        rows.append(closing)
-
-    pd.DataFrame(rows).to_csv(OUTPUT_PATH, index=False)
-    print(f"✅ Saved {len(rows)} closing lines (all markets)")
+    # Same request as fetch_games, so a run right after it costs no quota
+    store = OddsSnapshotStore()
+    store.append(flatten_odds(fetch_odds()))
+    store.compact()
+
+    # "Closing" = last recorded line before each game's commence_time
+    closing = closing_table(store.closing())
+    closing.to_csv(OUTPUT_PATH, index=False)
+    print(f"✅ Saved {len(closing)} closing lines (all markets)")
 
 if __name__ == "__main__":
     fetch_closing_lines()
@@ -1,20 +1,18 @@
-import requests
+import sys
 import pandas as pd
 from datetime import date
+from pathlib import Path
 
-OUTPUT_PATH = "data/final_scores.csv"
-
-# ESPN NCAA Men's Basketball scoreboard endpoint
-URL = "https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/scoreboard"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from feeds.sources import fetch_scoreboards
 
-def fetch_final_scores():
-    response = requests.get(URL)
-    response.raise_for_status()
-    data = response.json()
+OUTPUT_PATH = "data/final_scores.csv"
 
+def fetch_final_scores(dates=None):
+    # ESPN NCAA Men's Basketball scoreboard; several dates fetch concurrently
     rows = []
 
-    for event in data.get("events", []):
+    for event in fetch_scoreboards(dates):
         status = event["status"]["type"]["state"]
 
         # Only care about completed games
@@ -0,0 +1,90 @@
+import argparse
+import sys
+import pandas as pd
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from models.fit import PARAMS_DIR, ModelFitter, param_record, param_versions
+from models.teams import get_resolver
+from pipeline.trace import count, span
+
+DAILY_PATH = "data/daily_games.csv"
+SCORES_PATH = "data/final_scores.csv"
+
+
+# -------------------------------
+# Today's slate joined to its final scores
+# -------------------------------
+
+def daily_results(daily_path=DAILY_PATH, scores_path=SCORES_PATH):
+    """
+    daily_games rows (A = home) with home_score / away_score from
+    final_scores, matched on resolved team names.
+    """
+    games = pd.read_csv(daily_path)
+    scores = pd.read_csv(scores_path)
+    scores = scores[scores["status"].astype(str).str.upper().str.startswith("FINAL")]
+
+    resolver = get_resolver()
+    games["_home"] = resolver.resolve_names(games["A_team"])
+    games["_away"] = resolver.resolve_names(games["B_team"])
+    scores["_home"] = resolver.resolve_names(scores["home_team"])
+    scores["_away"] = resolver.resolve_names(scores["away_team"])
+    scores = scores.dropna(subset=["_home", "_away"]).drop_duplicates(["_home", "_away"], keep="last")
+
+    merged = games.merge(scores[["_home", "_away", "date", "home_score", "away_score"]], on=["_home", "_away"])
+    return merged.drop(columns=["_home", "_away"])
+
+
+# -------------------------------
+# Fit
+# -------------------------------
+
+def fit_model(games_path=None, decay=1.0, force=False, root=PARAMS_DIR):
+    """
+    --games: full refit from a season file (run_backtest layout with
+    scores). Otherwise: today's final scores are added to the saved fit
+    state and the coefficients re-solved from there.
+    """
+    with span("fit_model"):
+        if games_path:
+            fitter = ModelFitter(root)
+            games = pd.read_csv(games_path)
+            source = games_path
+        else:
+            fitter = ModelFitter.load(root)
+            games = daily_results()
+            source = "daily"
+            dates = sorted(games["date"].astype(str).unique()) if "date" in games else []
+            last = param_versions(root)
+            if dates and last and not force:
+                fitted = param_record(last[-1], root).get("dates", [])
+                if set(dates) <= set(fitted):
+                    print(f"⚠️ Scores for {', '.join(dates)} already fitted (use --force to add again)")
+                    return fitter.params
+
+        added = fitter.add(games, decay=decay)
+        count("fit_games", added)
+        if not added:
+            print("⚠️ No scored games to fit")
+            return fitter.params
+
+        params = fitter.solve()
+        meta = {"source": str(source), "added": added}
+        if not games_path and "date" in games:
+            meta["dates"] = sorted(games["date"].astype(str).unique())
+        version = fitter.save(**meta)
+
+    print(f"✅ Fitted on {fitter.games} games ({added} new) -> v{version:04d}")
+    for name, value in params.items():
+        print(f"   {name}: {value:.4f}")
+    return params
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit project_game's coefficients to final scores")
+    parser.add_argument("--games", help="full refit from a season file with home_score / away_score")
+    parser.add_argument("--decay", type=float, default=1.0, help="weight kept by earlier games per refit")
+    parser.add_argument("--force", action="store_true", help="add today's scores even if already fitted")
+    args = parser.parse_args()
+    fit_model(args.games, decay=args.decay, force=args.force)
@@ -0,0 +1,30 @@
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from ledger.store import CSV_PATH, DB_PATH, BetLedger
+
+
+# -------------------------------
+# Bet ledger <-> bet_results.csv
+# -------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Import / export the bet ledger as CSV")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--db", default=DB_PATH)
+    args = parser.parse_args()
+
+    with BetLedger(args.db) as ledger:
+        if args.action == "import":
+            n = ledger.import_csv(args.csv)
+            print(f"✅ Imported {n} bets from {args.csv} ({len(ledger)} in ledger)")
+        else:
+            n = ledger.export_csv(args.csv)
+            print(f"✅ Exported {n} bets to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,12 @@
-import subprocess
+import sys
+from pathlib import Path
 
-print("Refreshing Torvik data...")
-subprocess.run(["python3", "scripts/fetch_torvik.py"], check=True)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pipeline.daily import daily_pipeline
 
-print("Updating team stats...")
-subprocess.run(["python3", "scripts/update_team_stats.py"], check=True)
-
-print("Running betting pipeline...")
-subprocess.run(["python3", "run_all.py"], check=True)
+# Torvik CSVs (data/torvik_*.csv) are refreshed outside this script;
+# every stage is forced so the whole pipeline rebuilds from them.
+print("Running full refresh...")
+daily_pipeline().run(force=True)
 
 print("✅ Full refresh complete")
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from run_daily import BANKROLL, _kelly_stakes, _market_candidates
+
+
+# Home (A) handicaps: the model has each game 4.5 points past the line,
+# once on the home side and once on the away side
+GAMES = pd.DataFrame({
+    "A_team": ["Duke", "Kansas"],
+    "B_team": ["UNC", "Baylor"],
+    "spread_line": [-1.5, 1.5],
+    "total_line": [140.5, 150.5],
+})
+MODEL_SPREAD = np.array([6.0, -6.0])
+MODEL_TOTAL = np.array([140.5, 150.5])
+WIN_PROB = np.array([0.5, 0.5])
+
+
+def spread_candidates():
+    candidates = _market_candidates(GAMES, MODEL_SPREAD, MODEL_TOTAL, WIN_PROB)
+    candidates = candidates[candidates["market"] == "Spread"].copy()
+    candidates["date"] = "2026-01-01"
+    return candidates
+
+
+def test_spread_candidates_take_the_covering_side():
+    candidates = spread_candidates()
+    assert candidates["side"].tolist() == ["A", "B"]
+    assert (MODEL_SPREAD + GAMES["spread_line"].to_numpy()).tolist() == [4.5, -4.5]
+    assert candidates["edge"].tolist() == [4.5, 4.5]
+
+
+def test_clear_spread_edges_get_a_kelly_stake():
+    # A risk cap of the whole bankroll never binds, so nothing is capped out
+    candidates = spread_candidates()
+    stakes = _kelly_stakes(candidates, MODEL_SPREAD, MODEL_TOTAL, BANKROLL)
+    assert (stakes > 0).all()
+
+
+def test_the_losing_side_gets_no_kelly_stake():
+    candidates = spread_candidates()
+    # The other team at the same number (lines are each bet's own)
+    candidates["side"] = candidates["side"].map({"A": "B", "B": "A"})
+    candidates["line"] = -candidates["line"]
+    stakes = _kelly_stakes(candidates, MODEL_SPREAD, MODEL_TOTAL, BANKROLL)
+    assert (stakes == 0).all()